@@ -1,9 +1,34 @@
 import streamlit as st
 import json
 import datetime
+import html
+import math
+import sqlite3
 from datetime import date
+import time
 import uuid
 
+from simplilaw.analytics import Analytics
+from simplilaw.assistant import LegalKnowledgeBase, stream_words
+from simplilaw.cache import normalize_query
+from simplilaw.chat import ChatStore
+from simplilaw.dedup import DuplicateDetector
+from simplilaw.drafting import draft_complaint
+from simplilaw.i18n import LANGUAGES, Translator, gettext
+from simplilaw.ids import ComplaintIdAllocator
+from simplilaw.metrics import Metrics, approximate_size
+from simplilaw.ocr import OcrPipeline
+from simplilaw.pages import FEATURES, HOW_IT_WORKS_STEPS, feature_card_html, hero_html, step_card_html
+from simplilaw.ratelimit import RATE_LIMIT_DB_PATH, RateLimiter, SQLiteBucketStore
+from simplilaw.routing import Router, RouteStore
+from simplilaw.search import FACETS, ComplaintSearch
+from simplilaw.sessions import SessionStore
+from simplilaw.state import SharedCache, UserSessions, state_backend
+from simplilaw.status import STATUSES, StatusBroker, StatusTracker
+from simplilaw.storage import Database, ComplaintStore
+from simplilaw.uploads import DocumentStore, IMAGE_EXTENSIONS, file_extension
+from simplilaw.users import UserStore
+
 # Page configuration
 st.set_page_config(
     page_title="SimpliLaw - Justice Made Simple",
@@ -13,7 +38,7 @@ st.set_page_config(
 )
 
 # Custom CSS for styling
-st.markdown("""
+APP_CSS = """
 <style>
     .main-header {
         background: linear-gradient(135deg, #1e40af 0%, #3b82f6 100%);
@@ -80,23 +105,199 @@ st.markdown("""
         text-align: center;
     }
 </style>
-""", unsafe_allow_html=True)
-
-# Initialize session state
-if 'user' not in st.session_state:
-    st.session_state.user = None
-if 'users' not in st.session_state:
-    st.session_state.users = []
-if 'complaints' not in st.session_state:
-    st.session_state.complaints = []
-if 'chat_messages' not in st.session_state:
-    st.session_state.chat_messages = [
-        {"role": "bot", "content": "Hello! I'm your AI Legal Assistant. I can help you understand your rights, explain legal procedures, and guide you through the complaint process. How can I assist you today?"}
-    ]
+"""
+
+COMPLAINT_CATEGORIES = [
+    "Consumer Rights", "Property Dispute", "Employment Issue",
+    "Public Services", "Family Law", "Other"
+]
+COMPLAINT_STEPS = list(STATUSES)
+COMPLAINTS_PAGE_SIZE = 10
+SEARCH_PAGE_SIZE = 20
+CHAT_WINDOW = 20
+WELCOME_MESSAGE = "Hello! I'm your AI Legal Assistant. I can help you understand your rights, explain legal procedures, and guide you through the complaint process. How can I assist you today?"
+FILED_PERIODS = {"Any time": None, "Last 7 days": 7, "Last 30 days": 30, "Last 12 months": 365}
+
+# Shared storage (one instance per process, shared by every session)
+@st.cache_resource
+def get_database():
+    return Database()
+
+@st.cache_resource
+def get_state_backend():
+    # Session handles and caches that every worker process must see
+    return state_backend(get_database())
+
+@st.cache_resource
+def get_user_sessions():
+    return UserSessions(get_state_backend())
+
+@st.cache_resource
+def get_complaint_store():
+    return ComplaintStore(get_database())
+
+@st.cache_resource
+def get_complaint_search():
+    return ComplaintSearch(get_database())
+
+@st.cache_resource
+def get_analytics():
+    return Analytics(get_database())
+
+@st.cache_resource
+def get_id_allocator():
+    return ComplaintIdAllocator(get_database())
+
+@st.cache_resource
+def get_user_store():
+    return UserStore(get_database())
+
+@st.cache_resource
+def get_chat_store():
+    return ChatStore(get_database())
+
+@st.cache_resource
+def get_session_store():
+    return SessionStore(get_chat_store(), get_user_store(), window=CHAT_WINDOW)
+
+@st.cache_resource
+def get_document_store():
+    store = DocumentStore(get_database())
+    store.recover()
+    return store
+
+@st.cache_resource
+def get_ocr_pipeline():
+    pipeline = OcrPipeline(get_document_store())
+    pipeline.recover()
+    return pipeline
+
+@st.cache_resource
+def get_route_store():
+    return RouteStore(get_database(), Router())
+
+@st.cache_resource
+def get_duplicate_detector():
+    return DuplicateDetector(get_database(), get_route_store().router)
+
+@st.cache_resource
+def get_status_tracker():
+    return StatusTracker(get_database())
+
+@st.cache_resource
+def get_status_broker():
+    return StatusBroker(get_database())
+
+@st.cache_resource
+def get_knowledge_base():
+    return LegalKnowledgeBase.from_file()
+
+@st.cache_resource
+def get_translator():
+    return Translator()
+
+@st.cache_resource
+def get_response_cache():
+    return SharedCache(get_state_backend(), "response", maxsize=2048, ttl=6 * 3600)
+
+@st.cache_resource
+def get_rate_limiter():
+    # Per process, unless SIMPLILAW_RATE_LIMIT_DB gives the workers a shared file
+    store = SQLiteBucketStore(Database(RATE_LIMIT_DB_PATH)) if RATE_LIMIT_DB_PATH else None
+    return RateLimiter(store=store, metrics=get_metrics())
+
+@st.cache_resource
+def get_metrics():
+    # Off unless SIMPLILAW_METRICS names an export file
+    metrics = Metrics()
+    metrics.add_collector(lambda: {
+        f"simplilaw_response_cache_{name}": value
+        for name, value in get_response_cache().stats().items()
+    })
+    metrics.add_collector(lambda: {"simplilaw_chat_windows": len(get_session_store())})
+    metrics.add_collector(lambda: {
+        f"simplilaw_rate_limit_{name}": value
+        for name, value in get_rate_limiter().stats().items()
+    })
+    return metrics
+
+complaint_store = get_complaint_store()
+complaint_search = get_complaint_search()
+analytics = get_analytics()
+id_allocator = get_id_allocator()
+user_store = get_user_store()
+sessions = get_session_store()
+document_store = get_document_store()
+ocr_pipeline = get_ocr_pipeline()
+route_store = get_route_store()
+duplicate_detector = get_duplicate_detector()
+status_tracker = get_status_tracker()
+status_broker = get_status_broker()
+knowledge_base = get_knowledge_base()
+response_cache = get_response_cache()
+translator = get_translator()
+metrics = get_metrics()
+rate_limiter = get_rate_limiter()
+user_sessions = get_user_sessions()
+
+# Session state lives in the memory of the worker process holding the
+# connection. Nothing that grants access goes in the page URL: a browser that
+# reconnects to another worker logs in again there and is given back its
+# conversation (see sign_in). Only the language rides along, as ?lang=.
+LANGUAGE_PARAM = "lang"
+
+# Initialize session state. Sessions only hold small handles; user records and
+# chat windows live in the shared session store.
+if 'user_email' not in st.session_state:
+    st.session_state.user_email = None
+if 'conversation_id' not in st.session_state:
+    st.session_state.conversation_id = uuid.uuid4().hex
+if 'upload_key' not in st.session_state:
+    st.session_state.upload_key = 0
+if 'language' not in st.session_state:
+    language = st.query_params.get(LANGUAGE_PARAM)
+    st.session_state.language = language if language in LANGUAGES else "en"
+
+def current_user():
+    return sessions.user(st.session_state.user_email)
+
+def sign_in(email):
+    # Called once the password checks out. The account's last conversation
+    # follows it to this worker, unless this session already started one
+    st.session_state.user_email = email
+    saved = user_sessions.load(email)
+    if saved and not sessions.chat(st.session_state.conversation_id).messages:
+        st.session_state.conversation_id = saved['conversation_id']
+
+def save_session_handles():
+    language = st.session_state.language
+    if st.query_params.get(LANGUAGE_PARAM, "en") != language:
+        if language == "en":
+            del st.query_params[LANGUAGE_PARAM]
+        else:
+            st.query_params[LANGUAGE_PARAM] = language
+    handles = {'conversation_id': st.session_state.conversation_id}
+    saved = (st.session_state.user_email, handles)
+    if st.session_state.user_email and st.session_state.get('saved_handles') != saved:
+        user_sessions.save(st.session_state.user_email, handles)
+        st.session_state.saved_handles = saved
+
+def _(message, **kwargs):
+    # UI text in the session's language, from the process-wide catalog
+    return gettext(message, st.session_state.get('language', "en"), **kwargs)
+
+def rate_limited(action, email=None):
+    # Checked before any real work, so a flood of submits costs a bucket lookup each
+    # Behind simplilaw.workers the address is the client's, forwarded by the
+    # balancer; it is None only for connections from this machine
+    wait = rate_limiter.hit(action, session=st.session_state.conversation_id,
+                            ip=st.context.ip_address, email=email)
+    if wait:
+        st.error(_("Too many attempts. Please try again in {seconds} seconds.", seconds=math.ceil(wait)))
+    return bool(wait)
 
 # Navigation
-def show_navigation():
-    st.markdown("""
+NAVIGATION_HTML = """
     <div style="background: white; padding: 1rem 0; box-shadow: 0 2px 4px rgba(0,0,0,0.1); margin: -1rem -1rem 0 -1rem;">
         <div style="display: flex; justify-content: space-between; align-items: center; max-width: 1200px; margin: 0 auto; padding: 0 2rem;">
             <div style="display: flex; align-items: center;">
@@ -105,129 +306,78 @@ def show_navigation():
             </div>
         </div>
     </div>
-    """, unsafe_allow_html=True)
+    """
+
+def show_navigation():
+    st.markdown(APP_CSS, unsafe_allow_html=True)
+    st.markdown(NAVIGATION_HTML, unsafe_allow_html=True)
 
 # Authentication functions
 def login_form(form_key="login"):
     with st.form(f"login_form_{form_key}"):
-        st.subheader("Login")
-        email = st.text_input("Email Address", key=f"login_email_{form_key}")
-        password = st.text_input("Password", type="password", key=f"login_password_{form_key}")
+        st.subheader(_("Login"))
+        email = st.text_input(_("Email Address"), key=f"login_email_{form_key}")
+        password = st.text_input(_("Password"), type="password", key=f"login_password_{form_key}")
         
-        if st.form_submit_button("Login"):
-            user = next((u for u in st.session_state.users if u['email'] == email and u['password'] == password), None)
+        if st.form_submit_button(_("Login")) and not rate_limited("login", email=email.strip()):
+            user = user_store.authenticate(email, password)
             if user:
-                st.session_state.user = user
-                st.success(f"Welcome back, {user['name']}!")
+                sign_in(user['email'])
+                st.success(_("Welcome back, {name}!", name=user['name']))
                 st.rerun()
             else:
-                st.error("Invalid email or password.")
+                st.error(_("Invalid email or password."))
 
 def register_form(form_key="register"):
     with st.form(f"register_form_{form_key}"):
-        st.subheader("Register")
-        name = st.text_input("Full Name", key=f"register_name_{form_key}")
-        email = st.text_input("Email Address", key=f"register_email_{form_key}")
-        phone = st.text_input("Phone Number", key=f"register_phone_{form_key}")
-        password = st.text_input("Password", type="password", key=f"register_password_{form_key}")
+        st.subheader(_("Register"))
+        name = st.text_input(_("Full Name"), key=f"register_name_{form_key}")
+        email = st.text_input(_("Email Address"), key=f"register_email_{form_key}")
+        phone = st.text_input(_("Phone Number"), key=f"register_phone_{form_key}")
+        password = st.text_input(_("Password"), type="password", key=f"register_password_{form_key}")
         
-        if st.form_submit_button("Register"):
-            if any(u['email'] == email for u in st.session_state.users):
-                st.error("User with this email already exists.")
+        if st.form_submit_button(_("Register")) and not rate_limited("register"):
+            new_user = user_store.register(name, email, phone, password)
+            if new_user is None:
+                st.error(_("User with this email already exists."))
             else:
-                new_user = {
-                    'name': name,
-                    'email': email,
-                    'phone': phone,
-                    'password': password
-                }
-                st.session_state.users.append(new_user)
-                st.session_state.user = new_user
-                st.success(f"Registration successful! Welcome to SimpliLaw, {name}!")
+                sign_in(new_user['email'])
+                st.success(_("Registration successful! Welcome to SimpliLaw, {name}!", name=name))
                 st.rerun()
 
 # Main sections
+# Static sections come from simplilaw.pages, rendered to HTML once per
+# language and process; reruns only re-emit the cached strings.
 def show_hero():
-    st.markdown("""
-    <div class="main-header">
-        <h1 style="font-size: 3.5rem; font-weight: bold; margin-bottom: 1rem;">Justice Made Simple</h1>
-        <p style="font-size: 1.25rem; margin-bottom: 2rem; max-width: 800px; margin-left: auto; margin-right: auto;">
-            AI-powered legal support platform helping Indian citizens access justice easily, affordably, and in their own language.
-        </p>
-    </div>
-    """, unsafe_allow_html=True)
+    st.markdown(hero_html(st.session_state.language), unsafe_allow_html=True)
 
 def show_how_it_works():
-    st.header("How SimpliLaw Works")
-    st.subheader("Three simple steps to access justice")
+    st.header(_("How SimpliLaw Works"))
+    st.subheader(_("Three simple steps to access justice"))
     
-    col1, col2, col3 = st.columns(3)
-    
-    with col1:
-        st.markdown("""
-        <div class="step-card">
-            <div style="background: #dbeafe; width: 64px; height: 64px; border-radius: 50%; display: flex; align-items: center; justify-content: center; margin: 0 auto 1.5rem auto;">
-                <span style="font-size: 1.5rem;">✏️</span>
-            </div>
-            <h3 style="font-size: 1.25rem; font-weight: 600; margin-bottom: 1rem;">1. Report</h3>
-            <p style="color: #6b7280;">Describe your issue in simple words or upload photos. Our AI will help generate a proper complaint.</p>
-        </div>
-        """, unsafe_allow_html=True)
-    
-    with col2:
-        st.markdown("""
-        <div class="step-card">
-            <div style="background: #dbeafe; width: 64px; height: 64px; border-radius: 50%; display: flex; align-items: center; justify-content: center; margin: 0 auto 1.5rem auto;">
-                <span style="font-size: 1.5rem;">🔍</span>
-            </div>
-            <h3 style="font-size: 1.25rem; font-weight: 600; margin-bottom: 1rem;">2. Review</h3>
-            <p style="color: #6b7280;">We automatically route your complaint to the right authority based on your location and issue type.</p>
-        </div>
-        """, unsafe_allow_html=True)
-    
-    with col3:
-        st.markdown("""
-        <div class="step-card">
-            <div style="background: #dbeafe; width: 64px; height: 64px; border-radius: 50%; display: flex; align-items: center; justify-content: center; margin: 0 auto 1.5rem auto;">
-                <span style="font-size: 1.5rem;">✅</span>
-            </div>
-            <h3 style="font-size: 1.25rem; font-weight: 600; margin-bottom: 1rem;">3. Resolve</h3>
-            <p style="color: #6b7280;">Track your complaint status in real-time and receive updates until your issue is resolved.</p>
-        </div>
-        """, unsafe_allow_html=True)
+    for col, (icon, title, text) in zip(st.columns(3), HOW_IT_WORKS_STEPS):
+        with col:
+            st.markdown(step_card_html(icon, title, text, st.session_state.language), unsafe_allow_html=True)
 
 def show_features():
-    st.header("Powerful Features")
-    st.subheader("Technology that makes justice accessible to everyone")
+    st.header(_("Powerful Features"))
+    st.subheader(_("Technology that makes justice accessible to everyone"))
     
     col1, col2, col3 = st.columns(3)
     
-    features = [
-        ("🤖", "AI-Powered Assistant", "Get instant legal guidance and complaint drafting help from our intelligent chatbot."),
-        ("🌐", "Multilingual Support", "Access services in English, Hindi, Telugu, and more regional languages."),
-        ("📷", "Image Recognition", "Upload photos of documents or issues - our AI will extract relevant information."),
-        ("📍", "Smart Routing", "Automatically connect with the right authorities based on your location and issue type."),
-        ("📊", "Real-time Tracking", "Monitor your complaint progress with live updates and status notifications."),
-        ("🛡️", "Secure & Private", "Your data is encrypted and protected with enterprise-grade security measures.")
-    ]
-    
-    for i, (icon, title, description) in enumerate(features):
+    for i, (icon, title, description) in enumerate(FEATURES):
         col = [col1, col2, col3][i % 3]
         with col:
-            st.markdown(f"""
-            <div class="feature-card">
-                <div style="font-size: 2rem; margin-bottom: 1rem;">{icon}</div>
-                <h3 style="font-size: 1.25rem; font-weight: 600; margin-bottom: 0.75rem;">{title}</h3>
-                <p style="color: #6b7280;">{description}</p>
-            </div>
-            """, unsafe_allow_html=True)
+            st.markdown(feature_card_html(icon, title, description, st.session_state.language), unsafe_allow_html=True)
 
+@metrics.timed("show_complaint_form")
 def show_complaint_form():
-    st.header("File Your Complaint")
-    st.subheader("Describe your issue and let our AI help you create a proper complaint")
+    st.header(_("File Your Complaint"))
+    st.subheader(_("Describe your issue and let our AI help you create a proper complaint"))
     
-    if not st.session_state.user:
-        st.warning("Please login first to submit a complaint.")
+    user = current_user()
+    if not user:
+        st.warning(_("Please login first to submit a complaint."))
         col1, col2 = st.columns(2)
         with col1:
             login_form("complaint_login")
@@ -235,72 +385,53 @@ def show_complaint_form():
             register_form("complaint_register")
         return
     
+    # Filled in below the form's handling, so the confirmation sits above the
+    # form and stays there across reruns until the next submission
+    confirmation = st.container()
     with st.form("complaint_submission_form"):
         col1, col2 = st.columns(2)
         
         with col1:
-            full_name = st.text_input("Full Name", value=st.session_state.user['name'])
+            full_name = st.text_input(_("Full Name"), value=user['name'])
         with col2:
-            phone = st.text_input("Phone Number", value=st.session_state.user.get('phone', ''))
+            phone = st.text_input(_("Phone Number"), value=user.get('phone', ''))
         
-        category = st.selectbox("Issue Category", [
-            "", "Consumer Rights", "Property Dispute", "Employment Issue", 
-            "Public Services", "Family Law", "Other"
-        ])
+        category = st.selectbox(_("Issue Category"), [""] + COMPLAINT_CATEGORIES, format_func=_)
         
-        location = st.text_input("Location", placeholder="Enter your city/district")
+        location = st.text_input(_("Location"), placeholder=_("Enter your city/district"))
         
-        issue_description = st.text_area("Describe Your Issue", 
-            placeholder="Describe your issue in detail. Our AI will help format it properly.",
+        issue_description = st.text_area(_("Describe Your Issue"), 
+            placeholder=_("Describe your issue in detail. Our AI will help format it properly."),
             height=150)
         
-        uploaded_files = st.file_uploader("Upload Supporting Documents (Optional)", 
-            accept_multiple_files=True, type=['jpg', 'jpeg', 'png', 'pdf', 'doc', 'docx'])
+        # A fresh key after each submission releases the uploaded files
+        uploaded_files = st.file_uploader(_("Upload Supporting Documents (Optional)"), 
+            accept_multiple_files=True, type=['jpg', 'jpeg', 'png', 'pdf', 'doc', 'docx'],
+            key=f"complaint_files_{st.session_state.upload_key}")
         
         col1, col2 = st.columns(2)
         
         with col1:
-            generate_ai = st.form_submit_button("🪄 Generate AI Complaint")
+            generate_ai = st.form_submit_button("🪄 " + _("Generate AI Complaint"))
         
         with col2:
-            submit_complaint = st.form_submit_button("📤 Submit Complaint")
+            submit_complaint = st.form_submit_button("📤 " + _("Submit Complaint"))
         
         if generate_ai:
             if not issue_description or not category or not full_name:
-                st.error("Please fill in all required fields before generating complaint.")
+                st.error(_("Please fill in all required fields before generating complaint."))
             else:
-                ai_complaint = f"""
-FORMAL COMPLAINT
-
-To: The Concerned Authority
-From: {full_name}
-Date: {date.today().strftime('%B %d, %Y')}
-
-Subject: {category} Issue - Request for Immediate Action
-
-Dear Sir/Madam,
-
-I am writing to formally lodge a complaint regarding the following issue:
-
-{issue_description}
-
-I request your immediate attention and appropriate action to resolve this matter. I have attached relevant documents for your reference.
-
-I look forward to your prompt response and resolution of this issue.
-
-Thank you for your time and consideration.
-
-Sincerely,
-{full_name}
-                """
-                st.text_area("AI-Generated Complaint", value=ai_complaint, height=300, key="ai_generated_complaint")
-                st.success("AI-generated complaint has been created! You can review and modify it before submitting.")
+                authority = route_store.router.route(location, category)['authority'] if location else None
+                ai_complaint = draft_complaint(full_name, category, issue_description,
+                                               language=st.session_state.language, authority=authority)
+                st.text_area(_("AI-Generated Complaint"), value=ai_complaint, height=300, key="ai_generated_complaint")
+                st.success(_("AI-generated complaint has been created! You can review and modify it before submitting."))
         
         if submit_complaint:
             if not all([full_name, phone, category, location, issue_description]):
-                st.error("Please fill in all required fields.")
+                st.error(_("Please fill in all required fields."))
             else:
-                complaint_id = f"SL{date.today().year}{str(len(st.session_state.complaints) + 1).zfill(4)}"
+                complaint_id = id_allocator.next_id()
                 
                 complaint = {
                     'id': complaint_id,
@@ -311,35 +442,73 @@ Sincerely,
                     'description': issue_description,
                     'status': 'Submitted',
                     'date': date.today().strftime('%B %d, %Y'),
-                    'user_email': st.session_state.user['email']
+                    'user_email': user['email']
                 }
                 
-                st.session_state.complaints.append(complaint)
-                st.success(f"🎉 **Complaint Submitted Successfully!**")
-                st.success(f"Your complaint ID is: **{complaint_id}**")
-                st.info("📋 You can now track your complaint status in the **'My Complaints'** tab.")
-                st.balloons()
-                
-                # Show a nice confirmation box
-                st.markdown("""
-                ---
-                ### ✅ What happens next?
+                while True:
+                    try:
+                        complaint_store.add(complaint)
+                        break
+                    except sqlite3.IntegrityError:
+                        # An import that kept its own ids may have taken one from
+                        # the block this process reserved earlier; use the next
+                        if complaint_store.get(complaint_id) is None:
+                            raise
+                        complaint['id'] = complaint_id = id_allocator.next_id()
+                status_tracker.submitted(complaint_id)
+                route = route_store.route_complaints([complaint])[0]
+                parent_id = duplicate_detector.add(complaint)
                 
-                1. **Immediate Confirmation** - Your complaint has been recorded in our system
-                2. **Auto-Routing** - We'll automatically forward it to the appropriate authority
-                3. **Status Updates** - You'll receive real-time updates on the progress
-                4. **Resolution Tracking** - Monitor every step until your issue is resolved
+                # Files are streamed to disk now; thumbnails and text extraction run in the background
+                for uploaded_file in uploaded_files or []:
+                    sha256 = document_store.save(uploaded_file, uploaded_file.name)
+                    document_store.attach(complaint_id, sha256, uploaded_file.name)
+                    document_store.process_async(sha256)
+                    if file_extension(uploaded_file.name) in IMAGE_EXTENSIONS:
+                        ocr_pipeline.enqueue(sha256)
                 
-                **Need help?** Contact our support team or use the AI Legal Assistant for guidance.
-                """)
-                st.rerun()
+                st.session_state.last_submission = {
+                    'user_email': user['email'], 'id': complaint_id, 'authority': route['authority'],
+                    'parent_id': parent_id,
+                }
+                st.session_state.upload_key += 1
+                st.balloons()
+    
+    submission = st.session_state.get('last_submission')
+    if submission and submission['user_email'] == user['email']:
+        with confirmation:
+            show_submission_confirmation(submission)
+
+def show_submission_confirmation(submission):
+    st.success("🎉 **" + _("Complaint Submitted Successfully!") + "**")
+    st.success(_("Your complaint ID is: **{id}**", id=submission['id']))
+    st.info("📍 " + _("Routed to: **{authority}**", authority=submission['authority']))
+    if submission['parent_id']:
+        st.info("🔗 " + _("Linked to a similar complaint, **{id}**, so the authority can handle them together.",
+                         id=submission['parent_id']))
+    st.info("📋 " + _("You can now track your complaint status in the **'My Complaints'** tab."))
+    
+    # Show a nice confirmation box
+    st.markdown("""
+    ---
+    ### ✅ What happens next?
+    
+    1. **Immediate Confirmation** - Your complaint has been recorded in our system
+    2. **Auto-Routing** - We'll automatically forward it to the appropriate authority
+    3. **Status Updates** - You'll receive real-time updates on the progress
+    4. **Resolution Tracking** - Monitor every step until your issue is resolved
+    
+    **Need help?** Contact our support team or use the AI Legal Assistant for guidance.
+    """)
 
+@metrics.timed("show_complaints")
 def show_complaints():
-    st.header("Your Complaints")
-    st.subheader("View and track all your submitted complaints")
+    st.header(_("Your Complaints"))
+    st.subheader(_("View and track all your submitted complaints"))
     
-    if not st.session_state.user:
-        st.info("Please login to view your complaints.")
+    user = current_user()
+    if not user:
+        st.info(_("Please login to view your complaints."))
         col1, col2 = st.columns(2)
         with col1:
             login_form("complaints_login")
@@ -347,147 +516,316 @@ def show_complaints():
             register_form("complaints_register")
         return
     
-    user_complaints = [c for c in st.session_state.complaints if c['user_email'] == st.session_state.user['email']]
+    user_email = user['email']
+    if complaint_store.count_for_user(user_email) == 0:
+        st.info(_("No complaints submitted yet. File your first complaint above!"))
+        return
+    
+    # Filter and sort controls
+    col1, col2, col3, col4 = st.columns(4)
+    with col1:
+        status_filter = st.selectbox(_("Status"), ["All"] + COMPLAINT_STEPS, format_func=_, key="complaints_status")
+    with col2:
+        category_filter = st.selectbox(_("Category"), ["All"] + COMPLAINT_CATEGORIES, format_func=_, key="complaints_category")
+    with col3:
+        period_filter = st.selectbox(_("Filed"), list(FILED_PERIODS), format_func=_, key="complaints_period")
+    with col4:
+        sort_order = st.selectbox(_("Sort by date"), ["Newest first", "Oldest first"], format_func=_, key="complaints_sort")
+    
+    period_days = FILED_PERIODS[period_filter]
+    filters = {
+        'status': None if status_filter == "All" else status_filter,
+        'category': None if category_filter == "All" else category_filter,
+        'since': None if period_days is None else time.time() - period_days * 86400,
+    }
+    
+    # Go back to the first page whenever the filters change
+    page_state = (status_filter, category_filter, period_filter, sort_order)
+    if st.session_state.get('complaints_page_state') != page_state:
+        st.session_state.complaints_page_state = page_state
+        st.session_state.complaints_page = 0
+    
+    total = complaint_store.count_for_user(user_email, **filters)
+    if total == 0:
+        st.info(_("No complaints match the selected filters."))
+        return
+    
+    page_count = (total + COMPLAINTS_PAGE_SIZE - 1) // COMPLAINTS_PAGE_SIZE
+    page = min(st.session_state.complaints_page, page_count - 1)
+    
+    # Only the visible page is loaded and rendered
+    page_complaints = complaint_store.page_for_user(
+        user_email, newest_first=(sort_order == "Newest first"),
+        limit=COMPLAINTS_PAGE_SIZE, offset=page * COMPLAINTS_PAGE_SIZE, **filters
+    )
+    
+    for complaint in page_complaints:
+        show_complaint_card(complaint)
     
-    if not user_complaints:
-        st.info("No complaints submitted yet. File your first complaint above!")
+    col1, col2, col3 = st.columns([1, 2, 1])
+    with col1:
+        if st.button("← " + _("Previous"), key="complaints_prev", disabled=page == 0):
+            st.session_state.complaints_page = page - 1
+            st.rerun()
+    with col2:
+        st.caption(_("Page {page} of {page_count} · {total} complaints", page=page + 1, page_count=page_count, total=total))
+    with col3:
+        if st.button(_("Next") + " →", key="complaints_next", disabled=page >= page_count - 1):
+            st.session_state.complaints_page = page + 1
+            st.rerun()
+
+def show_complaint_search():
+    # Staff view across every citizen's complaints
+    st.header(_("Search Complaints"))
+    st.subheader(_("Full-text search across all complaints, narrowed by facet"))
+    
+    text = st.text_input(_("Search descriptions"), key="search_text")
+    # Facet options come from the current result set, so filters are read
+    # from their widget state before the widgets are drawn
+    filters = {facet: st.session_state.get(f"search_{facet}") for facet in FACETS}
+    filters = {facet: value for facet, value in filters.items() if value and value != "All"}
+    
+    page_state = (text, tuple(sorted(filters.items())))
+    if st.session_state.get('search_page_state') != page_state:
+        st.session_state.search_page_state = page_state
+        st.session_state.search_page = 0
+    page = st.session_state.search_page
+    
+    result = complaint_search.search(text, filters, limit=SEARCH_PAGE_SIZE, offset=page * SEARCH_PAGE_SIZE)
+    
+    labels = {'category': _("Category"), 'status': _("Status"), 'district': _("District"), 'month': _("Month")}
+    for col, facet in zip(st.columns(len(FACETS)), FACETS):
+        counts = dict(result['facets'][facet])
+        options = ["All"] + list(counts)
+        if facet in filters and filters[facet] not in counts:
+            options.append(filters[facet])
+        with col:
+            st.selectbox(
+                labels[facet], options, key=f"search_{facet}",
+                format_func=lambda value, counts=counts: _(value) if value == "All" else f"{value} ({counts.get(value, 0):,})"
+            )
+    
+    total = result['total']
+    if total == 0:
+        st.info(_("No complaints match the search."))
         return
+    st.caption(_("{total} matching complaints", total=f"{total:,}" if result['exact'] else f"~{total:,}"))
+
+    # Drawn above the table so a change shows in the results straight away
+    with st.expander(_("Update status")):
+        with st.form("search_status_form", clear_on_submit=True):
+            selected = st.multiselect(_("Complaints on this page"), [c['id'] for c in result['results']])
+            status = st.selectbox(_("New status"), STATUSES[1:], format_func=_)
+            with_duplicates = st.checkbox(_("Include linked duplicates"), value=True)
+            note = st.text_input(_("Note for citizens"))
+            if st.form_submit_button(_("Update")) and selected:
+                if with_duplicates:
+                    selected = list(dict.fromkeys(
+                        linked_id for complaint_id in selected for linked_id in duplicate_detector.cluster(complaint_id)
+                    ))
+                changed = status_tracker.bulk_transition(selected, status, current_user()['name'], note.strip())
+                st.success(_("Moved {changed} of {selected} complaints to {status}",
+                             changed=len(changed), selected=len(selected), status=_(status)))
+                result = complaint_search.search(text, filters, limit=SEARCH_PAGE_SIZE, offset=page * SEARCH_PAGE_SIZE)
+
+    linked = duplicate_detector.duplicate_counts(c['id'] for c in result['results'])
+    st.dataframe(
+        [{
+            _("Complaint ID"): c['id'], _("Date"): c['date'], _("Category"): _(c['category']),
+            _("Location"): c['location'], _("Status"): _(c['status']), _("Description"): c['description'],
+            _("Linked duplicates"): linked.get(c['id'], 0),
+        } for c in result['results']],
+        width="stretch", hide_index=True
+    )
     
-    for complaint in user_complaints:
-        # Create a container for each complaint
-        with st.container():
-            # Header with ID and status
-            col1, col2 = st.columns([3, 1])
-            with col1:
-                st.subheader(f"Complaint ID: {complaint['id']}")
-                st.caption(f"Filed on: {complaint['date']}")
-            with col2:
-                status_color = {
-                    'Submitted': '🔵',
-                    'Under Review': '🟡', 
-                    'Action Taken': '🟠',
-                    'Resolved': '🟢'
-                }.get(complaint['status'], '🔵')
-                st.markdown(f"**{status_color} {complaint['status']}**")
-            
-            # Details in columns
-            col1, col2 = st.columns(2)
-            with col1:
-                st.markdown("**Category:**")
-                st.write(complaint['category'])
-            with col2:
-                st.markdown("**Location:**")
-                st.write(complaint['location'])
-            
-            # Description
-            st.markdown("**Issue Description:**")
-            description = complaint['description'][:200] + ('...' if len(complaint['description']) > 200 else '')
-            st.write(description)
-            
-            # Progress indicators
-            st.markdown("**Progress:**")
-            steps = ['Submitted', 'Under Review', 'Action Taken', 'Resolved']
-            current_step = steps.index(complaint['status']) if complaint['status'] in steps else 0
-            
-            progress_cols = st.columns(4)
-            for i, step in enumerate(steps):
-                with progress_cols[i]:
-                    if i <= current_step:
-                        st.markdown(f"✅ **{step}**")
-                    else:
-                        st.markdown(f"⭕ {step}")
+    page_count = (total + SEARCH_PAGE_SIZE - 1) // SEARCH_PAGE_SIZE
+    col1, col2, col3 = st.columns([1, 2, 1])
+    with col1:
+        if st.button("← " + _("Previous"), key="search_prev", disabled=page == 0):
+            st.session_state.search_page = page - 1
+            st.rerun()
+    with col2:
+        st.caption(_("Page {page} of {page_count}", page=page + 1, page_count=page_count))
+    with col3:
+        if st.button(_("Next") + " →", key="search_next", disabled=page >= page_count - 1):
+            st.session_state.search_page = page + 1
+            st.rerun()
+
+def show_complaint_card(complaint):
+    # Create a container for each complaint
+    with st.container():
+        # Header with ID and status
+        col1, col2 = st.columns([3, 1])
+        with col1:
+            st.subheader(_("Complaint ID: {id}", id=complaint['id']))
+            st.caption(_("Filed on: {date}", date=complaint['date']))
+        with col2:
+            status_color = {
+                'Submitted': '🔵',
+                'Under Review': '🟡', 
+                'Action Taken': '🟠',
+                'Resolved': '🟢'
+            }.get(complaint['status'], '🔵')
+            st.markdown(f"**{status_color} {_(complaint['status'])}**")
+        
+        # Details in columns
+        col1, col2 = st.columns(2)
+        with col1:
+            st.markdown("**" + _("Category:") + "**")
+            st.write(_(complaint['category']))
+        with col2:
+            st.markdown("**" + _("Location:") + "**")
+            st.write(complaint['location'])
+        
+        # Description
+        st.markdown("**" + _("Issue Description:") + "**")
+        description = complaint['description'][:200] + ('...' if len(complaint['description']) > 200 else '')
+        st.write(description)
+        
+        # Progress indicators
+        st.markdown("**" + _("Progress:") + "**")
+        steps = COMPLAINT_STEPS
+        current_step = steps.index(complaint['status']) if complaint['status'] in steps else 0
+        
+        progress_cols = st.columns(4)
+        for i, step in enumerate(steps):
+            with progress_cols[i]:
+                if i <= current_step:
+                    st.markdown(f"✅ **{_(step)}**")
+                else:
+                    st.markdown(f"⭕ {_(step)}")
+        
+        # View details button
+        if st.button(_("View Full Details"), key=f"view_{complaint['id']}"):
+            st.info(f"""
+            **{_("Full Complaint Details:")}**
             
-            # View details button
-            if st.button(f"View Full Details", key=f"view_{complaint['id']}"):
-                st.info(f"""
-                **Full Complaint Details:**
-                
-                **ID:** {complaint['id']}
-                **Name:** {complaint['name']}
-                **Phone:** {complaint['phone']}
-                **Category:** {complaint['category']}
-                **Location:** {complaint['location']}
-                **Status:** {complaint['status']}
-                **Date Filed:** {complaint['date']}
-                
-                **Full Description:**
-                {complaint['description']}
-                """)
+            **{_("ID:")}** {complaint['id']}
+            **{_("Name:")}** {complaint['name']}
+            **{_("Phone:")}** {complaint['phone']}
+            **{_("Category:")}** {_(complaint['category'])}
+            **{_("Location:")}** {complaint['location']}
+            **{_("Status:")}** {_(complaint['status'])}
+            **{_("Date Filed:")}** {complaint['date']}
             
-            st.divider()
+            **{_("Full Description:")}**
+            {complaint['description']}
+            """)
+            for event in status_tracker.history(complaint['id']):
+                changed_at = datetime.datetime.fromtimestamp(event['created_at']).strftime('%B %d, %Y %H:%M')
+                st.caption(f"🕒 {changed_at} · {_(event['status'])}" + (f" · {event['note']}" if event['note'] else ""))
+            route = route_store.get(complaint['id'])
+            if route:
+                st.caption("📍 " + _("Routed to: **{authority}**", authority=route['authority']))
+            parent_id = duplicate_detector.parent(complaint['id'])
+            if parent_id:
+                st.caption("🔗 " + _("Linked to similar complaint {id}", id=parent_id))
+            for attachment in document_store.for_complaint(complaint['id']):
+                st.caption(f"📎 {attachment['filename']} ({attachment['size'] // 1024} KB, {attachment['status']})")
+                if attachment['thumbnail']:
+                    st.image(attachment['thumbnail'])
+            extracted_text = ocr_pipeline.text_for_complaint(complaint['id'])
+            if extracted_text:
+                st.markdown("**" + _("Text extracted from attachments:") + "**")
+                st.text(extracted_text)
+        
+        st.divider()
 
-def show_legal_assistant():
-    st.header("AI Legal Assistant")
-    st.subheader("Get instant legal guidance and answers to your questions")
-    
-    # Display chat messages
-    for message in st.session_state.chat_messages:
-        if message["role"] == "user":
-            st.markdown(f"""
-            <div style="display: flex; justify-content: flex-end; margin-bottom: 0.75rem;">
-                <div class="chat-message user-message" style="background-color: #3b82f6; color: white;">
-                    {message["content"]}
-                </div>
+def chat_bubble(role, content):
+    content = html.escape(content)
+    if role == "user":
+        return f"""
+        <div style="display: flex; justify-content: flex-end; margin-bottom: 0.75rem;">
+            <div class="chat-message user-message" style="background-color: #3b82f6; color: white;">
+                {content}
             </div>
-            """, unsafe_allow_html=True)
+        </div>
+        """
+    return f"""
+    <div style="display: flex; justify-content: flex-start; margin-bottom: 0.75rem;">
+        <div class="chat-message bot-message" style="background-color: #f3f4f6; color: #374151;">
+            {content}
+        </div>
+    </div>
+    """
+
+@metrics.timed("show_legal_assistant")
+def show_legal_assistant():
+    st.header(_("AI Legal Assistant"))
+    st.subheader(_("Get instant legal guidance and answers to your questions"))
+    
+    history = st.container()
+    with history:
+        # Older turns are paged in from storage only when asked for
+        conversation_id = st.session_state.conversation_id
+        sessions.refresh(conversation_id)
+        if sessions.has_earlier(conversation_id):
+            if st.button(_("Show earlier messages"), key="chat_earlier_btn"):
+                sessions.load_earlier(conversation_id)
+                st.rerun()
         else:
-            st.markdown(f"""
-            <div style="display: flex; justify-content: flex-start; margin-bottom: 0.75rem;">
-                <div class="chat-message bot-message" style="background-color: #f3f4f6; color: #374151;">
-                    {message["content"]}
-                </div>
-            </div>
-            """, unsafe_allow_html=True)
+            st.markdown(chat_bubble("bot", _(WELCOME_MESSAGE)), unsafe_allow_html=True)
+        
+        for message in list(sessions.chat(conversation_id).messages):
+            st.markdown(chat_bubble(message.role, message.content), unsafe_allow_html=True)
     
     # Chat input
-    user_input = st.text_input("Ask me about your legal rights or any legal question...", key="chat_input")
+    user_input = st.text_input(_("Ask me about your legal rights or any legal question..."), key="chat_input")
     
     col1, col2, col3, col4 = st.columns([1, 1, 1, 1])
     
+    message = None
     with col1:
-        if st.button("Consumer Rights", key="consumer_btn"):
-            process_chat_message("What are my consumer rights?")
+        if st.button(_("Consumer Rights"), key="consumer_btn"):
+            message = "What are my consumer rights?"
     
     with col2:
-        if st.button("Property Dispute", key="property_btn"):
-            process_chat_message("How to file a property dispute?")
+        if st.button(_("Property Dispute"), key="property_btn"):
+            message = "How to file a property dispute?"
     
     with col3:
-        if st.button("Employment Law", key="employment_btn"):
-            process_chat_message("Employment law basics")
+        if st.button(_("Employment Law"), key="employment_btn"):
+            message = "Employment law basics"
     
     with col4:
-        if st.button("Send Message", key="send_btn"):
+        if st.button(_("Send Message"), key="send_btn"):
             if user_input:
-                process_chat_message(user_input)
+                message = user_input
+    
+    if message and not rate_limited("chat", email=st.session_state.user_email):
+        with history:
+            process_chat_message(message)
+
+def remember_chat_message(role, content):
+    return sessions.append(st.session_state.conversation_id, role, content)
 
+@metrics.timed("process_chat_message")
 def process_chat_message(message):
-    st.session_state.chat_messages.append({"role": "user", "content": message})
+    remember_chat_message("user", message)
+    st.markdown(chat_bubble("user", message), unsafe_allow_html=True)
     
-    # Generate AI response
-    response = generate_ai_response(message)
-    st.session_state.chat_messages.append({"role": "bot", "content": response})
+    # Stream the reply into its bubble as it is generated
+    placeholder = st.empty()
+    response = ""
+    for token in stream_ai_response(message):
+        response += token
+        placeholder.markdown(chat_bubble("bot", response + "▌"), unsafe_allow_html=True)
+    placeholder.markdown(chat_bubble("bot", response), unsafe_allow_html=True)
     
-    st.rerun()
+    remember_chat_message("bot", response)
+
+def stream_ai_response(message):
+    # Generator interface: a model backend can yield tokens here as they arrive
+    response = translator.translate(generate_ai_response(message), st.session_state.language)
+    yield from stream_words(response)
 
 def generate_ai_response(message):
-    message_lower = message.lower()
-    
-    if 'consumer' in message_lower or 'rights' in message_lower:
-        return "As a consumer in India, you have several rights under the Consumer Protection Act 2019: Right to safety, Right to be informed, Right to choose, Right to be heard, Right to seek redressal, and Right to consumer education. You can file complaints with Consumer Forums for defective goods or deficient services."
-    
-    elif 'property' in message_lower or 'dispute' in message_lower:
-        return "For property disputes, you can approach Civil Courts or Revenue Courts depending on the nature of dispute. Key documents needed include sale deed, title documents, survey records, and possession documents. Consider mediation before litigation as it's faster and cost-effective."
-    
-    elif 'employment' in message_lower or 'job' in message_lower or 'work' in message_lower:
-        return "Indian employment laws cover minimum wages, working hours, leave entitlements, and termination procedures. Key acts include Industrial Disputes Act, Payment of Wages Act, and Employees Provident Fund Act. You can approach Labor Courts for employment-related disputes."
-    
-    else:
-        return "I understand your concern. For specific legal advice, I recommend consulting with a qualified lawyer. However, I can help you understand general legal procedures and guide you through filing a complaint on our platform. What specific aspect would you like to know more about?"
+    # Repeated questions (e.g. the quick-action buttons) are served from the shared cache
+    return response_cache.get_or_compute(normalize_query(message), lambda: knowledge_base.answer(message))
 
 def show_about():
-    st.header("About SimpliLaw")
-    st.write("We believe that justice should be accessible to everyone, regardless of their location, language, or economic status. SimpliLaw uses cutting-edge AI technology to bridge the gap between citizens and the legal system.")
+    st.header(_("About SimpliLaw"))
+    st.write(_("We believe that justice should be accessible to everyone, regardless of their location, language, or economic status. SimpliLaw uses cutting-edge AI technology to bridge the gap between citizens and the legal system."))
     
     col1, col2 = st.columns([1, 1])
     
@@ -511,10 +849,14 @@ def show_about():
             <p style="color: #6b7280;">From rural villages to metropolitan cities, SimpliLaw is making justice accessible to millions of Indians across all states and territories.</p>
         </div>
         """, unsafe_allow_html=True)
+        totals = analytics.totals()
+        col_filed, col_resolved = st.columns(2)
+        col_filed.metric(_("Complaints filed"), f"{totals['filed']:,}")
+        col_resolved.metric(_("Complaints resolved"), f"{totals['resolved']:,}")
 
 def show_contact():
-    st.header("Contact Us")
-    st.subheader("Get in touch with our team for support or partnerships")
+    st.header(_("Contact Us"))
+    st.subheader(_("Get in touch with our team for support or partnerships"))
     
     col1, col2 = st.columns(2)
     
@@ -551,20 +893,155 @@ def show_contact():
             if st.form_submit_button("Send Message"):
                 st.success("Thank you for your message! We'll get back to you soon.")
 
+# Live status updates
+def subscribe_to_status_updates():
+    email = st.session_state.user_email
+    if st.session_state.get('status_subscription_email') != email:
+        st.session_state.status_subscription = status_broker.subscribe(email)
+        st.session_state.status_subscription_email = email
+        st.session_state.status_toasts = []
+
+@st.fragment(run_every="3s")
+def show_status_updates():
+    # Reruns on its own timer but only drains the session's inbox; the full
+    # page is rerun only when the broker has pushed a status change.
+    events = st.session_state.status_subscription.drain()
+    if events:
+        st.session_state.status_toasts.extend(
+            _("Complaint {id} is now {status}", id=event['complaint_id'], status=_(event['status']))
+            for event in events
+        )
+        st.rerun()
+
+@metrics.timed("show_analytics")
+def show_analytics():
+    # Every chart reads rollup tables that triggers keep current, so this page
+    # costs the same with a hundred complaints or ten million
+    st.header(_("Analytics"))
+    st.subheader(_("Complaint volume, progress and resolution times"))
+    
+    totals = analytics.totals()
+    col1, col2, col3, col4 = st.columns(4)
+    col1.metric(_("Complaints filed"), f"{totals['filed']:,}")
+    col2.metric(_("Open"), f"{totals['open']:,}")
+    col3.metric(_("Complaints resolved"), f"{totals['resolved']:,}")
+    avg_days = totals['avg_resolution_days']
+    col4.metric(_("Average days to resolve"), "—" if avg_days is None else f"{avg_days:.1f}")
+    if not totals['filed']:
+        st.info(_("No complaints have been filed yet."))
+        return
+    
+    st.subheader(_("Complaints filed per month, by category"))
+    st.bar_chart(
+        [{_("Month"): month, _("Category"): _(category), _("Complaints"): count}
+         for month, category, count in analytics.filed_by_month()],
+        x=_("Month"), y=_("Complaints"), color=_("Category")
+    )
+    
+    col1, col2 = st.columns(2)
+    with col1:
+        st.subheader(_("Status changes per month"))
+        st.line_chart(
+            [{_("Month"): month, _("Status"): _(status), _("Complaints"): count}
+             for month, status, count in analytics.status_changes_by_month()],
+            x=_("Month"), y=_("Complaints"), color=_("Status")
+        )
+    with col2:
+        st.subheader(_("Current status"))
+        st.bar_chart(
+            [{_("Status"): _(status), _("Complaints"): count} for status, count in analytics.status_counts()],
+            x=_("Status"), y=_("Complaints"), horizontal=True
+        )
+    
+    col1, col2 = st.columns(2)
+    with col1:
+        st.subheader(_("Top districts"))
+        st.dataframe(
+            [{_("District"): district, _("State"): state, _("Complaints"): count}
+             for state, district, count in analytics.top_districts()],
+            width="stretch", hide_index=True
+        )
+    with col2:
+        st.subheader(_("Average days to resolve, by category"))
+        st.dataframe(
+            [{_("Category"): _(category), _("Days"): round(days, 1), _("Resolved"): resolved}
+             for category, days, resolved in analytics.resolution_by_category()],
+            width="stretch", hide_index=True
+        )
+
+# Instrumentation
+def show_metrics():
+    st.header(_("Metrics"))
+    snapshot = metrics.snapshot()
+    st.subheader(_("Latency"))
+    st.dataframe([
+        {
+            'series': summary['name'] + "".join(f" {k}={v}" for k, v in summary['labels'].items()),
+            'count': summary['count'],
+            'p50 ms': summary['quantiles']['0.5'] * 1000,
+            'p90 ms': summary['quantiles']['0.9'] * 1000,
+            'p99 ms': summary['quantiles']['0.99'] * 1000,
+        }
+        for summary in snapshot['summaries'] if summary['name'] == "simplilaw_function_seconds"
+    ], width="stretch")
+    for summary in snapshot['summaries']:
+        if summary['name'] == "simplilaw_session_state_bytes":
+            st.metric(_("Session state size (p50 / p99)"),
+                      f"{summary['quantiles']['0.5'] / 1024:.1f} / {summary['quantiles']['0.99'] / 1024:.1f} KiB")
+    st.subheader(_("Counters"))
+    st.dataframe(
+        [{'counter': c['name'], **c['labels'], 'value': c['value']} for c in snapshot['counters']]
+        + [{'counter': name, 'value': value} for name, value in snapshot['gauges'].items()],
+        width="stretch"
+    )
+    st.download_button(_("Download (Prometheus text)"), metrics.prometheus_text(snapshot),
+                       file_name="simplilaw_metrics.prom", mime="text/plain")
+
 # Main app
+def show_home():
+    show_hero()
+    show_how_it_works()
+
+PAGES = {
+    "home": ("🏠", "Home", show_home),
+    "about": ("ℹ️", "About", show_about),
+    "features": ("⚡", "Features", show_features),
+    "file": ("📝", "File Complaint", show_complaint_form),
+    "complaints": ("📋", "My Complaints", show_complaints),
+    "assistant": ("🤖", "Legal Assistant", show_legal_assistant),
+    "analytics": ("📊", "Analytics", show_analytics),
+    "contact": ("📞", "Contact", show_contact),
+}
+ADMIN_PAGES = {
+    "search": ("🔎", "Search Complaints", show_complaint_search),
+    "metrics": ("📈", "Metrics", show_metrics),
+}
+
+@metrics.timed("main")
 def main():
     show_navigation()
     
     # User authentication in sidebar
     with st.sidebar:
-        if st.session_state.user:
-            st.success(f"Welcome, {st.session_state.user['name']}!")
-            if st.button("Logout"):
-                st.session_state.user = None
+        st.selectbox("🌐 Language", list(LANGUAGES), format_func=LANGUAGES.get, key="language")
+        user = current_user()
+        if user:
+            st.success(_("Welcome, {name}!", name=user['name']))
+            subscribe_to_status_updates()
+            for message in st.session_state.status_toasts:
+                st.toast(message, icon="📋")
+            st.session_state.status_toasts = []
+            show_status_updates()
+            if st.button(_("Logout")):
+                st.session_state.user_email = None
+                # The conversation stays with the account, not the browser
+                st.session_state.conversation_id = uuid.uuid4().hex
+                st.session_state.pop('status_subscription', None)
+                st.session_state.pop('status_subscription_email', None)
                 st.rerun()
         else:
-            st.info("Login to access all features")
-            tab1, tab2 = st.tabs(["Login", "Register"])
+            st.info(_("Login to access all features"))
+            tab1, tab2 = st.tabs([_("Login"), _("Register")])
             
             with tab1:
                 login_form("sidebar_login")
@@ -572,33 +1049,25 @@ def main():
             with tab2:
                 register_form("sidebar_register")
     
-    # Main navigation
-    tab1, tab2, tab3, tab4, tab5, tab6, tab7 = st.tabs([
-        "🏠 Home", "ℹ️ About", "⚡ Features", "📝 File Complaint", 
-        "📋 My Complaints", "🤖 Legal Assistant", "📞 Contact"
-    ])
-    
-    with tab1:
-        show_hero()
-        show_how_it_works()
-    
-    with tab2:
-        show_about()
-    
-    with tab3:
-        show_features()
-    
-    with tab4:
-        show_complaint_form()
-    
-    with tab5:
-        show_complaints()
-    
-    with tab6:
-        show_legal_assistant()
-    
-    with tab7:
-        show_contact()
+    # Main navigation: only the selected page's function runs on a rerun
+    pages = dict(PAGES)
+    # Staff pages need a role granted with `python -m simplilaw.users grant`;
+    # checked on every run so a revoke takes effect at once
+    if user and user_store.has_role(user['email'], "admin"):
+        pages.update(ADMIN_PAGES)
+        if not metrics.enabled:
+            del pages["metrics"]
+    if st.session_state.get('page', "home") not in pages:
+        del st.session_state.page  # e.g. an admin page after logout; back to the default
+    page = st.segmented_control(
+        "Navigation", list(pages), default="home", required=True, key="page",
+        format_func=lambda page: f"{pages[page][0]} {_(pages[page][1])}", label_visibility="collapsed"
+    )
+    metrics.increment("simplilaw_reruns_total", page=page)
+    pages[page][2]()
+    save_session_handles()
+    if metrics.enabled:
+        metrics.observe("simplilaw_session_state_bytes", approximate_size(st.session_state.to_dict()))
 
 if __name__ == "__main__":
     main()
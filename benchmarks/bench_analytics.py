@@ -0,0 +1,123 @@
+# Analytics dashboard queries as the complaint table grows: the rollups should
+# cost the same at every size, while the equivalent raw GROUP BY grows with it.
+# Also reports what the rollup triggers add to inserts.
+#
+#   python benchmarks/bench_analytics.py --sizes 10000,100000,1000000
+
+import argparse
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from simplilaw.analytics import Analytics
+from simplilaw.storage import Database
+
+CATEGORIES = ["Consumer Rights", "Property Dispute", "Employment Issue", "Public Services", "Family Law", "Other"]
+DISTRICTS = [("Telangana", "Hyderabad"), ("Telangana", "Warangal"), ("Maharashtra", "Pune"),
+             ("Tamil Nadu", "Chennai"), ("Uttar Pradesh", "Lucknow"), ("Bihar", "Patna"),
+             ("Rajasthan", "Jaipur"), ("Madhya Pradesh", "Bhopal"), ("Kerala", "Ernakulam"),
+             ("Assam", "Kamrup Metropolitan"), ("Gujarat", "Surat"), ("Karnataka", "Mysuru")]
+SPAN = 2 * 365 * 24 * 3600
+
+
+def seed(db, start, end, batch=10000):
+    # Complaints spread over the last two years, each routed to a district and
+    # about a third of them resolved a few weeks after filing
+    rng = random.Random(start)
+    now = time.time()
+    for first in range(start, end, batch):
+        complaints, routes, events = [], [], []
+        for i in range(first, min(first + batch, end)):
+            complaint_id = f"SL{i:08d}"
+            created = now - rng.random() * SPAN
+            state, district = rng.choice(DISTRICTS)
+            resolved = rng.random() < 0.33
+            complaints.append((complaint_id, "Citizen", "9000000000", rng.choice(CATEGORIES), district,
+                               "Complaint description", "Resolved" if resolved else "Submitted",
+                               "January 01, 2025", f"user{i % 50000}@example.com", created))
+            routes.append((complaint_id, state, district, None, f"District Collector, {district}", created))
+            events.append((complaint_id, "Submitted", "citizen", created))
+            if resolved:
+                events.append((complaint_id, "Resolved", "officer", created + rng.uniform(1, 60) * 86400))
+        with db.transaction() as conn:
+            conn.executemany(
+                "INSERT INTO complaints (id, name, phone, category, location, description,"
+                " status, date, user_email, created_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)", complaints
+            )
+            conn.executemany(
+                "INSERT OR REPLACE INTO complaint_routes"
+                " (complaint_id, state, district, pincode, authority, routed_at) VALUES (?, ?, ?, ?, ?, ?)", routes
+            )
+            conn.executemany(
+                "INSERT INTO complaint_events (complaint_id, status, actor, created_at) VALUES (?, ?, ?, ?)", events
+            )
+
+
+def dashboard(analytics):
+    # Everything show_analytics() reads on one view
+    analytics.totals()
+    analytics.filed_by_month()
+    analytics.status_changes_by_month()
+    analytics.status_counts()
+    analytics.top_districts()
+    analytics.resolution_by_category()
+
+
+def raw_scan(db):
+    # The same numbers computed straight from the raw tables
+    conn = db.connection()
+    conn.execute("SELECT strftime('%Y-%m', created_at, 'unixepoch'), category, COUNT(*) FROM complaints GROUP BY 1, 2").fetchall()
+    conn.execute("SELECT status, COUNT(*) FROM complaints GROUP BY 1").fetchall()
+    conn.execute("SELECT strftime('%Y-%m', created_at, 'unixepoch'), status, COUNT(*) FROM complaint_events GROUP BY 1, 2").fetchall()
+    conn.execute("SELECT state, district, COUNT(*) FROM complaint_routes GROUP BY 1, 2 ORDER BY 3 DESC LIMIT 15").fetchall()
+    conn.execute(
+        "SELECT c.category, AVG(e.created_at - c.created_at) FROM complaint_events e"
+        " JOIN complaints c ON c.id = e.complaint_id WHERE e.status = 'Resolved' GROUP BY 1"
+    ).fetchall()
+
+
+def timed(func, runs):
+    timings = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        func()
+        timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sizes", default="10000,100000,500000",
+                        help="comma-separated complaint counts to measure at")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--skip-raw", action="store_true", help="don't time the raw GROUP BY for comparison")
+    args = parser.parse_args()
+    sizes = sorted(int(size) for size in args.sizes.split(","))
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db = Database(os.path.join(tmp, "bench.db"))
+        analytics = Analytics(db)
+        print(f"{'complaints':>11} {'inserts/s':>10} {'rollup rows':>12} {'dashboard ms':>13} {'raw scan ms':>12}")
+        seeded = 0
+        for size in sizes:
+            start = time.perf_counter()
+            seed(db, seeded, size)
+            rate = (size - seeded) / (time.perf_counter() - start)
+            seeded = size
+            rollup_rows = sum(
+                db.connection().execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+                for table in ("rollup_filed_daily", "rollup_status_current", "rollup_status_daily",
+                              "rollup_districts", "rollup_resolution")
+            )
+            view = timed(lambda: dashboard(analytics), args.runs)
+            raw = "-" if args.skip_raw else f"{timed(lambda: raw_scan(db), max(1, args.runs // 2)):.1f}"
+            print(f"{size:>11,} {rate:>10,.0f} {rollup_rows:>12,} {view:>13.2f} {raw:>12}")
+
+
+if __name__ == "__main__":
+    main()
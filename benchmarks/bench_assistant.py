@@ -0,0 +1,63 @@
+# Index build time and query latency of the legal assistant's BM25 engine on a
+# synthetic corpus padded out to tens of thousands of passages.
+#
+#   python benchmarks/bench_assistant.py --passages 50000 --queries 2000
+
+import argparse
+import os
+import random
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from simplilaw.assistant import LegalKnowledgeBase, KNOWLEDGE_BASE_PATH, tokenize
+
+QUERIES = [
+    "What are my consumer rights?",
+    "How to file a property dispute?",
+    "Employment law basics",
+    "my employer has not paid my salary",
+    "landlord is evicting me without notice",
+    "how do I file an RTI application",
+    "bank debited money from my account without permission",
+    "divorce by mutual consent procedure",
+]
+
+
+def synthetic_corpus(size, seed=7):
+    base = LegalKnowledgeBase.from_file(KNOWLEDGE_BASE_PATH).passages
+    vocabulary = sorted({token for p in base for token in tokenize(p['text'])})
+    rng = random.Random(seed)
+    passages = list(base)
+    while len(passages) < size:
+        words = rng.choices(vocabulary, k=rng.randint(40, 90))
+        passages.append({'source': "Synthetic", 'title': " ".join(words[:4]), 'text': " ".join(words)})
+    return passages
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--passages", type=int, default=50000)
+    parser.add_argument("--queries", type=int, default=2000)
+    args = parser.parse_args()
+
+    passages = synthetic_corpus(args.passages)
+    start = time.perf_counter()
+    kb = LegalKnowledgeBase(passages)
+    print(f"built index over {len(passages)} passages "
+          f"({len(kb.index.vocabulary)} terms) in {time.perf_counter() - start:.2f}s")
+
+    timings = []
+    for i in range(args.queries):
+        start = time.perf_counter()
+        kb.answer(QUERIES[i % len(QUERIES)])
+        timings.append((time.perf_counter() - start) * 1000)
+    timings.sort()
+    print(f"query latency: median {statistics.median(timings):.2f} ms, "
+          f"p99 {timings[int(len(timings) * 0.99)]:.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+# Stress benchmark: submit complaints in parallel from several processes and
+# threads, then check that no complaint id was handed out twice.
+#
+#   python benchmarks/bench_complaint_ids.py --complaints 40000 --processes 4 --threads 8
+
+import argparse
+import multiprocessing
+import os
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from simplilaw.ids import ComplaintIdAllocator
+from simplilaw.storage import Database, ComplaintStore
+
+
+def submit_many(args):
+    db_path, count, threads = args
+    db = Database(db_path)
+    store = ComplaintStore(db)
+    allocator = ComplaintIdAllocator(db)
+
+    def submit(i):
+        complaint = {
+            'id': allocator.next_id(),
+            'name': f"Citizen {i}",
+            'phone': "9000000000",
+            'category': "Public Services",
+            'location': "Hyderabad",
+            'description': "Streetlight not working",
+            'status': 'Submitted',
+            'date': "January 01, 2025",
+            'user_email': f"citizen{i}@example.com",
+        }
+        store.add(complaint)
+        return complaint['id']
+
+    with ThreadPoolExecutor(max_workers=threads) as pool:
+        return list(pool.map(submit, range(count)))
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--complaints", type=int, default=20000)
+    parser.add_argument("--processes", type=int, default=4)
+    parser.add_argument("--threads", type=int, default=8)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = os.path.join(tmp, "bench.db")
+        # Create the schema once before the workers race for it
+        ComplaintStore(Database(db_path))
+        ComplaintIdAllocator(Database(db_path))
+
+        per_process = args.complaints // args.processes
+        start = time.perf_counter()
+        with multiprocessing.Pool(args.processes) as pool:
+            results = pool.map(submit_many, [(db_path, per_process, args.threads)] * args.processes)
+        elapsed = time.perf_counter() - start
+
+        ids = [complaint_id for chunk in results for complaint_id in chunk]
+        stored = ComplaintStore(Database(db_path)).count()
+        duplicates = len(ids) - len(set(ids))
+
+    print(f"submitted:  {len(ids)} complaints in {elapsed:.2f}s ({len(ids) / elapsed:,.0f}/s)")
+    print(f"stored:     {stored}")
+    print(f"duplicates: {duplicates}")
+    if duplicates or stored != len(ids):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+# Render time of the My Complaints page against the number of
+# complaints a single account has filed.
+#
+#   python benchmarks/bench_complaints_render.py --sizes 10 100 1000 10000
+
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+os.environ.setdefault("SIMPLILAW_DB", os.path.join(tempfile.mkdtemp(), "bench.db"))
+
+from streamlit.testing.v1 import AppTest
+
+from simplilaw.ids import ComplaintIdAllocator
+from simplilaw.storage import Database, ComplaintStore
+from simplilaw.users import UserStore
+
+USER = {'name': "Power User", 'email': "ngo@example.com", 'phone': "9000000000"}
+
+
+def seed(store, allocator, count):
+    ids = [allocator.next_id() for _ in range(count)]
+    with store.db.transaction() as conn:
+        for i, complaint_id in enumerate(ids):
+            store._insert(conn, {
+                'id': complaint_id,
+                'name': USER['name'],
+                'phone': USER['phone'],
+                'category': "Public Services",
+                'location': "Warangal",
+                'description': f"Water supply disrupted in ward {i}",
+                'status': 'Submitted',
+                'date': "January 01, 2025",
+                'user_email': USER['email'],
+            })
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10, 100, 1000, 5000])
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+
+    db = Database(os.environ["SIMPLILAW_DB"])
+    store = ComplaintStore(db)
+    allocator = ComplaintIdAllocator(db)
+
+    at = AppTest.from_file(os.path.join(ROOT, "app.py"), default_timeout=120)
+    UserStore(db).register(USER['name'], USER['email'], USER['phone'], "bench-password")
+    at.session_state["user_email"] = USER['email']
+    at.run()
+    # Only the selected page is rendered, so open My Complaints before timing
+    at.button_group(key="page").set_value("complaints").run()
+
+    print(f"{'complaints':>10}  {'median ms':>10}  {'max ms':>8}")
+    seeded = 0
+    for size in sorted(args.sizes):
+        seed(store, allocator, size - seeded)
+        seeded = size
+        timings = []
+        for _ in range(args.runs):
+            start = time.perf_counter()
+            at.run()
+            timings.append((time.perf_counter() - start) * 1000)
+        assert not at.exception, at.exception
+        assert any(header.value == "Your Complaints" for header in at.header), "not on My Complaints"
+        print(f"{size:>10}  {statistics.median(timings):>10.1f}  {max(timings):>8.1f}")
+
+
+if __name__ == "__main__":
+    main()
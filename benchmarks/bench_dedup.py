@@ -0,0 +1,169 @@
+# Near-duplicate detection over a synthetic corpus in which every incident
+# (one problem in one village) is reported by a burst of citizens in slightly
+# different words over the following hours, with incidents spread over two
+# years. Reports ingest throughput, per-submission latency as the store grows,
+# how the LSH index size compares to the number of complaints, and link
+# precision/recall against the known incidents.
+#
+#   python benchmarks/bench_dedup.py --complaints 1000000
+
+import argparse
+import csv
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from simplilaw.dedup import DuplicateDetector
+from simplilaw.routing import GAZETTEER_PATH, Router
+from simplilaw.storage import Database
+
+TEMPLATES = {
+    "Public Services": [
+        "No water supply in {village} near {landmark} since {n} days, tanker has not come",
+        "Street lights on {street} in {village} are not working for {n} weeks, it is unsafe at night",
+        "Big pothole on {street} near {landmark} in {village}, {n} people have fallen off bikes",
+        "Garbage not collected on {street}, {village} for {n} days and it smells very bad",
+        "Drainage overflowing near {landmark} in {village} after rain, {n} houses affected",
+        "Power cut in {village} every evening for {n} hours, transformer near {landmark} is faulty",
+    ],
+    "Consumer Rights": [
+        "Ration shop near {landmark} in {village} gives {n} kg less rice than the card entitlement",
+        "Gas agency on {street}, {village} is charging {n} rupees extra for cylinder delivery",
+    ],
+    "Employment Issue": [
+        "MGNREGA wages for work on {street} in {village} not paid for {n} weeks",
+        "Contractor at {landmark} site in {village} has not paid {n} workers for last month",
+    ],
+    "Property Dispute": [
+        "Neighbour has encroached {n} feet into my plot on {street}, {village}",
+    ],
+}
+LANDMARKS = ["the temple", "the bus stand", "the government school", "the panchayat office", "the market",
+             "the primary health centre", "the railway gate", "the water tank", "the mosque", "the church"]
+STREETS = ["main road", "station road", "market street", "temple street", "school road", "canal road",
+           "bazaar road", "church street", "ring road", "old highway"]
+SYLLABLES = ["ram", "pur", "kota", "palli", "gudem", "nagar", "wada", "peta", "halli", "ganj", "seri", "kal",
+             "veedu", "lam", "bad", "garh", "ur", "chak", "tanda", "konda"]
+SPAN = 2 * 365 * 24 * 3600
+OPENERS = ["", "", "Sir, ", "Respected sir, ", "Please help. ", "Dear officer, ", "Urgent: "]
+CLOSERS = ["", "", " Please help.", " Kindly take action.", " Please do something soon.",
+           " Nobody is responding.", " We have complained before also."]
+
+
+def districts():
+    with open(GAZETTEER_PATH, newline="", encoding="utf-8") as f:
+        return [row['district'] for row in csv.DictReader(f)]
+
+
+def paraphrase(rng, text):
+    # A citizen's own wording: drop a few words, vary case, add an opener/closer
+    words = [word for word in text.split() if rng.random() > 0.08]
+    text = " ".join(words)
+    if rng.random() < 0.3:
+        text = text.lower()
+    return rng.choice(OPENERS) + text + rng.choice(CLOSERS)
+
+
+def corpus(count, seed=11):
+    # Yields (complaint, created_at, incident) in filing order, with incidents
+    # reported 1 to ~60 times each, a few hours apart on average
+    rng = random.Random(seed)
+    places = districts()
+    start = time.time() - SPAN
+    index = incident = 0
+    while index < count:
+        incident += 1
+        filed_at = start + index * SPAN / count
+        category = rng.choice(list(TEMPLATES))
+        village = "".join(rng.sample(SYLLABLES, rng.randint(2, 3))).title()
+        district = rng.choice(places)
+        text = rng.choice(TEMPLATES[category]).format(
+            village=village, landmark=rng.choice(LANDMARKS), street=rng.choice(STREETS), n=rng.randint(2, 30)
+        )
+        reports = 1 if rng.random() < 0.6 else min(int(rng.paretovariate(1.2)) + 1, 60)
+        for _ in range(min(reports, count - index)):
+            filed_at += rng.expovariate(1 / 7200)
+            yield {
+                'id': f"SL{index:08d}", 'name': "Citizen", 'phone': "9000000000", 'category': category,
+                'location': f"{village}, {district}" if rng.random() < 0.7 else district,
+                'description': paraphrase(rng, text), 'status': "Submitted", 'date': "January 01, 2025",
+                'user_email': f"user{index % 50000}@example.com",
+            }, filed_at, incident
+            index += 1
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--complaints", type=int, default=200000)
+    parser.add_argument("--batch", type=int, default=5000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "bench.db")
+        db = Database(path)
+        detector = DuplicateDetector(db, Router())
+        incident_of, first_of = {}, {}
+        linked = correct = expected = 0
+        report_every = max(args.complaints // 10, args.batch)
+        print(f"{'complaints':>11} {'complaints/s':>13} {'p50 ms':>7} {'p99 ms':>7} {'lsh rows':>10} {'linked':>8}")
+        batch, latencies = [], []
+        start = time.perf_counter()
+        generated = corpus(args.complaints)
+        done = False
+        while not done:
+            batch = []
+            for complaint, filed_at, incident in generated:
+                complaint['created_at'] = filed_at
+                batch.append((complaint, incident))
+                if len(batch) == args.batch:
+                    break
+            else:
+                done = True
+            if not batch:
+                break
+            with db.transaction() as conn:
+                conn.executemany(
+                    "INSERT INTO complaints (id, name, phone, category, location, description,"
+                    " status, date, user_email, created_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    [(c['id'], c['name'], c['phone'], c['category'], c['location'], c['description'],
+                      c['status'], c['date'], c['user_email'], c['created_at']) for c, _ in batch],
+                )
+            # The last 200 of each batch go through one at a time, as the form submits them
+            timed_from = len(batch) - min(200, len(batch))
+            parents = detector.add_many([c for c, _ in batch[:timed_from]])
+            for complaint, _ in batch[timed_from:]:
+                t0 = time.perf_counter()
+                parents.append(detector.add(complaint))
+                latencies.append((time.perf_counter() - t0) * 1000)
+            for (complaint, incident), parent in zip(batch, parents):
+                incident_of[complaint['id']] = incident
+                if incident in first_of:
+                    expected += 1
+                else:
+                    first_of[incident] = complaint['id']
+                if parent:
+                    linked += 1
+                    correct += incident_of[parent] == incident
+            total = len(incident_of)
+            if total % report_every < args.batch or done:
+                lsh_rows = db.connection().execute("SELECT COUNT(*) FROM complaint_lsh").fetchone()[0]
+                latencies.sort()
+                print(f"{total:>11,} {total / (time.perf_counter() - start):>13,.0f}"
+                      f" {statistics.median(latencies):>7.2f} {latencies[int(len(latencies) * 0.99)]:>7.2f}"
+                      f" {lsh_rows:>10,} {linked:>8,}")
+                latencies = []
+
+        size = os.path.getsize(path) + (os.path.getsize(path + "-wal") if os.path.exists(path + "-wal") else 0)
+        print(f"\nincidents: {len(first_of):,}  repeat reports: {expected:,}  linked: {linked:,}")
+        print(f"precision: {correct / max(linked, 1):.3f}  recall: {correct / max(expected, 1):.3f}")
+        print(f"clusters to process: {len(incident_of) - linked:,} instead of {len(incident_of):,} complaints")
+        print(f"database size: {size / 2**20:,.0f} MiB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,162 @@
+# Offline queue -> ingest API sync over a simulated 2G link. Compares one
+# request per complaint with batched syncs (time and bytes on the wire), then
+# syncs over a link that drops connections mid-reply and checks every queued
+# complaint was filed exactly once.
+#
+#   python benchmarks/bench_ingest.py --complaints 100 --kbps 48 --latency-ms 300
+
+import argparse
+import http.client
+import os
+import queue
+import random
+import socket
+import sys
+import tempfile
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from simplilaw.dedup import DuplicateDetector
+from simplilaw.ids import ComplaintIdAllocator
+from simplilaw.ingest import ComplaintIngest, IngestClient, IngestServer
+from simplilaw.routing import Router, RouteStore
+from simplilaw.status import StatusTracker
+from simplilaw.storage import ComplaintStore, Database
+from simplilaw.users import UserStore
+
+CATEGORIES = ["Consumer Rights", "Property Dispute", "Employment Issue", "Public Services", "Family Law", "Other"]
+VILLAGES = ["Rampur, Warangal", "Kotapalli, Nalgonda", "Sirsa, Hisar", "Barhi, Hazaribagh", "Palasa, Srikakulam"]
+WORDS = ("water supply electricity refund salary landlord deposit road pothole garbage ration card pension "
+         "wages overtime eviction hospital school fees delay defective warranty insurance claim bank loan "
+         "harassment drainage streetlight tax certificate village panchayat tanker transformer").split()
+
+
+class SlowLink:
+    """TCP proxy that delays and throttles each direction, optionally dropping replies."""
+
+    def __init__(self, target, bytes_per_second, latency, drop=0.0, seed=3):
+        self.target = target
+        self.rate = bytes_per_second
+        self.latency = latency
+        self.drop = drop
+        self.rng = random.Random(seed)
+        self.sent = {'up': 0, 'down': 0}
+        self.connections = 0
+        self.listener = socket.create_server(("127.0.0.1", 0))
+        self.address = self.listener.getsockname()
+        threading.Thread(target=self._accept, daemon=True).start()
+
+    def _accept(self):
+        while True:
+            client, _ = self.listener.accept()
+            server = socket.create_connection(self.target)
+            self.connections += 1
+            threading.Thread(target=self._pump, args=(client, server, 'up'), daemon=True).start()
+            threading.Thread(target=self._pump, args=(server, client, 'down'), daemon=True).start()
+
+    def _pump(self, source, sink, direction):
+        # Chunks are stamped as they arrive and delivered `latency` later,
+        # no faster than the link rate, so latency overlaps like on a real link
+        chunks = queue.Queue()
+        threading.Thread(target=self._deliver, args=(chunks, sink, direction), daemon=True).start()
+        try:
+            while True:
+                chunk = source.recv(4096)
+                if not chunk or (direction == 'down' and self.rng.random() < self.drop):
+                    break  # closed, or the reply is lost somewhere past the tower
+                chunks.put((time.monotonic(), chunk))
+        except OSError:
+            pass
+        chunks.put((time.monotonic(), None))
+
+    def _deliver(self, chunks, sink, direction):
+        free_at = 0.0
+        while True:
+            arrived, chunk = chunks.get()
+            if chunk is None:
+                break
+            deliver_at = max(arrived + self.latency, free_at) + len(chunk) / self.rate
+            time.sleep(max(0.0, deliver_at - time.monotonic()))
+            free_at = deliver_at
+            try:
+                sink.sendall(chunk)
+            except OSError:
+                break
+            self.sent[direction] += len(chunk)
+        time.sleep(max(0.0, arrived + self.latency - time.monotonic()))
+        try:
+            sink.shutdown(socket.SHUT_RDWR)
+        except OSError:
+            pass
+        sink.close()
+
+
+def queue_complaints(client, count, rng):
+    for _ in range(count):
+        client.queue(rng.choice(CATEGORIES), rng.choice(VILLAGES),
+                     " ".join(rng.choices(WORDS, k=rng.randint(15, 40))).capitalize() + ".")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--complaints", type=int, default=100)
+    parser.add_argument("--kbps", type=float, default=48, help="link bandwidth in kbit/s each way")
+    parser.add_argument("--latency-ms", type=float, default=300, help="one-way latency")
+    parser.add_argument("--drop", type=float, default=0.3, help="chance a reply chunk kills the connection, lossy run")
+    args = parser.parse_args()
+    rate = args.kbps * 1000 / 8
+    latency = args.latency_ms / 1000
+    rng = random.Random(5)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db = Database(os.path.join(tmp, "server.db"))
+        users = UserStore(db)
+        users.register("Lakshmi", "lakshmi@example.com", "9000000000", "field-kiosk-pw")
+        route_store = RouteStore(db, Router())
+        ingest = ComplaintIngest(db, users, ComplaintIdAllocator(db), ComplaintStore(db), StatusTracker(db),
+                                 route_store, DuplicateDetector(db, route_store.router))
+        server = IngestServer(ingest, ("127.0.0.1", 0))
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+
+        print(f"link: {args.kbps:g} kbit/s, {args.latency_ms:g} ms one way; {args.complaints} queued complaints")
+        print(f"{'batch':>6} {'seconds':>8} {'s/complaint':>12} {'bytes up':>9} {'bytes down':>11} {'B/complaint':>12}")
+        for batch in (1, 10, 25, 100):
+            link = SlowLink(server.server_address, rate, latency)
+            client = IngestClient(f"http://127.0.0.1:{link.address[1]}", os.path.join(tmp, f"outbox{batch}.db"))
+            client.login("lakshmi@example.com", "field-kiosk-pw")
+            queue_complaints(client, args.complaints, rng)
+            link.sent = {'up': 0, 'down': 0}
+            start = time.perf_counter()
+            result = client.sync(batch_size=batch)
+            elapsed = time.perf_counter() - start
+            client.close()
+            assert result['error'] is None and len(result['filed']) == args.complaints, result['error']
+            total = link.sent['up'] + link.sent['down']
+            print(f"{batch:>6} {elapsed:>8.1f} {elapsed / args.complaints:>12.2f} {link.sent['up']:>9,}"
+                  f" {link.sent['down']:>11,} {total / args.complaints:>12.0f}")
+
+        link = SlowLink(server.server_address, rate, latency, drop=args.drop)
+        client = IngestClient(f"http://127.0.0.1:{link.address[1]}", os.path.join(tmp, "lossy.db"), timeout=30)
+        while not client.token:
+            try:
+                client.login("lakshmi@example.com", "field-kiosk-pw")
+            except (OSError, http.client.HTTPException):
+                pass
+        queue_complaints(client, args.complaints, rng)
+        before = ComplaintStore(db).count()
+        attempts, filed = 0, {}
+        while client.pending():
+            attempts += 1
+            filed.update(client.sync(batch_size=10)['filed'])
+        client.close()
+        created = ComplaintStore(db).count() - before
+        print(f"\nlossy link (drop {args.drop:g}): {attempts} sync attempts over {link.connections} connections,"
+              f" {len(filed)} acknowledged, {created} filed on the server"
+              f" -> {'no duplicates' if created == args.complaints else 'MISMATCH'}")
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+# Login throughput against a user store holding 100k registered accounts.
+#
+#   python benchmarks/bench_login.py --users 100000 --logins 200 --clients 16
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from simplilaw.storage import Database
+from simplilaw.users import UserStore, hash_password
+
+PASSWORD = "correct horse battery staple"
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--users", type=int, default=100000)
+    parser.add_argument("--logins", type=int, default=200)
+    parser.add_argument("--clients", type=int, default=16)
+    parser.add_argument("--hash-workers", type=int, default=os.cpu_count() or 2)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db = Database(os.path.join(tmp, "bench.db"))
+        users = UserStore(db, hash_workers=args.hash_workers)
+
+        # Hashing 100k passwords would dominate the run; lookups and
+        # verification are what we measure, so all seeded rows share one hash.
+        password_hash = hash_password(PASSWORD)
+        start = time.perf_counter()
+        with db.transaction() as conn:
+            conn.executemany(
+                "INSERT INTO users (email, name, phone, password_hash, created_at) VALUES (?, ?, ?, ?, ?)",
+                ((f"citizen{i}@example.com", f"Citizen {i}", "9000000000", password_hash, time.time())
+                 for i in range(args.users)),
+            )
+        print(f"seeded {args.users} users in {time.perf_counter() - start:.2f}s")
+
+        def login(i):
+            email = f"  Citizen{(i * 7919) % args.users}@Example.com "
+            start = time.perf_counter()
+            user = users.authenticate(email, PASSWORD)
+            assert user is not None
+            return time.perf_counter() - start
+
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=args.clients) as clients:
+            latencies = sorted(clients.map(login, range(args.logins)))
+        elapsed = time.perf_counter() - start
+
+    print(f"logins:     {args.logins} with {args.clients} clients, {args.hash_workers} hash workers")
+    print(f"throughput: {args.logins / elapsed:.1f} logins/s")
+    print(f"latency:    p50 {latencies[len(latencies) // 2] * 1000:.1f} ms, "
+          f"p99 {latencies[int(len(latencies) * 0.99)] * 1000:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
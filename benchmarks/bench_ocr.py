@@ -0,0 +1,67 @@
+# Throughput of the OCR/metadata extraction pool, in images per second per core.
+#
+#   python benchmarks/bench_ocr.py --images 400 --workers 4
+
+import argparse
+import io
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from PIL import Image, ImageDraw
+
+from simplilaw.ocr import OcrPipeline
+from simplilaw.storage import Database
+from simplilaw.uploads import DocumentStore
+
+
+def scanned_page(i):
+    image = Image.new("RGB", (1240, 1754), "white")
+    draw = ImageDraw.Draw(image)
+    for line in range(30):
+        draw.text((80, 80 + line * 50), f"Complaint evidence {i} line {line}: water supply disrupted", fill="black")
+    buffer = io.BytesIO()
+    image.save(buffer, "PNG")
+    buffer.seek(0)
+    return buffer
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--images", type=int, default=200)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--batch-size", type=int, default=8)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        documents = DocumentStore(Database(os.path.join(tmp, "bench.db")), root=os.path.join(tmp, "uploads"))
+        hashes = [documents.save(scanned_page(i), f"scan{i}.png") for i in range(args.images)]
+        pipeline = OcrPipeline(documents, workers=args.workers, batch_size=args.batch_size)
+
+        start = time.perf_counter()
+        for sha256 in hashes:
+            pipeline.enqueue(sha256)
+        pipeline.wait()
+        elapsed = time.perf_counter() - start
+
+        # Second pass is served entirely from the content-hash cache
+        start = time.perf_counter()
+        for sha256 in hashes:
+            pipeline.enqueue(sha256)
+        pipeline.wait()
+        cached_elapsed = time.perf_counter() - start
+
+        engine = pipeline.result(hashes[0])['engine']
+        pipeline.shutdown()
+
+    rate = args.images / elapsed
+    print(f"engine:     {engine}, {args.workers} workers, batches of {args.batch_size}")
+    print(f"throughput: {rate:.1f} images/s ({rate / args.workers:.1f} images/s per core)")
+    print(f"cached:     {args.images / cached_elapsed:.0f} images/s")
+
+
+if __name__ == "__main__":
+    main()
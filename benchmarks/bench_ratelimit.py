@@ -0,0 +1,64 @@
+# Cost of one rate-limit check as the number of tracked clients grows, for the
+# in-process and SQLite bucket stores, plus how much of a scripted login flood
+# from one IP gets through.
+#
+#   python benchmarks/bench_ratelimit.py --clients 1000000
+
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from simplilaw.ratelimit import MemoryBucketStore, RateLimiter, SQLiteBucketStore
+from simplilaw.storage import Database
+
+
+def check_latency(limiter, clients, samples=2000):
+    # Fill the store with distinct clients, then time checks spread across them
+    for index in range(clients):
+        limiter.hit('chat', session=f"s{index}", ip=f"10.{index >> 16 & 255}.{index >> 8 & 255}.{index & 255}")
+    timings = []
+    for index in range(samples):
+        client = index * 7919 % clients
+        start = time.perf_counter()
+        limiter.hit('chat', session=f"s{client}", ip=f"10.{client >> 16 & 255}.{client >> 8 & 255}.{client & 255}")
+        timings.append((time.perf_counter() - start) * 1e6)
+    timings.sort()
+    return statistics.median(timings), timings[int(len(timings) * 0.99)]
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--clients", type=int, default=100000)
+    args = parser.parse_args()
+
+    sizes = [size for size in (1000, 10000, 100000, 1000000) if size <= args.clients]
+    print(f"{'clients':>10} {'store':>7} {'p50 us':>7} {'p99 us':>7}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for size in sizes:
+            for name in ("memory", "sqlite"):
+                if name == "memory":
+                    store = MemoryBucketStore(maxsize=2 * size)
+                else:
+                    store = SQLiteBucketStore(Database(os.path.join(tmp, f"limits{size}.db")))
+                p50, p99 = check_latency(RateLimiter(store=store), size)
+                print(f"{size:>10,} {name:>7} {p50:>7.1f} {p99:>7.1f}")
+
+        # One script guessing passwords for a handful of accounts as fast as it can
+        limiter = RateLimiter()
+        attempts = 20000
+        start = time.perf_counter()
+        for index in range(attempts):
+            limiter.hit('login', session=f"s{index}", ip="203.0.113.7", email=f"victim{index % 5}@example.com")
+        elapsed = time.perf_counter() - start
+        stats = limiter.stats()
+        print(f"\nlogin flood: {attempts:,} attempts in {elapsed:.2f}s, {stats.get('allowed_login', 0)} let through,"
+              f" {stats.get('rejected_login', 0):,} rejected")
+
+
+if __name__ == "__main__":
+    main()
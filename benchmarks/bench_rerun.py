@@ -0,0 +1,60 @@
+# Script time per rerun of app.py for a logged-in user with some history, as
+# seen on each page.
+#
+#   python benchmarks/bench_rerun.py --runs 30
+
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+os.environ.setdefault("SIMPLILAW_DB", os.path.join(tempfile.mkdtemp(), "bench.db"))
+os.environ.setdefault("SIMPLILAW_UPLOADS", tempfile.mkdtemp())
+
+from streamlit.testing.v1 import AppTest
+
+from simplilaw.storage import Database
+from simplilaw.users import UserStore
+
+PAGES = ("home", "about", "features", "file", "complaints", "assistant", "contact")
+USER = {'name': "Asha", 'email': "asha@example.com", 'phone': "9000000000"}
+
+
+def time_reruns(at, runs):
+    timings = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        at.run()
+        timings.append((time.perf_counter() - start) * 1000)
+    assert not at.exception, at.exception
+    timings.sort()
+    return statistics.median(timings), timings[int(len(timings) * 0.9)]
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--runs", type=int, default=30)
+    args = parser.parse_args()
+
+    at = AppTest.from_file(os.path.join(ROOT, "app.py"), default_timeout=120)
+    UserStore(Database(os.environ["SIMPLILAW_DB"])).register(USER['name'], USER['email'], USER['phone'], "bench-password")
+    at.session_state["user_email"] = USER['email']
+    at.run()
+
+    print(f"{'page':<20} {'median ms':>10} {'p90 ms':>8}")
+    if not at.button_group or not any(w.key == "page" for w in at.button_group):
+        median, p90 = time_reruns(at, args.runs)
+        print(f"{'all tabs':<20} {median:>10.1f} {p90:>8.1f}")
+        return
+    for page in PAGES:
+        at.button_group(key="page").set_value(page)
+        median, p90 = time_reruns(at, args.runs)
+        print(f"{page:<20} {median:>10.1f} {p90:>8.1f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,117 @@
+# Full-text and faceted search latency over a large complaint table, and the
+# cost the search triggers add to inserts. Locations are free text the way
+# citizens type them ("Ward 17, Hanamkonda, Warangal", "H.No 2-41 near bus
+# stand, Kazipet"), almost all distinct, and are routed as the app routes them.
+#
+#   python benchmarks/bench_search.py --complaints 1000000
+
+import argparse
+import csv
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from simplilaw.routing import GAZETTEER_PATH, Router, RouteStore
+from simplilaw.search import ComplaintSearch
+from simplilaw.storage import Database, ComplaintStore
+
+CATEGORIES = ["Consumer Rights", "Property Dispute", "Employment Issue", "Public Services", "Family Law", "Other"]
+STATUSES = ["Submitted", "Under Review", "Action Taken", "Resolved"]
+LOCALITIES = ["Kazipet", "Hanamkonda", "Gandhi Nagar", "Old Town", "Station Area", "Ramnagar", "Shivaji Colony",
+              "Market Yard", "Indira Nagar", "Bus Stand Road", "Subhash Chowk", "Nehru Colony"]
+PREFIXES = ["Ward {n}", "H.No {n}-{m}", "Plot {n}", "Door No {n}/{m}", "Street {n}", "Sector {n}", "Flat {m}, Block {n}"]
+
+
+def districts():
+    with open(GAZETTEER_PATH, newline="", encoding="utf-8") as f:
+        return [(row['district'], row['state']) for row in csv.DictReader(f)]
+
+
+def free_text_location(rng, places):
+    address = rng.choice(PREFIXES).format(n=rng.randint(1, 400), m=rng.randint(1, 99))
+    locality = rng.choice(LOCALITIES)
+    roll = rng.random()
+    if roll < 0.8:
+        return f"{address}, {locality}, {rng.choice(places)[0]}"
+    if roll < 0.9:
+        return f"{address}, {locality}, {rng.choice(places)[1]}"  # state only
+    return f"{address}, near {locality}"  # nothing the gazetteer knows
+
+WORDS = ("water supply electricity refund salary landlord deposit road pothole garbage ration card pension "
+         "wages overtime eviction dowry custody maintenance hospital school fees bribe delay defective "
+         "warranty insurance claim bank loan harassment noise drainage streetlight tax certificate").split()
+QUERIES = ["water", "refund defective", "salary wages", "landlord deposit", "pension delay", "refunds"]
+
+
+def seed(store, routes, count, batch=10000):
+    rng = random.Random(7)
+    places = districts()
+    start_time = time.time() - 365 * 24 * 3600
+    for start in range(0, count, batch):
+        complaints = [{
+            'id': f"SL{i:08d}", 'category': rng.choice(CATEGORIES), 'location': free_text_location(rng, places),
+            'description': " ".join(rng.choices(WORDS, k=12)), 'status': rng.choice(STATUSES),
+            'user_email': f"user{i % 50000}@example.com", 'created_at': start_time + i * 365 * 24 * 3600 / count,
+        } for i in range(start, min(start + batch, count))]
+        with store.db.transaction() as conn:
+            conn.executemany(
+                "INSERT INTO complaints (id, name, phone, category, location, description,"
+                " status, date, user_email, created_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                [(c['id'], "Citizen", "9000000000", c['category'], c['location'], c['description'], c['status'],
+                  "January 01, 2025", c['user_email'], c['created_at']) for c in complaints],
+            )
+            routes.route_complaints(complaints)
+
+
+def timed(func, runs):
+    timings = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        func()
+        timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings), max(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--complaints", type=int, default=200000)
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db = Database(os.path.join(tmp, "bench.db"))
+        store = ComplaintStore(db)
+        search = ComplaintSearch(db)
+        routes = RouteStore(db, Router())
+
+        start = time.perf_counter()
+        seed(store, routes, args.complaints)
+        elapsed = time.perf_counter() - start
+        conn = db.connection()
+        locations = conn.execute("SELECT COUNT(DISTINCT location) FROM complaints").fetchone()[0]
+        cells = conn.execute("SELECT COUNT(*) FROM complaint_facets").fetchone()[0]
+        print(f"seeded {args.complaints} complaints with live indexing and routing:"
+              f" {args.complaints / elapsed:,.0f} inserts/s")
+        print(f"{locations:,} distinct locations, {cells:,} facet cube cells")
+
+        cases = [("facets only", None, None),
+                 ("facet filter", None, {'category': "Public Services", 'district': "Pune, Maharashtra"}),
+                 ("state-only filter", None, {'district': "Telangana"}),
+                 ("unknown place filter", None, {'district': "Unknown"})]
+        cases += [(f"text '{q}'", q, None) for q in QUERIES]
+        cases += [("text + facets", "water", {'status': "Resolved", 'district': "Chennai, Tamil Nadu"})]
+
+        print(f"{'query':<28} {'matches':>9} {'median ms':>10} {'max ms':>8}")
+        for label, text, filters in cases:
+            total = search.search(text, filters)['total']
+            median, worst = timed(lambda: search.search(text, filters), args.runs)
+            print(f"{label:<28} {total:>9} {median:>10.1f} {worst:>8.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+# Bulk status changes, as an authority closing out a backlog would make them
+# with `python -m simplilaw.status move`: throughput of bulk_transition for
+# growing batches, with the search and analytics triggers the app installs,
+# and how long the broker takes to deliver the resulting events to open
+# sessions.
+#
+#   python benchmarks/bench_status.py --complaints 500000
+
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from simplilaw.analytics import Analytics
+from simplilaw.search import ComplaintSearch
+from simplilaw.status import STATUSES, StatusBroker, StatusTracker
+from simplilaw.storage import ComplaintStore, Database
+
+CATEGORIES = ["Consumer Rights", "Property Dispute", "Employment Issue", "Public Services", "Family Law", "Other"]
+USERS = 50000
+
+
+def seed(db, tracker, count, batch=10000):
+    rng = random.Random(11)
+    start_time = time.time() - 365 * 24 * 3600
+    for start in range(0, count, batch):
+        ids = [f"SL{i:08d}" for i in range(start, min(start + batch, count))]
+        with db.transaction() as conn:
+            conn.executemany(
+                "INSERT INTO complaints (id, name, phone, category, location, description,"
+                " status, date, user_email, created_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                [(complaint_id, "Citizen", "9000000000", rng.choice(CATEGORIES), f"Ward {i % 40}, Warangal",
+                  "Streetlight not working", 'Submitted', "January 01, 2025", f"user{i % USERS}@example.com",
+                  start_time + i * 365 * 24 * 3600 / count)
+                 for i, complaint_id in enumerate(ids, start)],
+            )
+            tracker.submitted_many(ids)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--complaints", type=int, default=200000)
+    parser.add_argument("--sessions", type=int, default=1000, help="open sessions subscribed to status events")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db = Database(os.path.join(tmp, "bench.db"))
+        ComplaintStore(db)
+        ComplaintSearch(db)
+        Analytics(db)
+        tracker = StatusTracker(db)
+        seed(db, tracker, args.complaints)
+        print(f"seeded {args.complaints:,} complaints")
+
+        broker = StatusBroker(db, interval=3600)  # polled by hand below
+        sessions = [broker.subscribe(f"user{i}@example.com") for i in range(min(args.sessions, USERS))]
+        ids = [f"SL{i:08d}" for i in range(args.complaints)]
+        random.Random(3).shuffle(ids)
+
+        print(f"{'batch':>8} {'status':<13} {'moved':>8} {'ms':>8} {'per s':>9} {'deliver ms':>11} {'delivered':>10}")
+        offset = 0
+        for size in (100, 1000, 10000, 100000):
+            if offset + size > len(ids):
+                break
+            batch = ids[offset:offset + size]
+            offset += size
+            for status in STATUSES[1:]:
+                start = time.perf_counter()
+                changed = tracker.bulk_transition(batch, status, "Collector, Warangal", "bulk update")
+                elapsed = time.perf_counter() - start
+                start = time.perf_counter()
+                while broker.poll():
+                    pass
+                deliver = time.perf_counter() - start
+                delivered = sum(len(session.drain()) for session in sessions)
+                print(f"{size:>8,} {status:<13} {len(changed):>8,} {elapsed * 1000:>8.1f}"
+                      f" {len(changed) / elapsed:>9,.0f} {deliver * 1000:>11.1f} {delivered:>10,}")
+
+        # Already at or past the target: nothing changes and nothing is logged
+        start = time.perf_counter()
+        changed = tracker.bulk_transition(ids[:offset], "Under Review", "Collector, Warangal")
+        print(f"\nrepeat of {offset:,} already-moved ids: {len(changed)} changed in"
+              f" {(time.perf_counter() - start) * 1000:.1f} ms")
+        broker.stop()
+
+
+if __name__ == "__main__":
+    main()
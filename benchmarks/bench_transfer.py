@@ -0,0 +1,101 @@
+# Bulk export and import of complaints at a few store sizes, for each file
+# format. Every export and import runs in a fresh child process so its peak
+# RSS can be read on its own: with batched transfer it should stay flat as the
+# store grows, while time grows linearly.
+#
+#   python benchmarks/bench_transfer.py --sizes 100000,1000000,3000000
+
+import argparse
+import os
+import random
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from simplilaw.routing import Router, RouteStore
+from simplilaw.status import STATUSES
+from simplilaw.storage import COMPLAINT_FIELDS, ComplaintStore, Database
+from simplilaw.transfer import FORMATS, export_complaints, import_complaints, pa
+
+CATEGORIES = ["Consumer Rights", "Property Dispute", "Employment Issue", "Public Services", "Family Law", "Other"]
+WORDS = ("water supply electricity refund salary landlord deposit road pothole garbage ration card pension "
+         "wages overtime eviction hospital school fees delay defective warranty insurance claim bank loan "
+         "harassment drainage streetlight tax certificate village panchayat tanker transformer").split()
+
+
+def populate(db, count, batch=20000):
+    rng = random.Random(7)
+    columns = ", ".join(COMPLAINT_FIELDS)
+    sql = f"INSERT INTO complaints ({columns}, created_at) VALUES ({', '.join('?' * (len(COMPLAINT_FIELDS) + 1))})"
+    now = time.time()
+    for offset in range(0, count, batch):
+        rows = [
+            (f"SL{index:09d}", f"Citizen {index % 9973}", f"9{index % 10**9:09d}", rng.choice(CATEGORIES),
+             f"Village {index % 4000}, District {index % 600}",
+             " ".join(rng.choices(WORDS, k=rng.randint(15, 40))).capitalize() + ".",
+             rng.choice(STATUSES), "March 05, 2025", f"user{index % 50000}@example.com", now)
+            for index in range(offset, min(offset + batch, count))
+        ]
+        with db.transaction() as conn:
+            conn.executemany(sql, rows)
+
+
+def child(args):
+    # One export or import, then report seconds and peak RSS on stdout
+    db = Database(args.db)
+    start = time.perf_counter()
+    if args.child == "export":
+        count = export_complaints(db, args.path)
+    else:
+        count = import_complaints(db, args.path, routes=RouteStore(db, Router()))['inserted']  # as the CLI does
+    elapsed = time.perf_counter() - start
+    print(count, elapsed, resource.getrusage(resource.RUSAGE_SELF).ru_maxrss)
+
+
+def run_child(command, db_path, path):
+    out = subprocess.run(
+        [sys.executable, os.path.abspath(__file__), "--child", command, "--db", db_path, "--path", path],
+        check=True, capture_output=True, text=True,
+    ).stdout.split()
+    return int(out[0]), float(out[1]), int(out[2]) / 1024
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sizes", default="100000,1000000")
+    parser.add_argument("--child", choices=("export", "import"), help=argparse.SUPPRESS)
+    parser.add_argument("--db", help=argparse.SUPPRESS)
+    parser.add_argument("--path", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.child:
+        return child(args)
+
+    formats = [suffix for suffix, name in FORMATS.items() if name == "jsonl" or pa is not None]
+    print(f"{'complaints':>11} {'format':>10} {'export s':>9} {'rows/s':>9} {'RSS MiB':>8}"
+          f" {'file MiB':>9} {'import s':>9} {'rows/s':>9} {'RSS MiB':>8}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for size in (int(size) for size in args.sizes.split(",")):
+            source = os.path.join(tmp, f"source{size}.db")
+            populate(ComplaintStore(Database(source)).db, size)
+            for suffix in formats:
+                path = os.path.join(tmp, f"complaints{size}{suffix}")
+                exported, export_s, export_rss = run_child("export", source, path)
+                target = os.path.join(tmp, f"target{size}{suffix}.db")
+                imported, import_s, import_rss = run_child("import", target, path)
+                assert exported == imported == size, (exported, imported)
+                print(f"{size:>11,} {suffix:>10} {export_s:>9.1f} {size / export_s:>9,.0f} {export_rss:>8.0f}"
+                      f" {os.path.getsize(path) / 2**20:>9.0f} {import_s:>9.1f} {size / import_s:>9,.0f}"
+                      f" {import_rss:>8.0f}")
+                os.remove(path)
+                for name in os.listdir(tmp):
+                    if name.startswith(f"target{size}"):
+                        os.remove(os.path.join(tmp, name))
+
+
+if __name__ == "__main__":
+    main()
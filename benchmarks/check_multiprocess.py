@@ -0,0 +1,195 @@
+# Multi-worker check: state written through one worker process is visible
+# from another, with no affinity between them.
+#
+# Part 1 drives app.py through AppTest in separate interpreters sharing one
+# database. Worker A registers, files a complaint, asks the assistant a
+# question and switches to Hindi. Worker B logs in, as a browser reconnecting
+# to another worker would, and must show the same complaint and conversation.
+# Worker C opens the page URL A ended on without logging in: it keeps the
+# language but must not be logged in or show the conversation.
+#
+# Part 2 starts real Streamlit workers behind simplilaw.workers' balancer,
+# kills the worker a client is routed to and checks the client is still served
+# and the worker comes back.
+#
+#   python benchmarks/check_multiprocess.py
+
+import argparse
+import asyncio
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import urllib.request
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+USER = {'name': "Asha Worker", 'email': "asha.worker@example.com", 'phone': "9876500000", 'password': "two-workers"}
+DESCRIPTION = "Handpump near the school in Rampur has been broken for three weeks"
+QUESTION = "What are my consumer rights?"
+
+
+def by_label(widgets, label):
+    return next(widget for widget in widgets if widget.label == label)
+
+
+def page_text(at):
+    return "\n".join(str(element.value) for element in at.markdown) + "\n".join(
+        str(element.value) for element in at.caption
+    )
+
+
+def worker_a(at):
+    at.run()
+    at.text_input(key="register_name_sidebar_register").input(USER['name'])
+    at.text_input(key="register_email_sidebar_register").input(USER['email'])
+    at.text_input(key="register_phone_sidebar_register").input(USER['phone'])
+    at.text_input(key="register_password_sidebar_register").input(USER['password'])
+    by_label([b for b in at.button if b.form_id == "register_form_sidebar_register"], "Register").click().run()
+    at.run()
+    at.button_group(key="page").set_value("file").run()
+    by_label(at.selectbox, "Issue Category").select("Public Services")
+    by_label(at.text_input, "Location").input("Rampur, Warangal")
+    by_label(at.text_area, "Describe Your Issue").input(DESCRIPTION)
+    next(b for b in at.button if "Submit Complaint" in b.label).click().run()
+    at.button_group(key="page").set_value("assistant").run()
+    at.text_input(key="chat_input").input(QUESTION)
+    at.button(key="send_btn").click().run()
+    at.session_state["language"] = "hi"
+    at.run()
+    return {'url': dict(at.query_params), 'user': at.session_state.user_email}
+
+
+def sees_everything(at):
+    result = {'user': at.session_state.user_email if "user_email" in at.session_state else None}
+    result['language'] = at.session_state.language
+    at.button_group(key="page").set_value("complaints").run()
+    result['complaint'] = DESCRIPTION in page_text(at) or any(
+        DESCRIPTION in str(getattr(element, "value", "")) for element in at.main
+    )
+    at.button_group(key="page").set_value("assistant").run()
+    result['chat'] = QUESTION in page_text(at)
+    return result
+
+
+def worker_b(at):
+    at.run()
+    at.text_input(key="login_email_sidebar_login").input(USER['email'])
+    at.text_input(key="login_password_sidebar_login").input(USER['password'])
+    by_label([b for b in at.button if b.form_id == "login_form_sidebar_login"], "Login").click().run()
+    at.run()
+    return sees_everything(at)
+
+
+def worker_c(at, url):
+    # The page URL A ended on, e.g. shared with someone else
+    at.query_params.update(url)
+    at.run()
+    return sees_everything(at)
+
+
+def run_role(args):
+    from streamlit.testing.v1 import AppTest
+
+    at = AppTest.from_file(os.path.join(ROOT, "app.py"), default_timeout=120)
+    result = {'a': lambda: worker_a(at), 'b': lambda: worker_b(at), 'c': lambda: worker_c(at, json.loads(args.url))}[args.role]()
+    result['pid'] = os.getpid()
+    result['exception'] = [str(e.value) for e in at.exception]
+    print(json.dumps(result))
+
+
+def spawn_role(role, env, url=None):
+    command = [sys.executable, os.path.abspath(__file__), "--role", role] + (["--url", json.dumps(url)] if url else [])
+    out = subprocess.run(command, env=env, check=True, capture_output=True, text=True).stdout
+    return json.loads(out.strip().splitlines()[-1])
+
+
+def health(port, timeout=2):
+    try:
+        with urllib.request.urlopen(f"http://127.0.0.1:{port}/_stcore/health", timeout=timeout) as response:
+            return response.status == 200
+    except OSError:
+        return False
+
+
+def wait_for(condition, timeout=90):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if condition():
+            return True
+        time.sleep(0.5)
+    return False
+
+
+def check_balancer(env, workers=2):
+    from simplilaw.workers import Balancer, WorkerPool, serve
+
+    ports = [18611 + index for index in range(workers)]
+    front = 18601
+    pool = WorkerPool(ports, env=env)
+    pool.start_all()
+    balancer = Balancer(ports)
+    running = {}
+
+    async def run():
+        running['loop'], running['task'] = asyncio.get_running_loop(), asyncio.current_task()
+        await serve(pool, balancer, "127.0.0.1", front)
+
+    def run_loop():
+        try:
+            asyncio.run(run())
+        except asyncio.CancelledError:
+            pass
+
+    thread = threading.Thread(target=run_loop, daemon=True)
+    thread.start()
+    try:
+        up = wait_for(lambda: all(health(port) for port in ports))
+        print(f"  {workers} workers up: {up}; balancer healthy: {health(front)}")
+        routed = balancer.candidates("127.0.0.1")[0]
+        pool.processes[routed].kill()
+        pool.processes[routed].wait()
+        print(f"  killed worker on {routed}; balancer still healthy: {health(front)}")
+        print(f"  worker on {routed} restarted: {wait_for(lambda: health(routed))}")
+        return up and health(front)
+    finally:
+        running['loop'].call_soon_threadsafe(running['task'].cancel)
+        thread.join(timeout=10)
+        pool.stop()
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--role", choices=("a", "b", "c"), help=argparse.SUPPRESS)
+    parser.add_argument("--url", help=argparse.SUPPRESS)
+    parser.add_argument("--skip-servers", action="store_true", help="only run the AppTest part")
+    args = parser.parse_args()
+    if args.role:
+        return run_role(args)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        env = dict(os.environ, SIMPLILAW_DB=os.path.join(tmp, "shared.db"), SIMPLILAW_UPLOADS=os.path.join(tmp, "up"))
+        env["SIMPLILAW_RATE_LIMIT_DB"] = env["SIMPLILAW_DB"]
+        a = spawn_role("a", env)
+        print(f"worker A (pid {a['pid']}): registered {a['user']}, filed a complaint, asked the assistant")
+        b = spawn_role("b", env)
+        print(f"worker B (pid {b['pid']}), login: user={b['user']} complaint={b['complaint']} chat={b['chat']}")
+        c = spawn_role("c", env, url=a['url'])
+        print(f"worker C (pid {c['pid']}), A's URL {a['url']}: user={c['user']} language={c['language']}"
+              f" chat={c['chat']}")
+        ok = (not a['exception'] and not b['exception'] and not c['exception']
+              and b['user'] == USER['email'] and b['complaint'] and b['chat']
+              and c['user'] is None and c['language'] == "hi" and not c['chat'])
+        if not args.skip_servers:
+            print("balancer:")
+            ok = check_balancer(env) and ok
+        print("PASS" if ok else "FAIL")
+        return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,322 @@
+# Load test: simulated citizens driving app.py headlessly through AppTest.
+#
+# Each session registers, logs out and back in, files a complaint with an
+# image attachment, browses My Complaints and chats with the assistant.
+# Sessions are spread over worker processes (separate interpreters, like
+# separate app servers) sharing one database. Inside a worker all of its
+# sessions stay open and advance one step at a time in turn, so every session
+# is live for the whole run.
+#
+#   python benchmarks/load_test.py --sessions 200 --workers 4 --complaints 50000 \
+#       --output results/load-1.4.json --baseline results/load-1.3.json
+
+import argparse
+import io
+import json
+import os
+import platform
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+os.environ.setdefault("SIMPLILAW_DB", os.path.join(tempfile.mkdtemp(), "load.db"))
+os.environ.setdefault("SIMPLILAW_UPLOADS", tempfile.mkdtemp())
+
+from simplilaw.ids import ComplaintIdAllocator
+from simplilaw.metrics import approximate_size, percentile
+from simplilaw.storage import Database, ComplaintStore
+
+PASSWORD = "load-test-password"
+CATEGORIES = ["Consumer Rights", "Property Dispute", "Employment Issue", "Public Services", "Family Law"]
+LOCATIONS = ["Hyderabad", "Warangal 506002", "Pune, Maharashtra", "Chennai", "Lucknow"]
+QUESTIONS = [
+    "What are my consumer rights if a shop refuses a refund?",
+    "My landlord will not return the security deposit",
+    "Can my employer withhold my salary?",
+    "How do I file an RTI application?",
+]
+
+
+def citizen(index):
+    return {
+        'name': f"Citizen {index}",
+        'email': f"citizen{index}@example.com",
+        'phone': f"9{index:09d}",
+    }
+
+
+def rss_bytes():
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except OSError:
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+
+def attachment_png():
+    try:
+        from PIL import Image
+    except ImportError:
+        return None
+    buffer = io.BytesIO()
+    Image.new("RGB", (320, 240), (200, 180, 160)).save(buffer, format="PNG")
+    return buffer.getvalue()
+
+
+def seed(complaints, sessions):
+    # Spreads pre-existing complaints over the simulated citizens' accounts
+    store = ComplaintStore(Database(os.environ["SIMPLILAW_DB"]))
+    allocator = ComplaintIdAllocator(store.db)
+    ids = [allocator.next_id() for _ in range(complaints)]
+    with store.db.transaction() as conn:
+        for i, complaint_id in enumerate(ids):
+            user = citizen(i % sessions)
+            store._insert(conn, {
+                'id': complaint_id,
+                'name': user['name'],
+                'phone': user['phone'],
+                'category': CATEGORIES[i % len(CATEGORIES)],
+                'location': LOCATIONS[i % len(LOCATIONS)],
+                'description': f"Seeded complaint {i}",
+                'status': 'Submitted',
+                'date': "January 01, 2025",
+                'user_email': user['email'],
+            })
+
+
+def by_label(widgets, label):
+    return next(w for w in widgets if w.label == label)
+
+
+def form_button(at, label, form_id):
+    return next(b for b in at.button if b.label == label and b.form_id == form_id)
+
+
+def citizen_flow(at, index, chat_turns, png):
+    # Yields (action, step) pairs; each step ends with the rerun that is timed
+    user = citizen(index)
+    yield "open", lambda: at.run()
+
+    def register():
+        at.text_input(key="register_name_sidebar_register").input(user['name'])
+        at.text_input(key="register_email_sidebar_register").input(user['email'])
+        at.text_input(key="register_phone_sidebar_register").input(user['phone'])
+        at.text_input(key="register_password_sidebar_register").input(PASSWORD)
+        form_button(at, "Register", "register_form_sidebar_register").click().run()
+    yield "register", register
+
+    yield "logout", lambda: by_label(at.sidebar.button, "Logout").click().run()
+
+    def login():
+        at.text_input(key="login_email_sidebar_login").input(user['email'])
+        at.text_input(key="login_password_sidebar_login").input(PASSWORD)
+        form_button(at, "Login", "login_form_sidebar_login").click().run()
+    yield "login", login
+
+    yield "open_form", lambda: at.button_group(key="page").set_value("file").run()
+
+    def file_complaint():
+        by_label(at.selectbox, "Issue Category").select(CATEGORIES[index % len(CATEGORIES)])
+        by_label(at.text_input, "Location").input(LOCATIONS[index % len(LOCATIONS)])
+        by_label(at.text_area, "Describe Your Issue").input(f"Load test complaint from session {index}")
+        if png is not None:
+            at.file_uploader[0].set_value((f"evidence-{index}.png", png, "image/png"))
+        next(b for b in at.button if "Submit Complaint" in b.label).click().run()
+    yield "file_complaint", file_complaint
+
+    yield "my_complaints", lambda: at.button_group(key="page").set_value("complaints").run()
+
+    def next_page():
+        button = at.button(key="complaints_next")
+        (at.run() if button.disabled else button.click().run())
+    yield "my_complaints_next", next_page
+
+    yield "open_assistant", lambda: at.button_group(key="page").set_value("assistant").run()
+    for turn in range(chat_turns):
+        def chat(turn=turn):
+            at.text_input(key="chat_input").input(QUESTIONS[(index + turn) % len(QUESTIONS)])
+            at.button(key="send_btn").click().run()
+        yield "chat", chat
+
+
+def run_worker(indexes, chat_turns, timeout):
+    from streamlit.testing.v1 import AppTest
+
+    png = attachment_png()
+    timings = {}
+    errors = {}
+    # One throwaway run first so imports and shared resources are not
+    # counted as per-session memory
+    AppTest.from_file(os.path.join(ROOT, "app.py"), default_timeout=timeout).run()
+    rss_before = rss_bytes()
+    sessions = []
+    for index in indexes:
+        at = AppTest.from_file(os.path.join(ROOT, "app.py"), default_timeout=timeout)
+        sessions.append((at, citizen_flow(at, index, chat_turns, png)))
+
+    start = time.perf_counter()
+    active = list(sessions)
+    peak_rss = rss_before
+    while active:
+        still_active = []
+        for at, flow in active:
+            try:
+                action, step = next(flow)
+            except StopIteration:
+                continue
+            step_start = time.perf_counter()
+            try:
+                step()
+                # st.error covers rejected steps too, e.g. "Too many attempts"
+                failed = bool(at.exception) or bool(at.error)
+            except Exception:
+                failed = True
+            timings.setdefault(action, []).append(time.perf_counter() - step_start)
+            if failed:
+                errors[action] = errors.get(action, 0) + 1
+            still_active.append((at, flow))
+        active = still_active
+        peak_rss = max(peak_rss, rss_bytes())
+    elapsed = time.perf_counter() - start
+
+    state_sizes = [approximate_size(at.session_state.to_dict()) for at, _ in sessions]
+    return {
+        'timings': timings,
+        'errors': errors,
+        'elapsed': elapsed,
+        'sessions': len(sessions),
+        'rss_per_session': (peak_rss - rss_before) / max(1, len(sessions)),
+        'session_state_sizes': state_sizes,
+    }
+
+
+def summarize(values):
+    values = sorted(values)
+    return {
+        'count': len(values),
+        'mean_ms': sum(values) / len(values) * 1000 if values else 0.0,
+        'p50_ms': percentile(values, 0.5) * 1000,
+        'p90_ms': percentile(values, 0.9) * 1000,
+        'p99_ms': percentile(values, 0.99) * 1000,
+    }
+
+
+def compare(results, baseline, tolerance):
+    regressions = []
+    for action, current in results['actions'].items():
+        previous = baseline.get('actions', {}).get(action)
+        if previous and previous['p90_ms'] and current['p90_ms'] > previous['p90_ms'] * tolerance:
+            regressions.append(f"{action}: p90 {previous['p90_ms']:.1f} -> {current['p90_ms']:.1f} ms")
+    previous_throughput = baseline.get('throughput', {}).get('actions_per_s')
+    if previous_throughput and results['throughput']['actions_per_s'] * tolerance < previous_throughput:
+        regressions.append(
+            f"throughput: {previous_throughput:.1f} -> {results['throughput']['actions_per_s']:.1f} actions/s"
+        )
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Simulate concurrent citizens against app.py.")
+    parser.add_argument("--sessions", type=int, default=20)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--complaints", type=int, default=1000, help="complaints seeded before the run")
+    parser.add_argument("--chat-turns", type=int, default=2)
+    parser.add_argument("--timeout", type=float, default=120)
+    parser.add_argument("--output", default="load_test.json")
+    parser.add_argument("--baseline", help="earlier results file to check for regressions")
+    parser.add_argument("--tolerance", type=float, default=1.25, help="allowed slowdown against the baseline")
+    parser.add_argument("--worker", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        # Worker mode: run the listed sessions and write the report to a file
+        indexes, report_path = args.worker.split(":", 1)
+        report = run_worker([int(i) for i in indexes.split(",")], args.chat_turns, args.timeout)
+        with open(report_path, "w", encoding="utf-8") as f:
+            json.dump(report, f)
+        return 0
+
+    seed(args.complaints, args.sessions)
+    workers = max(1, min(args.workers, args.sessions))
+    shards = [list(range(args.sessions))[i::workers] for i in range(workers)]
+
+    # Plain subprocesses rather than a multiprocessing pool: the app starts
+    # its own process pools, which a pool worker cannot shut down on exit.
+    report_dir = tempfile.mkdtemp()
+    start = time.perf_counter()
+    processes = []
+    for i, shard in enumerate(shards):
+        report_path = os.path.join(report_dir, f"worker-{i}.json")
+        command = [sys.executable, os.path.abspath(__file__), "--chat-turns", str(args.chat_turns),
+                   "--timeout", str(args.timeout), "--worker", f"{','.join(map(str, shard))}:{report_path}"]
+        processes.append((subprocess.Popen(command, stderr=subprocess.DEVNULL), report_path))
+    reports = []
+    for process, report_path in processes:
+        if process.wait() != 0:
+            raise SystemExit(f"load test worker failed with exit code {process.returncode}")
+        with open(report_path, encoding="utf-8") as f:
+            reports.append(json.load(f))
+    wall = time.perf_counter() - start
+
+    timings, errors = {}, {}
+    for report in reports:
+        for action, values in report['timings'].items():
+            timings.setdefault(action, []).extend(values)
+        for action, count in report['errors'].items():
+            errors[action] = errors.get(action, 0) + count
+    actions = {action: dict(summarize(values), errors=errors.get(action, 0)) for action, values in timings.items()}
+    total_actions = sum(len(values) for values in timings.values())
+    state_sizes = sorted(size for report in reports for size in report['session_state_sizes'])
+
+    import streamlit
+    results = {
+        'config': vars(args),
+        'environment': {
+            'python': platform.python_version(),
+            'streamlit': streamlit.__version__,
+            'cpu_count': os.cpu_count(),
+            'platform': platform.platform(),
+        },
+        'timestamp': time.time(),
+        'wall_seconds': wall,
+        'throughput': {
+            'actions_per_s': total_actions / wall,
+            'sessions_per_s': args.sessions / wall,
+        },
+        'actions': actions,
+        'memory': {
+            'rss_per_session_kib': sum(r['rss_per_session'] * r['sessions'] for r in reports) / args.sessions / 1024,
+            'session_state_p50_kib': percentile(state_sizes, 0.5) / 1024,
+            'session_state_max_kib': (state_sizes[-1] if state_sizes else 0) / 1024,
+        },
+    }
+    os.makedirs(os.path.dirname(args.output) or ".", exist_ok=True)
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(results, f, indent=2)
+
+    print(f"{args.sessions} sessions on {workers} workers, {args.complaints} seeded complaints: "
+          f"{wall:.1f} s, {results['throughput']['actions_per_s']:.1f} actions/s")
+    print(f"{'action':<20} {'count':>6} {'errors':>6} {'p50 ms':>8} {'p90 ms':>8} {'p99 ms':>8}")
+    for action, s in actions.items():
+        print(f"{action:<20} {s['count']:>6} {s['errors']:>6} {s['p50_ms']:>8.1f} {s['p90_ms']:>8.1f} {s['p99_ms']:>8.1f}")
+    memory = results['memory']
+    print(f"memory: {memory['rss_per_session_kib']:.0f} KiB RSS per session, "
+          f"session state p50 {memory['session_state_p50_kib']:.1f} KiB")
+    print(f"results written to {args.output}")
+
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            regressions = compare(results, json.load(f), args.tolerance)
+        for regression in regressions:
+            print("REGRESSION", regression)
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
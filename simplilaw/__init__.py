@@ -0,0 +1 @@
+# Backend services for the SimpliLaw Streamlit app
@@ -0,0 +1,194 @@
+import time
+
+from simplilaw.routing import ROUTES_SCHEMA
+from simplilaw.status import EVENTS_SCHEMA
+from simplilaw.storage import COMPLAINTS_SCHEMA
+
+# Rollups kept current by triggers on complaints, complaint_routes and
+# complaint_events. Their size depends on days, categories and districts, never
+# on the number of complaints, so the dashboard reads the same few hundred rows
+# however large the complaints table grows.
+ANALYTICS_SCHEMA = """
+CREATE TABLE IF NOT EXISTS rollup_filed_daily (
+    day TEXT NOT NULL,
+    category TEXT NOT NULL,
+    count INTEGER NOT NULL,
+    PRIMARY KEY (day, category)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS rollup_status_current (
+    status TEXT PRIMARY KEY,
+    count INTEGER NOT NULL
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS rollup_status_daily (
+    day TEXT NOT NULL,
+    status TEXT NOT NULL,
+    count INTEGER NOT NULL,
+    PRIMARY KEY (day, status)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS rollup_districts (
+    state TEXT NOT NULL,
+    district TEXT NOT NULL,
+    count INTEGER NOT NULL,
+    PRIMARY KEY (state, district)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS rollup_resolution (
+    month TEXT NOT NULL,
+    category TEXT NOT NULL,
+    resolved INTEGER NOT NULL,
+    total_seconds REAL NOT NULL,
+    PRIMARY KEY (month, category)
+) WITHOUT ROWID;
+
+CREATE TRIGGER IF NOT EXISTS complaints_rollup_insert AFTER INSERT ON complaints BEGIN
+    INSERT INTO rollup_filed_daily VALUES (date(NEW.created_at, 'unixepoch'), NEW.category, 1)
+    ON CONFLICT (day, category) DO UPDATE SET count = count + 1;
+    INSERT INTO rollup_status_current VALUES (NEW.status, 1)
+    ON CONFLICT (status) DO UPDATE SET count = count + 1;
+END;
+CREATE TRIGGER IF NOT EXISTS complaints_rollup_status AFTER UPDATE OF status ON complaints BEGIN
+    UPDATE rollup_status_current SET count = count - 1 WHERE status = OLD.status;
+    INSERT INTO rollup_status_current VALUES (NEW.status, 1)
+    ON CONFLICT (status) DO UPDATE SET count = count + 1;
+END;
+-- Bulk imports with --update may change a complaint's category; its filing
+-- and any resolution move to the new category
+CREATE TRIGGER IF NOT EXISTS complaints_rollup_refile AFTER UPDATE OF category, created_at ON complaints BEGIN
+    UPDATE rollup_filed_daily SET count = count - 1
+    WHERE day = date(OLD.created_at, 'unixepoch') AND category = OLD.category;
+    INSERT INTO rollup_filed_daily VALUES (date(NEW.created_at, 'unixepoch'), NEW.category, 1)
+    ON CONFLICT (day, category) DO UPDATE SET count = count + 1;
+    INSERT INTO rollup_resolution
+    SELECT strftime('%Y-%m', created_at, 'unixepoch'), OLD.category, -1, OLD.created_at - created_at
+    FROM complaint_events WHERE complaint_id = OLD.id AND status = 'Resolved'
+    ON CONFLICT (month, category) DO UPDATE SET
+        resolved = resolved + excluded.resolved, total_seconds = total_seconds + excluded.total_seconds;
+    INSERT INTO rollup_resolution
+    SELECT strftime('%Y-%m', created_at, 'unixepoch'), NEW.category, 1, created_at - NEW.created_at
+    FROM complaint_events WHERE complaint_id = NEW.id AND status = 'Resolved'
+    ON CONFLICT (month, category) DO UPDATE SET
+        resolved = resolved + excluded.resolved, total_seconds = total_seconds + excluded.total_seconds;
+END;
+CREATE TRIGGER IF NOT EXISTS complaints_rollup_delete AFTER DELETE ON complaints BEGIN
+    UPDATE rollup_filed_daily SET count = count - 1
+    WHERE day = date(OLD.created_at, 'unixepoch') AND category = OLD.category;
+    UPDATE rollup_status_current SET count = count - 1 WHERE status = OLD.status;
+END;
+
+-- Routes are written with INSERT OR REPLACE, so a re-routed complaint first
+-- leaves its old district
+CREATE TRIGGER IF NOT EXISTS routes_rollup_replace BEFORE INSERT ON complaint_routes BEGIN
+    UPDATE rollup_districts SET count = count - 1
+    WHERE (state, district) IN (
+        SELECT COALESCE(state, ''), COALESCE(district, '') FROM complaint_routes WHERE complaint_id = NEW.complaint_id
+    );
+END;
+CREATE TRIGGER IF NOT EXISTS routes_rollup_insert AFTER INSERT ON complaint_routes BEGIN
+    INSERT INTO rollup_districts VALUES (COALESCE(NEW.state, ''), COALESCE(NEW.district, ''), 1)
+    ON CONFLICT (state, district) DO UPDATE SET count = count + 1;
+END;
+
+CREATE TRIGGER IF NOT EXISTS events_rollup_insert AFTER INSERT ON complaint_events BEGIN
+    INSERT INTO rollup_status_daily VALUES (date(NEW.created_at, 'unixepoch'), NEW.status, 1)
+    ON CONFLICT (day, status) DO UPDATE SET count = count + 1;
+END;
+CREATE TRIGGER IF NOT EXISTS events_rollup_resolved AFTER INSERT ON complaint_events
+WHEN NEW.status = 'Resolved' BEGIN
+    INSERT INTO rollup_resolution
+    SELECT strftime('%Y-%m', NEW.created_at, 'unixepoch'), category, 1, NEW.created_at - created_at
+    FROM complaints WHERE id = NEW.complaint_id
+    ON CONFLICT (month, category) DO UPDATE SET
+        resolved = resolved + 1, total_seconds = total_seconds + excluded.total_seconds;
+END;
+"""
+
+ROLLUP_TABLES = (
+    'rollup_filed_daily', 'rollup_status_current', 'rollup_status_daily', 'rollup_districts', 'rollup_resolution'
+)
+
+
+class Analytics:
+    """Complaint volume, status and time-to-resolution, read from rollup tables."""
+
+    def __init__(self, db):
+        self.db = db
+        for schema in (COMPLAINTS_SCHEMA, ROUTES_SCHEMA, EVENTS_SCHEMA, ANALYTICS_SCHEMA):
+            self.db.executescript(schema)
+        conn = self.db.connection()
+        if conn.execute("SELECT NOT EXISTS (SELECT 1 FROM rollup_filed_daily)").fetchone()[0] and \
+                conn.execute("SELECT EXISTS (SELECT 1 FROM complaints)").fetchone()[0]:
+            self.rebuild()
+
+    def rebuild(self):
+        # Recomputes every rollup from the raw tables; only needed for data
+        # stored before the rollups existed
+        with self.db.transaction() as conn:
+            for table in ROLLUP_TABLES:
+                conn.execute(f"DELETE FROM {table}")
+            conn.execute(
+                "INSERT INTO rollup_filed_daily SELECT date(created_at, 'unixepoch'), category, COUNT(*)"
+                " FROM complaints GROUP BY 1, 2"
+            )
+            conn.execute("INSERT INTO rollup_status_current SELECT status, COUNT(*) FROM complaints GROUP BY 1")
+            conn.execute(
+                "INSERT INTO rollup_status_daily SELECT date(created_at, 'unixepoch'), status, COUNT(*)"
+                " FROM complaint_events GROUP BY 1, 2"
+            )
+            conn.execute(
+                "INSERT INTO rollup_districts SELECT COALESCE(state, ''), COALESCE(district, ''), COUNT(*)"
+                " FROM complaint_routes GROUP BY 1, 2"
+            )
+            conn.execute(
+                "INSERT INTO rollup_resolution"
+                " SELECT strftime('%Y-%m', e.created_at, 'unixepoch'), c.category, COUNT(*), SUM(e.created_at - c.created_at)"
+                " FROM complaint_events e JOIN complaints c ON c.id = e.complaint_id"
+                " WHERE e.status = 'Resolved' GROUP BY 1, 2"
+            )
+
+    def _since(self, days):
+        return time.strftime("%Y-%m-%d", time.gmtime(time.time() - days * 86400))
+
+    def totals(self):
+        conn = self.db.connection()
+        by_status = dict(conn.execute("SELECT status, count FROM rollup_status_current").fetchall())
+        resolved, seconds = conn.execute(
+            "SELECT COALESCE(SUM(resolved), 0), COALESCE(SUM(total_seconds), 0) FROM rollup_resolution"
+        ).fetchone()
+        return {
+            'filed': sum(by_status.values()),
+            'resolved': by_status.get('Resolved', 0),
+            'open': sum(count for status, count in by_status.items() if status != 'Resolved'),
+            'avg_resolution_days': seconds / resolved / 86400 if resolved else None,
+        }
+
+    def status_counts(self):
+        return self.db.connection().execute(
+            "SELECT status, count FROM rollup_status_current WHERE count > 0"
+        ).fetchall()
+
+    def filed_by_month(self, days=365):
+        return self.db.connection().execute(
+            "SELECT substr(day, 1, 7) AS month, category, SUM(count) FROM rollup_filed_daily"
+            " WHERE day >= ? GROUP BY 1, 2 ORDER BY 1",
+            (self._since(days),),
+        ).fetchall()
+
+    def status_changes_by_month(self, days=365):
+        return self.db.connection().execute(
+            "SELECT substr(day, 1, 7) AS month, status, SUM(count) FROM rollup_status_daily"
+            " WHERE day >= ? GROUP BY 1, 2 ORDER BY 1",
+            (self._since(days),),
+        ).fetchall()
+
+    def top_districts(self, limit=15):
+        return self.db.connection().execute(
+            "SELECT state, district, count FROM rollup_districts WHERE count > 0 AND district != ''"
+            " ORDER BY count DESC LIMIT ?",
+            (limit,),
+        ).fetchall()
+
+    def resolution_by_category(self):
+        # Average days from filing to resolution, per category
+        return self.db.connection().execute(
+            "SELECT category, SUM(total_seconds) / SUM(resolved) / 86400, SUM(resolved)"
+            " FROM rollup_resolution GROUP BY 1 HAVING SUM(resolved) > 0 ORDER BY 2"
+        ).fetchall()
@@ -0,0 +1,121 @@
+import json
+import os
+import re
+
+import numpy as np
+
+KNOWLEDGE_BASE_PATH = os.path.join(os.path.dirname(__file__), "data", "legal_kb.json")
+
+FALLBACK_RESPONSE = "I understand your concern. For specific legal advice, I recommend consulting with a qualified lawyer. However, I can help you understand general legal procedures and guide you through filing a complaint on our platform. What specific aspect would you like to know more about?"
+
+STOPWORDS = frozenset("""
+a about am an and any are as at be by can do does for from has have how i if in
+into is it its me my of on or our so that the their them there these this to
+was what when where which who why will with you your
+""".split())
+
+TOKEN_RE = re.compile(r"[a-z0-9]+")
+
+
+def tokenize(text):
+    tokens = []
+    for token in TOKEN_RE.findall(text.lower()):
+        if token in STOPWORDS:
+            continue
+        # Fold simple plurals so "rights" matches "right"
+        if len(token) > 3 and token.endswith('s') and not token.endswith('ss'):
+            token = token[:-1]
+        tokens.append(token)
+    return tokens
+
+
+class BM25Index:
+    """Inverted index with BM25 weights precomputed per posting.
+
+    Postings are stored CSR-style in flat NumPy arrays, so scoring a query is
+    a handful of vectorized scatter-adds over the postings of its terms.
+    """
+
+    def __init__(self, documents, k1=1.5, b=0.75):
+        self.vocabulary = {}
+        postings = {}
+        doc_lengths = np.zeros(len(documents), dtype=np.float32)
+        for doc_id, tokens in enumerate(documents):
+            doc_lengths[doc_id] = len(tokens)
+            counts = {}
+            for token in tokens:
+                counts[token] = counts.get(token, 0) + 1
+            for token, count in counts.items():
+                term_id = self.vocabulary.setdefault(token, len(self.vocabulary))
+                postings.setdefault(term_id, []).append((doc_id, count))
+
+        self.doc_count = len(documents)
+        self.indptr = np.zeros(len(self.vocabulary) + 1, dtype=np.int64)
+        for term_id, entries in postings.items():
+            self.indptr[term_id + 1] = len(entries)
+        np.cumsum(self.indptr, out=self.indptr)
+
+        self.doc_ids = np.empty(self.indptr[-1], dtype=np.int32)
+        term_freqs = np.empty(self.indptr[-1], dtype=np.float32)
+        document_freqs = np.diff(self.indptr).astype(np.float32)
+        for term_id, entries in postings.items():
+            start = self.indptr[term_id]
+            self.doc_ids[start:start + len(entries)] = [doc_id for doc_id, _ in entries]
+            term_freqs[start:start + len(entries)] = [count for _, count in entries]
+
+        idf = np.log1p((self.doc_count - document_freqs + 0.5) / (document_freqs + 0.5))
+        average_length = doc_lengths.mean() if self.doc_count else 0.0
+        norms = k1 * (1 - b + b * doc_lengths[self.doc_ids] / max(average_length, 1.0))
+        term_ids = np.repeat(np.arange(len(self.vocabulary)), np.diff(self.indptr))
+        self.weights = (idf[term_ids] * term_freqs * (k1 + 1) / (term_freqs + norms)).astype(np.float32)
+
+    def search(self, query_tokens, top_k=3):
+        scores = np.zeros(self.doc_count, dtype=np.float32)
+        for token in set(query_tokens):
+            term_id = self.vocabulary.get(token)
+            if term_id is None:
+                continue
+            start, end = self.indptr[term_id], self.indptr[term_id + 1]
+            # Each document appears once per term, so plain fancy-index add is safe
+            scores[self.doc_ids[start:end]] += self.weights[start:end]
+        if top_k >= self.doc_count:
+            best = np.argsort(-scores)
+        else:
+            best = np.argpartition(-scores, top_k)[:top_k]
+            best = best[np.argsort(-scores[best])]
+        return [(int(doc_id), float(scores[doc_id])) for doc_id in best if scores[doc_id] > 0]
+
+
+class LegalKnowledgeBase:
+    """Legal-guidance passages ranked with BM25 against a citizen's question."""
+
+    def __init__(self, passages, min_score=1.0):
+        self.passages = passages
+        self.min_score = min_score
+        self.index = BM25Index([
+            tokenize(f"{p['title']} {p['title']} {p['source']} {p['text']}") for p in passages
+        ])
+
+    @classmethod
+    def from_file(cls, path=KNOWLEDGE_BASE_PATH, **kwargs):
+        with open(path, encoding="utf-8") as f:
+            return cls(json.load(f), **kwargs)
+
+    def search(self, query, top_k=3):
+        return [
+            (self.passages[doc_id], score)
+            for doc_id, score in self.index.search(tokenize(query), top_k)
+        ]
+
+    def answer(self, query):
+        results = self.search(query, top_k=1)
+        if not results or results[0][1] < self.min_score:
+            return FALLBACK_RESPONSE
+        passage = results[0][0]
+        return f"{passage['text']} (Source: {passage['source']})"
+
+
+def stream_words(text):
+    # Yields text a word at a time (with its trailing whitespace) for streaming UIs
+    for match in re.finditer(r"\S+\s*", text):
+        yield match.group()
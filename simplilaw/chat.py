@@ -0,0 +1,53 @@
+import time
+
+CHAT_SCHEMA = """
+CREATE TABLE IF NOT EXISTS chat_messages (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    conversation_id TEXT NOT NULL,
+    role TEXT NOT NULL,
+    content TEXT NOT NULL,
+    created_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_chat_conversation ON chat_messages (conversation_id, id);
+"""
+
+
+class ChatStore:
+    """Full chat history per conversation; sessions only keep a recent window."""
+
+    def __init__(self, db):
+        self.db = db
+        self.db.executescript(CHAT_SCHEMA)
+
+    def append(self, conversation_id, role, content):
+        with self.db.transaction() as conn:
+            cursor = conn.execute(
+                "INSERT INTO chat_messages (conversation_id, role, content, created_at)"
+                " VALUES (?, ?, ?, ?)",
+                (conversation_id, role, content, time.time()),
+            )
+        return {'id': cursor.lastrowid, 'role': role, 'content': content}
+
+    def recent(self, conversation_id, limit, before_id=None):
+        # The newest `limit` messages older than before_id, oldest first
+        rows = self.db.connection().execute(
+            "SELECT id, role, content FROM chat_messages WHERE conversation_id = ? AND id < ?"
+            " ORDER BY id DESC LIMIT ?",
+            (conversation_id, before_id if before_id is not None else 2 ** 63 - 1, limit),
+        ).fetchall()
+        return [dict(row) for row in reversed(rows)]
+
+    def after(self, conversation_id, after_id, limit):
+        # The newest `limit` messages newer than after_id, oldest first
+        rows = self.db.connection().execute(
+            "SELECT id, role, content FROM chat_messages WHERE conversation_id = ? AND id > ?"
+            " ORDER BY id DESC LIMIT ?",
+            (conversation_id, after_id, limit),
+        ).fetchall()
+        return [dict(row) for row in reversed(rows)]
+
+    def has_before(self, conversation_id, before_id):
+        return self.db.connection().execute(
+            "SELECT EXISTS (SELECT 1 FROM chat_messages WHERE conversation_id = ? AND id < ?)",
+            (conversation_id, before_id),
+        ).fetchone()[0] == 1
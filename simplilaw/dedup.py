@@ -0,0 +1,200 @@
+import hashlib
+import re
+import time
+import zlib
+
+import numpy as np
+
+from simplilaw.storage import COMPLAINTS_SCHEMA
+
+# Only cluster roots (complaints that were not linked to an earlier one) are
+# put in the LSH buckets, so a burst of copies grows complaint_duplicates by one
+# small row each and leaves the index as it was. Buckets are kept per period of
+# `window` seconds and only the current and previous period are kept at all.
+DEDUP_SCHEMA = """
+CREATE TABLE IF NOT EXISTS complaint_lsh (
+    period INTEGER NOT NULL,
+    bucket INTEGER NOT NULL,
+    complaint_rowid INTEGER NOT NULL,
+    PRIMARY KEY (period, bucket, complaint_rowid)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS complaint_duplicates (
+    complaint_id TEXT PRIMARY KEY,
+    parent_id TEXT NOT NULL,
+    similarity REAL NOT NULL,
+    linked_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_duplicates_parent ON complaint_duplicates (parent_id);
+
+CREATE TRIGGER IF NOT EXISTS complaints_dedup_delete AFTER DELETE ON complaints BEGIN
+    DELETE FROM complaint_lsh WHERE complaint_rowid = OLD.rowid;
+    DELETE FROM complaint_duplicates WHERE complaint_id = OLD.id OR parent_id = OLD.id;
+END;
+"""
+
+TOKEN_RE = re.compile(r"\w+")
+
+# Words that every complaint shares; left in, they make unrelated complaints
+# about the same kind of problem look alike
+STOPWORDS = frozenset("""
+a an the and or but in on at of for to from by with into about is are was were be been being has have had
+it its this that these there their them they we our us i my me you your he she his her not no since
+sir madam dear respected please kindly help urgent request officer also still very do does did
+""".split())
+
+SHINGLE_SIZE = 5
+NUM_PERM = 60
+BANDS = 20  # 3 rows per band: a pair at 0.6 Jaccard shares a bucket >99% of the time
+PRIME = (1 << 31) - 1
+_rng = np.random.default_rng(20240611)
+PERM_A = _rng.integers(1, PRIME, NUM_PERM, dtype=np.uint64)
+PERM_B = _rng.integers(0, PRIME, NUM_PERM, dtype=np.uint64)
+
+
+def shingles(text):
+    # Every SHINGLE_SIZE-character window of the normalized text (lowercase
+    # words other than STOPWORDS, single-spaced)
+    normalized = " ".join(word for word in TOKEN_RE.findall(text.lower()) if word not in STOPWORDS)
+    return {normalized[i:i + SHINGLE_SIZE] for i in range(max(len(normalized) - SHINGLE_SIZE + 1, 1))}
+
+
+def minhash(shingle_set):
+    # crc32 rather than hash(): signatures pick stored buckets, so they must
+    # not change between processes
+    hashes = np.fromiter((zlib.crc32(shingle.encode()) for shingle in shingle_set),
+                         dtype=np.uint64, count=len(shingle_set)) % np.uint64(PRIME)
+    return ((PERM_A[:, None] * hashes[None, :] + PERM_B[:, None]) % np.uint64(PRIME)).min(axis=1)
+
+
+def jaccard(a, b):
+    return len(a & b) / len(a | b)
+
+
+class DuplicateDetector:
+    """Links near-identical complaints about the same problem to one parent.
+
+    Descriptions are compared by character shingles: MinHash signatures split
+    into BANDS bands pick at most max_candidates complaints filed in the
+    preceding `window` seconds with the same category and area, and the
+    closest one at or above `threshold` exact Jaccard similarity becomes the
+    parent. Resolved complaints are never chosen, so a problem that comes back
+    starts a new cluster. With a router the area is the resolved district,
+    otherwise the normalized location.
+    """
+
+    def __init__(self, db, router=None, threshold=0.6, max_candidates=20, window=30 * 24 * 3600):
+        self.db = db
+        self.router = router
+        self.threshold = threshold
+        self.max_candidates = max_candidates
+        self.window = window
+        self._pruned_period = None
+        self.db.executescript(COMPLAINTS_SCHEMA)
+        self.db.executescript(DEDUP_SCHEMA)
+
+    def area(self, location):
+        place = self.router.resolve(location) if self.router else None
+        if place and place['district']:
+            return f"{place['state']}/{place['district']}"
+        return " ".join(TOKEN_RE.findall(location.lower()))
+
+    def buckets(self, complaint, signature):
+        prefix = f"{complaint['category']}\x1f{self.area(complaint['location'])}\x1f".encode()
+        rows = NUM_PERM // BANDS
+        return [
+            int.from_bytes(hashlib.blake2b(
+                prefix + bytes([band]) + signature[band * rows:(band + 1) * rows].tobytes(), digest_size=8
+            ).digest(), "little", signed=True)
+            for band in range(BANDS)
+        ]
+
+    def _match(self, conn, filed_at, buckets, shingle_set):
+        # Candidates are the open roots from the window before filed_at that
+        # share the most bands
+        period = int(filed_at // self.window)
+        candidates = conn.execute(
+            f"SELECT c.id, c.description FROM complaints c JOIN ("
+            f"  SELECT complaint_rowid, COUNT(*) AS shared FROM complaint_lsh"
+            f"  WHERE period IN (?, ?) AND bucket IN ({','.join('?' * len(buckets))}) GROUP BY complaint_rowid"
+            f") l ON c.rowid = l.complaint_rowid"
+            f" WHERE c.status != 'Resolved' AND c.created_at BETWEEN ? AND ? ORDER BY l.shared DESC LIMIT ?",
+            [period - 1, period] + buckets + [filed_at - self.window, filed_at, self.max_candidates],
+        ).fetchall()
+        best = None
+        for complaint_id, description in candidates:
+            similarity = jaccard(shingle_set, shingles(description))
+            if similarity >= self.threshold and (best is None or similarity > best[1]):
+                best = (complaint_id, similarity)
+        return best
+
+    def find_parent(self, complaint):
+        # Returns (parent_id, similarity) or None, without recording anything
+        shingle_set = shingles(complaint['description'])
+        buckets = self.buckets(complaint, minhash(shingle_set))
+        return self._match(self.db.connection(), time.time(), buckets, shingle_set)
+
+    def add(self, complaint):
+        # Call once the complaint is stored; returns its parent's id, or None
+        # when it starts a cluster of its own
+        return self.add_many([complaint])[0]
+
+    def add_many(self, complaints):
+        parents = []
+        now = time.time()
+        with self.db.transaction() as conn:
+            for complaint in complaints:
+                rowid, filed_at = conn.execute(
+                    "SELECT rowid, created_at FROM complaints WHERE id = ?", (complaint['id'],)
+                ).fetchone()
+                if self._pruned_period is None or int(filed_at // self.window) > self._pruned_period:
+                    self.prune(filed_at)
+                shingle_set = shingles(complaint['description'])
+                buckets = self.buckets(complaint, minhash(shingle_set))
+                match = self._match(conn, filed_at, buckets, shingle_set)
+                if match:
+                    conn.execute(
+                        "INSERT OR REPLACE INTO complaint_duplicates (complaint_id, parent_id, similarity, linked_at)"
+                        " VALUES (?, ?, ?, ?)",
+                        (complaint['id'], match[0], match[1], now),
+                    )
+                    parents.append(match[0])
+                    continue
+                conn.executemany(
+                    "INSERT OR IGNORE INTO complaint_lsh (period, bucket, complaint_rowid) VALUES (?, ?, ?)",
+                    [(int(filed_at // self.window), bucket, rowid) for bucket in buckets],
+                )
+                parents.append(None)
+        return parents
+
+    def prune(self, now=None):
+        # Drops buckets too old for any complaint filed from `now` on
+        period = int((now or time.time()) // self.window)
+        with self.db.transaction() as conn:
+            conn.execute("DELETE FROM complaint_lsh WHERE period < ?", (period - 1,))
+        self._pruned_period = period
+
+    def parent(self, complaint_id):
+        row = self.db.connection().execute(
+            "SELECT parent_id FROM complaint_duplicates WHERE complaint_id = ?", (complaint_id,)
+        ).fetchone()
+        return row[0] if row else None
+
+    def cluster(self, parent_id):
+        # The parent followed by every complaint linked to it, e.g. to move
+        # them all with StatusTracker.bulk_transition
+        rows = self.db.connection().execute(
+            "SELECT complaint_id FROM complaint_duplicates WHERE parent_id = ? ORDER BY linked_at", (parent_id,)
+        ).fetchall()
+        return [parent_id] + [row[0] for row in rows]
+
+    def duplicate_counts(self, complaint_ids):
+        # {parent_id: number of linked complaints} for those that have any
+        complaint_ids = list(complaint_ids)
+        if not complaint_ids:
+            return {}
+        rows = self.db.connection().execute(
+            f"SELECT parent_id, COUNT(*) FROM complaint_duplicates"
+            f" WHERE parent_id IN ({','.join('?' * len(complaint_ids))}) GROUP BY parent_id",
+            complaint_ids,
+        ).fetchall()
+        return dict(rows)
@@ -0,0 +1,243 @@
+import csv
+import json
+import os
+import string
+import sys
+import zipfile
+from datetime import date
+from functools import lru_cache
+from xml.sax.saxutils import escape
+
+from simplilaw.i18n import gettext
+
+TEMPLATES_PATH = os.path.join(os.path.dirname(__file__), "data", "complaint_templates.json")
+DEFAULT_LANGUAGE = "en"
+DEFAULT_AUTHORITY = "The Concerned Authority"
+
+
+class CompiledTemplate:
+    """A str.format-style template parsed once into literal and field segments."""
+
+    def __init__(self, source):
+        self.segments = [
+            (literal, field) for literal, field, _, _ in string.Formatter().parse(source)
+        ]
+
+    def render(self, values):
+        parts = []
+        for literal, field in self.segments:
+            parts.append(literal)
+            if field is not None:
+                parts.append(str(values.get(field, "")))
+        return "".join(parts)
+
+
+@lru_cache(maxsize=None)
+def load_templates(path=TEMPLATES_PATH):
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+@lru_cache(maxsize=None)
+def compiled_templates(category, language=DEFAULT_LANGUAGE, path=TEMPLATES_PATH):
+    # Per-category parts fall back to the language default, then to English
+    templates = load_templates(path)
+    chain = [
+        templates.get(language, {}).get(category, {}),
+        templates.get(language, {}).get("default", {}),
+        templates[DEFAULT_LANGUAGE].get(category, {}),
+        templates[DEFAULT_LANGUAGE]["default"],
+    ]
+    parts = {}
+    for part in ("body", "subject", "request"):
+        source = next(t[part] for t in chain if part in t)
+        parts[part] = CompiledTemplate(source)
+    return parts
+
+
+def letter_date(day, language=DEFAULT_LANGUAGE):
+    # 'March 05, 2025' in English; month name and order from the catalog otherwise
+    return gettext("{month} {day}, {year}", language, month=gettext(day.strftime('%B'), language),
+                   day=f"{day.day:02d}", year=day.year)
+
+
+def draft_complaint(name, category, description, language=DEFAULT_LANGUAGE,
+                    authority=None, complaint_date=None):
+    templates = compiled_templates(category or "Other", language)
+    values = {
+        'name': name,
+        'category': gettext(category, language),
+        'description': description.strip(),
+        'authority': authority or gettext(DEFAULT_AUTHORITY, language),
+        'date': letter_date(complaint_date or date.today(), language),
+    }
+    values['subject'] = templates['subject'].render(values)
+    values['request'] = templates['request'].render(values)
+    return templates['body'].render(values)
+
+
+def read_rows(path):
+    # Streams issue descriptions from a CSV or JSONL file, one dict per row
+    with open(path, newline="", encoding="utf-8") as f:
+        if path.endswith(".jsonl"):
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
+        else:
+            yield from csv.DictReader(f)
+
+
+def draft_batch(rows, router=None):
+    # Yields one letter per row; rows need name, category and description and may
+    # carry location (used for routing when a router is given) and language.
+    for row in rows:
+        authority = None
+        if router is not None and row.get('location'):
+            authority = router.route(row['location'], row['category'])['authority']
+        yield draft_complaint(
+            row['name'], row['category'], row['description'],
+            language=row.get('language') or DEFAULT_LANGUAGE, authority=authority,
+        )
+
+
+def write_text(letters, out):
+    for i, letter in enumerate(letters):
+        if i:
+            out.write("\f\n")
+        out.write(letter)
+
+
+DOCX_CONTENT_TYPES = """<?xml version="1.0" encoding="UTF-8" standalone="yes"?>
+<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">
+<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>
+<Default Extension="xml" ContentType="application/xml"/>
+<Override PartName="/word/document.xml" ContentType="application/vnd.openxmlformats-officedocument.wordprocessingml.document.main+xml"/>
+</Types>"""
+
+DOCX_RELS = """<?xml version="1.0" encoding="UTF-8" standalone="yes"?>
+<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">
+<Relationship Id="rId1" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument" Target="word/document.xml"/>
+</Relationships>"""
+
+
+def write_docx(letters, out):
+    # document.xml is written through a streaming zip entry, one paragraph at a
+    # time, so a batch of thousands of letters is never held in memory.
+    with zipfile.ZipFile(out, "w", zipfile.ZIP_DEFLATED) as docx:
+        docx.writestr("[Content_Types].xml", DOCX_CONTENT_TYPES)
+        docx.writestr("_rels/.rels", DOCX_RELS)
+        with docx.open("word/document.xml", "w", force_zip64=True) as document:
+            document.write(
+                b'<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+                b'<w:document xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main"><w:body>'
+            )
+            for i, letter in enumerate(letters):
+                if i:
+                    document.write(b'<w:p><w:r><w:br w:type="page"/></w:r></w:p>')
+                for line in letter.strip("\n").split("\n"):
+                    paragraph = f'<w:p><w:r><w:t xml:space="preserve">{escape(line)}</w:t></w:r></w:p>'
+                    document.write(paragraph.encode("utf-8"))
+            document.write(b"</w:body></w:document>")
+
+
+PDF_LINES_PER_PAGE = 56
+PDF_LINE_WIDTH = 95
+
+
+def pdf_pages(letter):
+    lines = []
+    for paragraph in letter.strip("\n").split("\n"):
+        while len(paragraph) > PDF_LINE_WIDTH:
+            cut = paragraph.rfind(" ", 0, PDF_LINE_WIDTH)
+            cut = cut if cut > 0 else PDF_LINE_WIDTH
+            lines.append(paragraph[:cut])
+            paragraph = paragraph[cut:].lstrip()
+        lines.append(paragraph)
+    for start in range(0, len(lines), PDF_LINES_PER_PAGE):
+        yield lines[start:start + PDF_LINES_PER_PAGE]
+
+
+def write_pdf(letters, out):
+    # A minimal streaming PDF writer: pages are written as they are produced and
+    # only their object offsets are kept for the trailing xref table. It uses
+    # the built-in Helvetica font, which has no Devanagari or Telugu glyphs, so
+    # letters with text outside Latin-1 are left out rather than printed as
+    # '?'. Returns the 1-based positions of the letters left out.
+    offsets = {}
+    skipped = []
+    position = 0
+
+    def emit(data):
+        nonlocal position
+        out.write(data)
+        position += len(data)
+
+    def emit_object(number, body):
+        offsets[number] = position
+        emit(f"{number} 0 obj\n".encode() + body + b"\nendobj\n")
+
+    emit(b"%PDF-1.4\n")
+    emit_object(1, b"<< /Type /Catalog /Pages 2 0 R >>")
+    emit_object(3, b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica /Encoding /WinAnsiEncoding >>")
+    page_numbers = []
+    next_number = 4
+    for index, letter in enumerate(letters, 1):
+        try:
+            letter.encode("latin-1")
+        except UnicodeEncodeError:
+            skipped.append(index)
+            continue
+        for lines in pdf_pages(letter):
+            text = ["BT /F1 10 Tf 13 TL 50 800 Td"]
+            for line in lines:
+                line = line.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+                text.append(f"({line}) Tj T*")
+            text.append("ET")
+            content = "\n".join(text).encode("latin-1")
+            emit_object(next_number, b"<< /Length %d >>\nstream\n" % len(content) + content + b"\nendstream")
+            emit_object(next_number + 1, (
+                f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 595 842] "
+                f"/Resources << /Font << /F1 3 0 R >> >> /Contents {next_number} 0 R >>"
+            ).encode())
+            page_numbers.append(next_number + 1)
+            next_number += 2
+    kids = " ".join(f"{number} 0 R" for number in page_numbers)
+    emit_object(2, f"<< /Type /Pages /Kids [{kids}] /Count {len(page_numbers)} >>".encode())
+
+    xref_position = position
+    emit(f"xref\n0 {next_number}\n0000000000 65535 f \n".encode())
+    for number in range(1, next_number):
+        emit(f"{offsets[number]:010d} 00000 n \n".encode())
+    emit(f"trailer\n<< /Size {next_number} /Root 1 0 R >>\nstartxref\n{xref_position}\n%%EOF\n".encode())
+    return skipped
+
+
+def main(argv=None):
+    # python -m simplilaw.drafting issues.csv complaints.docx
+    import argparse
+    from simplilaw.routing import Router
+
+    parser = argparse.ArgumentParser(description="Draft formal complaints in bulk from a CSV or JSONL file.")
+    parser.add_argument("input", help="CSV or JSONL with name, category, description[, location, language]")
+    parser.add_argument("output", help="output file: .docx, .pdf or .txt")
+    parser.add_argument("--no-routing", action="store_true", help="address letters to the generic authority")
+    args = parser.parse_args(argv)
+
+    letters = draft_batch(read_rows(args.input), router=None if args.no_routing else Router())
+    if args.output.endswith(".docx"):
+        with open(args.output, "wb") as out:
+            write_docx(letters, out)
+    elif args.output.endswith(".pdf"):
+        with open(args.output, "wb") as out:
+            skipped = write_pdf(letters, out)
+        if skipped:
+            rows = ", ".join(map(str, skipped[:20])) + (", ..." if len(skipped) > 20 else "")
+            print(f"{len(skipped)} letters were left out of {args.output} because the PDF font cannot show their"
+                  f" script (rows {rows}); write them to .docx or .txt instead", file=sys.stderr)
+    else:
+        with open(args.output, "w", encoding="utf-8") as out:
+            write_text(letters, out)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
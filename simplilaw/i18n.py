@@ -0,0 +1,62 @@
+import json
+import os
+from functools import lru_cache
+
+from simplilaw.cache import TTLCache
+
+LOCALES_DIR = os.path.join(os.path.dirname(__file__), "locales")
+DEFAULT_LANGUAGE = "en"
+LANGUAGES = {"en": "English", "hi": "हिन्दी", "te": "తెలుగు"}
+
+
+@lru_cache(maxsize=None)
+def catalog(language):
+    # Loaded the first time a language is used, then kept for the life of the process
+    if language == DEFAULT_LANGUAGE:
+        return {}
+    path = os.path.join(LOCALES_DIR, f"{language}.json")
+    if not os.path.exists(path):
+        return {}
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def gettext(message, language=DEFAULT_LANGUAGE, **kwargs):
+    # Messages are keyed by their English text; untranslated ones fall back to it
+    translated = catalog(language).get(message, message)
+    return translated.format(**kwargs) if kwargs else translated
+
+
+class Translator:
+    """Translates dynamic text (assistant replies and the like) with a shared cache.
+
+    Uses a local Argos Translate model when one is installed for the language
+    pair; otherwise text is returned unchanged.
+    """
+
+    def __init__(self, cache=None):
+        self.cache = cache or TTLCache(maxsize=4096, ttl=24 * 3600)
+        try:
+            from argostranslate import translate
+            self._backend = translate
+        except ImportError:
+            self._backend = None
+        self._available = {}
+
+    def available(self, language):
+        if self._backend is None:
+            return False
+        if language not in self._available:
+            installed = {lang.code for lang in self._backend.get_installed_languages()}
+            self._available[language] = DEFAULT_LANGUAGE in installed and language in installed
+        return self._available[language]
+
+    def translate(self, text, language):
+        if language == DEFAULT_LANGUAGE or not text:
+            return text
+        return self.cache.get_or_compute((language, text), lambda: self._translate(text, language))
+
+    def _translate(self, text, language):
+        if not self.available(language):
+            return text
+        return self._backend.translate(text, DEFAULT_LANGUAGE, language)
@@ -0,0 +1,81 @@
+import re
+import threading
+from datetime import date
+
+ID_SEQUENCES_SCHEMA = """
+CREATE TABLE IF NOT EXISTS id_sequences (
+    name TEXT PRIMARY KEY,
+    next_value INTEGER NOT NULL
+);
+"""
+
+# SL + year + sequence number, as next_id formats them
+ID_RE = re.compile(r"SL(\d{4})(\d{4,})")
+
+
+def sequence_name(year):
+    return f"complaint:{year}"
+
+
+def advance_sequences(conn, complaint_ids):
+    # Moves each year's sequence past the highest of complaint_ids for that
+    # year, so blocks reserved from now on never reach them (e.g. complaints
+    # imported with their ids). Runs in the caller's transaction.
+    highest = {}
+    for complaint_id in complaint_ids:
+        match = ID_RE.fullmatch(complaint_id)
+        if match:
+            year, value = int(match.group(1)), int(match.group(2))
+            highest[year] = max(highest.get(year, 0), value)
+    conn.executemany(
+        "INSERT INTO id_sequences (name, next_value) VALUES (?, ?)"
+        " ON CONFLICT (name) DO UPDATE SET next_value = MAX(next_value, excluded.next_value)",
+        [(sequence_name(year), value + 1) for year, value in highest.items()],
+    )
+
+
+class ComplaintIdAllocator:
+    """Hands out unique, per-process monotonic complaint ids like SL20250001.
+
+    Each process reserves a block of sequence numbers from the shared database
+    in one short transaction and then serves ids from memory, so contention on
+    the database is one write per block instead of one per complaint.
+    """
+
+    def __init__(self, db, block_size=100):
+        self.db = db
+        self.block_size = block_size
+        self._lock = threading.Lock()
+        self._blocks = {}
+        self.db.executescript(ID_SEQUENCES_SCHEMA)
+
+    def _reserve_block(self, year):
+        name = sequence_name(year)
+        with self.db.transaction() as conn:
+            conn.execute(
+                "INSERT OR IGNORE INTO id_sequences (name, next_value) VALUES (?, 1)", (name,)
+            )
+            start = conn.execute(
+                "SELECT next_value FROM id_sequences WHERE name = ?", (name,)
+            ).fetchone()[0]
+            conn.execute(
+                "UPDATE id_sequences SET next_value = ? WHERE name = ?",
+                (start + self.block_size, name),
+            )
+        return [start, start + self.block_size]
+
+    def next_id(self, year=None):
+        # Call outside any transaction on this thread's connection: a block
+        # reserved inside one would be undone if the caller rolled back, while
+        # this process went on serving ids from it that others can reserve too.
+        if self.db.connection().in_transaction:
+            raise RuntimeError("Allocate complaint ids before opening a transaction")
+        year = year or date.today().year
+        with self._lock:
+            block = self._blocks.get(year)
+            if block is None or block[0] >= block[1]:
+                block = self._blocks[year] = self._reserve_block(year)
+            value = block[0]
+            block[0] += 1
+        # zfill keeps the familiar four digits and simply grows past 9999
+        return f"SL{year}{str(value).zfill(4)}"
@@ -0,0 +1,448 @@
+import gzip
+import hashlib
+import http.client
+import json
+import math
+import secrets
+import sys
+import time
+import traceback
+import zlib
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlsplit
+
+from simplilaw.routing import AUTHORITIES
+from simplilaw.storage import Database
+from simplilaw.users import normalize_email
+
+# A small JSON-over-HTTP way in for citizens on slow, flaky links: the client
+# queues complaints offline and syncs them in batches, each tagged with an
+# idempotency key so a batch whose reply was lost can simply be sent again.
+#
+#   POST /v1/token       {"e": email, "pw": password}            -> {"t": token, "exp": epoch}, or 429 when rate-limited
+#   POST /v1/complaints  {"items": [{"k", "c", "l", "d", "n"?, "p"?, "t"?}, ...]}
+#                        with "Authorization: Bearer <token>"    -> {"r": [{"k", "id", "dup"?} | {"k", "err"}]}
+#   POST /v1/logout      {} with "Authorization: Bearer <token>" -> {"ok": 1}
+#
+# Tokens expire after TOKEN_TTL; a device that was lost, or a shared kiosk,
+# is signed out with python -m simplilaw.ingest --revoke EMAIL.
+#
+# Bodies may be gzip-encoded. Run it next to the Streamlit app, on the same
+# database: python -m simplilaw.ingest --port 8502
+INGEST_SCHEMA = """
+CREATE TABLE IF NOT EXISTS ingest_tokens (
+    token_hash TEXT PRIMARY KEY,
+    user_email TEXT NOT NULL,
+    created_at REAL NOT NULL,
+    expires_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_ingest_tokens_user ON ingest_tokens (user_email);
+CREATE TABLE IF NOT EXISTS ingest_keys (
+    user_email TEXT NOT NULL,
+    idempotency_key TEXT NOT NULL,
+    complaint_id TEXT NOT NULL,
+    created_at REAL NOT NULL,
+    PRIMARY KEY (user_email, idempotency_key)
+) WITHOUT ROWID;
+"""
+
+# Wire keys -> complaint fields; name and phone default to the user's own
+FIELDS = {'c': 'category', 'l': 'location', 'd': 'description', 'n': 'name', 'p': 'phone'}
+MAX_BATCH = 100
+MAX_BODY = 256 * 1024
+MAX_DESCRIPTION = 5000
+TOKEN_TTL = 30 * 24 * 3600
+
+
+def token_hash(token):
+    return hashlib.sha256(token.encode()).hexdigest()
+
+
+def revoke_tokens(db, email):
+    # Signs every device of this user out; returns how many tokens it had
+    db.executescript(INGEST_SCHEMA)
+    with db.transaction() as conn:
+        return conn.execute("DELETE FROM ingest_tokens WHERE user_email = ?", (normalize_email(email),)).rowcount
+
+
+class ComplaintIngest:
+    """Files batches of complaints the way the complaint form does, in one transaction."""
+
+    def __init__(self, db, user_store, id_allocator, complaint_store, status_tracker, route_store,
+                 duplicate_detector=None, rate_limiter=None):
+        self.db = db
+        self.rate_limiter = rate_limiter
+        self.users = user_store
+        self.ids = id_allocator
+        self.complaints = complaint_store
+        self.tracker = status_tracker
+        self.routes = route_store
+        self.duplicates = duplicate_detector
+        self.db.executescript(INGEST_SCHEMA)
+
+    def login_wait(self, email, ip):
+        # Seconds before this address may try this email again; token requests
+        # share the app's login buckets, so switching between the two gains nothing
+        if self.rate_limiter is None:
+            return 0.0
+        return self.rate_limiter.hit('login', ip=ip, email=email.strip())
+
+    def issue_token(self, email, password):
+        # Returns (token, expires_at), or None for a bad email or password
+        user = self.users.authenticate(email, password)
+        if not user:
+            return None
+        token = secrets.token_urlsafe(24)
+        now = time.time()
+        with self.db.transaction() as conn:
+            # The user's expired tokens are cleared out as new ones are issued
+            conn.execute("DELETE FROM ingest_tokens WHERE user_email = ? AND expires_at <= ?", (user['email'], now))
+            conn.execute(
+                "INSERT INTO ingest_tokens (token_hash, user_email, created_at, expires_at) VALUES (?, ?, ?, ?)",
+                (token_hash(token), user['email'], now, now + TOKEN_TTL),
+            )
+        return token, now + TOKEN_TTL
+
+    def user_for_token(self, token):
+        row = self.db.connection().execute(
+            "SELECT user_email FROM ingest_tokens WHERE token_hash = ? AND expires_at > ?",
+            (token_hash(token), time.time()),
+        ).fetchone()
+        return self.users.get(row[0]) if row else None
+
+    def revoke_token(self, token):
+        with self.db.transaction() as conn:
+            return conn.execute("DELETE FROM ingest_tokens WHERE token_hash = ?", (token_hash(token),)).rowcount > 0
+
+    def validate(self, item):
+        if not isinstance(item, dict) or not isinstance(item.get('k'), str) or not 0 < len(item['k']) <= 64:
+            return "missing idempotency key"
+        if item.get('c') not in AUTHORITIES:
+            return "unknown category"
+        for key in ('l', 'd'):
+            if not isinstance(item.get(key), str) or not item[key].strip():
+                return f"missing {FIELDS[key]}"
+        if len(item['d']) > MAX_DESCRIPTION:
+            return "description too long"
+        return None
+
+    def _known_keys(self, conn, user, keys):
+        if not keys:
+            return {}
+        return dict(conn.execute(
+            "SELECT idempotency_key, complaint_id FROM ingest_keys"
+            f" WHERE user_email = ? AND idempotency_key IN ({','.join('?' * len(keys))})",
+            [user['email']] + keys,
+        ).fetchall())
+
+    def submit(self, user, items):
+        # One result per item, in order. Keys already seen for this user return
+        # the complaint they created with 'dup': 1 instead of filing it again.
+        results, fresh = [], []
+        now = time.time()
+        keys = [item['k'] for item in items if not self.validate(item)]
+        # Ids are reserved before the transaction opens (see ComplaintIdAllocator);
+        # one wasted on a key that lands concurrently only leaves a gap
+        known = self._known_keys(self.db.connection(), user, keys)
+        ids = {key: self.ids.next_id() for key in keys if key not in known}
+        with self.db.transaction() as conn:
+            known = self._known_keys(conn, user, keys)
+            for item in items:
+                error = self.validate(item)
+                if error:
+                    results.append({'k': item.get('k') if isinstance(item, dict) else None, 'err': error})
+                    continue
+                if item['k'] in known:
+                    results.append({'k': item['k'], 'id': known[item['k']], 'dup': 1})
+                    continue
+                # Queued offline: the date is when the citizen filed it, not when it arrived
+                filed_at = item.get('t') if isinstance(item.get('t'), (int, float)) and 0 < item['t'] <= now else now
+                complaint = {
+                    'id': ids[item['k']],
+                    'name': str(item.get('n') or user['name']),
+                    'phone': str(item.get('p') or user['phone']),
+                    'category': item['c'],
+                    'location': item['l'].strip(),
+                    'description': item['d'].strip(),
+                    'status': 'Submitted',
+                    'date': time.strftime('%B %d, %Y', time.localtime(filed_at)),
+                    'user_email': user['email'],
+                }
+                known[item['k']] = complaint['id']
+                fresh.append((item['k'], complaint))
+                results.append({'k': item['k'], 'id': complaint['id']})
+            if fresh:
+                complaints = [complaint for _, complaint in fresh]
+                self.complaints.add_many(complaints)
+                conn.executemany(
+                    "INSERT INTO ingest_keys (user_email, idempotency_key, complaint_id, created_at) VALUES (?, ?, ?, ?)",
+                    [(user['email'], key, complaint['id'], now) for key, complaint in fresh],
+                )
+                self.tracker.submitted_many([complaint['id'] for complaint in complaints])
+                self.routes.route_complaints(complaints)
+                if self.duplicates:
+                    self.duplicates.add_many(complaints)
+        return results
+
+
+class IngestHandler(BaseHTTPRequestHandler):
+    server_version = "SimpliLaw-Ingest/1"
+    protocol_version = "HTTP/1.1"  # keep-alive: a whole sync can share one connection
+
+    def log_message(self, format, *args):
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+    def _reply(self, status, payload, headers=()):
+        body = json.dumps(payload, separators=(',', ':')).encode()
+        self.send_response(status)
+        if status >= 400:
+            # The request body may not have been read. Saying so lets the
+            # client reconnect instead of writing to a closed socket.
+            self.close_connection = True
+            self.send_header("Connection", "close")
+        self.send_header("Content-Type", "application/json")
+        for name, value in headers:
+            self.send_header(name, value)
+        if len(body) > 512 and "gzip" in self.headers.get("Accept-Encoding", ""):
+            body = gzip.compress(body)
+            self.send_header("Content-Encoding", "gzip")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _body(self):
+        try:
+            length = int(self.headers.get("Content-Length") or 0)
+        except ValueError:
+            return None
+        if not 0 < length <= MAX_BODY:
+            return None
+        body = self.rfile.read(length)
+        try:
+            if self.headers.get("Content-Encoding") == "gzip":
+                inflater = zlib.decompressobj(wbits=31)
+                body = inflater.decompress(body, MAX_BODY * 4)
+                if inflater.unconsumed_tail:
+                    return None
+            payload = json.loads(body)
+        except (ValueError, zlib.error):
+            return None
+        return payload if isinstance(payload, dict) else None
+
+    def do_GET(self):
+        if self.path == "/v1/health":
+            self._reply(200, {'ok': 1})
+        else:
+            self._reply(404, {'err': "not found"})
+
+    def do_POST(self):
+        if self.path not in ("/v1/token", "/v1/complaints", "/v1/logout"):
+            self._reply(404, {'err': "not found"})
+            return
+        try:
+            self._post()
+        except Exception:
+            # Anything unexpected (e.g. the database stayed locked) still gets a
+            # reply, so the client backs off and retries the batch with the
+            # same keys instead of hanging on the connection
+            traceback.print_exc()
+            self._reply(500, {'err': "server error, try again later"})
+
+    def _post(self):
+        ingest = self.server.ingest
+        payload = self._body()
+        if payload is None:
+            self._reply(400, {'err': "bad request"})
+            return
+        if self.path == "/v1/token":
+            email = str(payload.get('e', ''))
+            wait = ingest.login_wait(email, self.client_address[0])
+            if wait:
+                self._reply(429, {'err': "too many attempts"}, [("Retry-After", str(math.ceil(wait)))])
+                return
+            issued = ingest.issue_token(email, str(payload.get('pw', '')))
+            if issued:
+                self._reply(200, {'t': issued[0], 'exp': int(issued[1])})
+            else:
+                self._reply(401, {'err': "invalid email or password"})
+            return
+        authorization = self.headers.get("Authorization", "")
+        token = authorization[7:] if authorization.startswith("Bearer ") else None
+        user = ingest.user_for_token(token) if token else None
+        if not user:
+            self._reply(401, {'err': "invalid token"})
+            return
+        if self.path == "/v1/logout":
+            ingest.revoke_token(token)
+            self._reply(200, {'ok': 1})
+            return
+        items = payload.get('items')
+        if not isinstance(items, list) or not 0 < len(items) <= MAX_BATCH:
+            self._reply(400, {'err': f"send 1 to {MAX_BATCH} items"})
+            return
+        self._reply(200, {'r': ingest.submit(user, items)})
+
+
+class IngestServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, ingest, address=("0.0.0.0", 8502), verbose=False):
+        super().__init__(address, IngestHandler)
+        self.ingest = ingest
+        self.verbose = verbose
+
+
+class IngestClient:
+    """Offline queue for a field device or kiosk, synced to an IngestServer.
+
+    Complaints are kept in a local SQLite outbox until the server has
+    acknowledged them, so closing the app or losing the connection mid-sync
+    loses nothing and files nothing twice.
+    """
+
+    def __init__(self, base_url, outbox_path, timeout=60):
+        url = urlsplit(base_url)
+        self.host = url.hostname
+        self.port = url.port or 80
+        self.timeout = timeout
+        self.db = Database(outbox_path)
+        self.db.executescript(
+            "CREATE TABLE IF NOT EXISTS outbox (key TEXT PRIMARY KEY, payload TEXT NOT NULL, queued_at REAL NOT NULL);"
+            "CREATE TABLE IF NOT EXISTS settings (name TEXT PRIMARY KEY, value TEXT NOT NULL);"
+        )
+        self._conn = None
+
+    def _request(self, path, payload, token=None):
+        # Returns (status, reply); raises OSError/HTTPException when the link fails
+        body = gzip.compress(json.dumps(payload, separators=(',', ':')).encode())
+        headers = {"Content-Type": "application/json", "Content-Encoding": "gzip", "Accept-Encoding": "gzip"}
+        if token:
+            headers["Authorization"] = f"Bearer {token}"
+        if self._conn is None:
+            self._conn = http.client.HTTPConnection(self.host, self.port, timeout=self.timeout)
+        try:
+            self._conn.request("POST", path, body, headers)
+            response = self._conn.getresponse()
+            data = response.read()
+        except (OSError, http.client.HTTPException):
+            self.close()
+            raise
+        if response.getheader("Content-Encoding") == "gzip":
+            data = gzip.decompress(data)
+        return response.status, json.loads(data)
+
+    def close(self):
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+    @property
+    def token(self):
+        row = self.db.connection().execute("SELECT value FROM settings WHERE name = 'token'").fetchone()
+        return row[0] if row else None
+
+    def login(self, email, password):
+        status, reply = self._request("/v1/token", {'e': email, 'pw': password})
+        if status != 200:
+            return False
+        with self.db.transaction() as conn:
+            conn.execute("INSERT OR REPLACE INTO settings (name, value) VALUES ('token', ?)", (reply['t'],))
+        return True
+
+    def logout(self):
+        # Revokes the token on the server, then forgets it here
+        token = self.token
+        if token:
+            self._request("/v1/logout", {}, token)
+        with self.db.transaction() as conn:
+            conn.execute("DELETE FROM settings WHERE name = 'token'")
+
+    def queue(self, category, location, description, name=None, phone=None):
+        key = secrets.token_hex(8)
+        item = {'k': key, 'c': category, 'l': location, 'd': description, 't': int(time.time())}
+        if name:
+            item['n'] = name
+        if phone:
+            item['p'] = phone
+        with self.db.transaction() as conn:
+            conn.execute(
+                "INSERT INTO outbox (key, payload, queued_at) VALUES (?, ?, ?)",
+                (key, json.dumps(item, separators=(',', ':')), time.time()),
+            )
+        return key
+
+    def pending(self):
+        return self.db.connection().execute("SELECT COUNT(*) FROM outbox").fetchone()[0]
+
+    def sync(self, batch_size=25):
+        # Sends the outbox oldest first until it is empty or the link drops.
+        # Returns {'filed': {key: complaint_id}, 'rejected': {key: reason}, 'error': str | None};
+        # anything not yet acknowledged stays queued for the next sync.
+        filed, rejected = {}, {}
+        conn = self.db.connection()
+        while True:
+            rows = conn.execute(
+                "SELECT key, payload FROM outbox ORDER BY queued_at, key LIMIT ?", (min(batch_size, MAX_BATCH),)
+            ).fetchall()
+            if not rows:
+                return {'filed': filed, 'rejected': rejected, 'error': None}
+            try:
+                status, reply = self._request(
+                    "/v1/complaints", {'items': [json.loads(row['payload']) for row in rows]}, self.token
+                )
+            except (OSError, http.client.HTTPException) as e:
+                return {'filed': filed, 'rejected': rejected, 'error': str(e) or type(e).__name__}
+            if status != 200:
+                return {'filed': filed, 'rejected': rejected, 'error': reply.get('err', f"HTTP {status}")}
+            for result in reply['r']:
+                if 'id' in result:
+                    filed[result['k']] = result['id']
+                else:
+                    rejected[result['k']] = result['err']
+            with self.db.transaction() as conn:
+                conn.executemany("DELETE FROM outbox WHERE key = ?", [(result['k'],) for result in reply['r']])
+
+
+def main(argv=None):
+    import argparse
+    from simplilaw.dedup import DuplicateDetector
+    from simplilaw.ids import ComplaintIdAllocator
+    from simplilaw.ratelimit import RATE_LIMIT_DB_PATH, RateLimiter, SQLiteBucketStore
+    from simplilaw.routing import Router, RouteStore
+    from simplilaw.status import StatusTracker
+    from simplilaw.storage import ComplaintStore
+    from simplilaw.users import UserStore
+
+    parser = argparse.ArgumentParser(description="Serve the low-bandwidth complaint ingest API.")
+    parser.add_argument("--host", default="0.0.0.0")
+    parser.add_argument("--port", type=int, default=8502)
+    parser.add_argument("--verbose", action="store_true", help="log every request")
+    parser.add_argument("--revoke", metavar="EMAIL", help="sign every device of this user out, then exit")
+    args = parser.parse_args(argv)
+
+    db = Database()
+    if args.revoke:
+        # Only the token table is touched, so a running server need not stop
+        print(f"revoked {revoke_tokens(db, args.revoke)} ingest tokens for {args.revoke}", file=sys.stderr)
+        return
+    route_store = RouteStore(db, Router())
+    # Buckets live in SQLite so they are shared with app workers given the
+    # same SIMPLILAW_RATE_LIMIT_DB, and survive a restart of this server
+    limiter = RateLimiter(store=SQLiteBucketStore(Database(RATE_LIMIT_DB_PATH) if RATE_LIMIT_DB_PATH else db))
+    ingest = ComplaintIngest(
+        db, UserStore(db), ComplaintIdAllocator(db), ComplaintStore(db), StatusTracker(db), route_store,
+        DuplicateDetector(db, route_store.router), limiter,
+    )
+    server = IngestServer(ingest, (args.host, args.port), verbose=args.verbose)
+    print(f"SimpliLaw ingest listening on {args.host}:{args.port}", file=sys.stderr)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
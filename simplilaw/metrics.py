@@ -0,0 +1,189 @@
+import functools
+import json
+import os
+import sys
+import threading
+import time
+from collections import deque
+
+# Set SIMPLILAW_METRICS to a file path to switch instrumentation on. Paths
+# ending in .jsonl get one JSON snapshot appended per export; anything else is
+# rewritten in the Prometheus text format.
+METRICS_PATH = os.environ.get("SIMPLILAW_METRICS")
+QUANTILES = (0.5, 0.9, 0.99)
+
+
+def worker_path(path, worker):
+    # 'metrics.prom' -> 'metrics.8511.prom': one file per worker process, as
+    # each only knows its own counters and samples
+    suffix = ".jsonl" if path.endswith(".jsonl") else os.path.splitext(path)[1]
+    return f"{path[:len(path) - len(suffix)]}.{worker}{suffix}"
+
+
+def percentile(sorted_values, q):
+    if not sorted_values:
+        return 0.0
+    return sorted_values[min(len(sorted_values) - 1, int(len(sorted_values) * q))]
+
+
+def approximate_size(obj, seen=None):
+    # Deep sys.getsizeof over the containers session state is made of
+    seen = set() if seen is None else seen
+    if id(obj) in seen:
+        return 0
+    seen.add(id(obj))
+    size = sys.getsizeof(obj)
+    if isinstance(obj, dict):
+        size += sum(approximate_size(k, seen) + approximate_size(v, seen) for k, v in obj.items())
+    elif isinstance(obj, (list, tuple, set, frozenset, deque)):
+        size += sum(approximate_size(item, seen) for item in obj)
+    elif hasattr(obj, '__dict__'):
+        size += approximate_size(vars(obj), seen)
+    return size
+
+
+def _series(name, labels):
+    return (name, tuple(sorted(labels.items())))
+
+
+def _format_labels(labels, **extra):
+    items = list(labels) + list(extra.items())
+    if not items:
+        return ""
+    return "{" + ",".join(f'{k}="{v}"' for k, v in items) + "}"
+
+
+class Metrics:
+    """Process-wide counters and latency samples, exported to a local file.
+
+    Observations keep the last `window` samples per series, which is enough
+    for p50/p99 under load without unbounded memory. When disabled every
+    method is a no-op and timed() returns the function unchanged.
+    """
+
+    def __init__(self, path=METRICS_PATH, window=2048, interval=10.0):
+        self.path = path
+        self.enabled = bool(path)
+        self.window = window
+        self.interval = interval
+        self._counters = {}
+        self._samples = {}
+        self._collectors = []
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+        if self.enabled:
+            self._thread = threading.Thread(target=self._export_loop, name="metrics-export", daemon=True)
+            self._thread.start()
+
+    def increment(self, name, amount=1, **labels):
+        if not self.enabled:
+            return
+        key = _series(name, labels)
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + amount
+
+    def observe(self, name, value, **labels):
+        if not self.enabled:
+            return
+        key = _series(name, labels)
+        with self._lock:
+            samples = self._samples.get(key)
+            if samples is None:
+                samples = self._samples[key] = [deque(maxlen=self.window), 0, 0.0]
+            samples[0].append(value)
+            samples[1] += 1
+            samples[2] += value
+
+    def timed(self, function_name):
+        def decorator(func):
+            if not self.enabled:
+                return func
+
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                start = time.perf_counter()
+                try:
+                    return func(*args, **kwargs)
+                finally:
+                    self.observe("simplilaw_function_seconds", time.perf_counter() - start, function=function_name)
+            return wrapper
+        return decorator
+
+    def add_collector(self, collect):
+        # collect() returns {gauge name: value}; it is called at export time
+        self._collectors.append(collect)
+
+    def snapshot(self):
+        with self._lock:
+            counters = dict(self._counters)
+            samples = {key: (sorted(values), count, total) for key, (values, count, total) in self._samples.items()}
+        summaries = []
+        for (name, labels), (values, count, total) in samples.items():
+            summaries.append({
+                'name': name,
+                'labels': dict(labels),
+                'count': count,
+                'sum': total,
+                'quantiles': {str(q): percentile(values, q) for q in QUANTILES},
+            })
+        gauges = {}
+        for collect in self._collectors:
+            gauges.update(collect())
+        return {
+            'timestamp': time.time(),
+            'counters': [{'name': name, 'labels': dict(labels), 'value': value}
+                         for (name, labels), value in counters.items()],
+            'summaries': summaries,
+            'gauges': gauges,
+        }
+
+    def prometheus_text(self, snapshot=None):
+        snapshot = snapshot or self.snapshot()
+        lines = []
+        typed = set()
+        for counter in snapshot['counters']:
+            if counter['name'] not in typed:
+                typed.add(counter['name'])
+                lines.append(f"# TYPE {counter['name']} counter")
+            lines.append(f"{counter['name']}{_format_labels(counter['labels'].items())} {counter['value']}")
+        for summary in snapshot['summaries']:
+            name, labels = summary['name'], summary['labels'].items()
+            if name not in typed:
+                typed.add(name)
+                lines.append(f"# TYPE {name} summary")
+            for q, value in summary['quantiles'].items():
+                lines.append(f"{name}{_format_labels(labels, quantile=q)} {value:.6g}")
+            lines.append(f"{name}_sum{_format_labels(labels)} {summary['sum']:.6g}")
+            lines.append(f"{name}_count{_format_labels(labels)} {summary['count']}")
+        for name, value in snapshot['gauges'].items():
+            lines.append(f"# TYPE {name} gauge")
+            lines.append(f"{name} {value:.6g}")
+        return "\n".join(lines) + "\n"
+
+    def export(self):
+        if not self.enabled:
+            return
+        snapshot = self.snapshot()
+        if self.path.endswith(".jsonl"):
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write(json.dumps(snapshot) + "\n")
+        else:
+            # Written aside and renamed so a scraper never reads half a file
+            tmp_path = f"{self.path}.tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                f.write(self.prometheus_text(snapshot))
+            os.replace(tmp_path, self.path)
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+        self.export()
+
+    def _export_loop(self):
+        while not self._stop.wait(self.interval):
+            try:
+                self.export()
+            except Exception:
+                pass  # e.g. the directory went away; try again next tick
@@ -0,0 +1,228 @@
+import json
+import multiprocessing
+import os
+import queue
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+
+from simplilaw.uploads import IMAGE_EXTENSIONS
+
+try:
+    from PIL import Image, ExifTags
+except ImportError:
+    Image = None
+
+# Processes for each app process's OCR pool; simplilaw.workers sets it so the
+# pools of all workers on a node add up to its cores. Unset, one per core.
+OCR_WORKERS = os.environ.get("SIMPLILAW_OCR_WORKERS")
+# A claim older than this belongs to a process that died mid-batch and may be
+# taken over
+CLAIM_TIMEOUT = 600
+
+# Images are claimed in ocr_claims while a process works on them, so app
+# workers sharing the database never OCR the same image twice.
+OCR_SCHEMA = """
+CREATE TABLE IF NOT EXISTS ocr_results (
+    sha256 TEXT PRIMARY KEY,
+    engine TEXT NOT NULL,
+    text TEXT NOT NULL,
+    metadata TEXT NOT NULL,
+    created_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS ocr_claims (
+    sha256 TEXT PRIMARY KEY,
+    claimed_at REAL NOT NULL
+) WITHOUT ROWID;
+"""
+
+_SHUTDOWN = object()
+
+# Per-worker-process state, set up once by load_engine()
+_engine = None
+_language = "eng"
+
+
+def load_engine(language="eng"):
+    # Runs once in each worker so the OCR engine is loaded before the first batch
+    global _engine, _language
+    _language = language
+    try:
+        import pytesseract
+        pytesseract.get_tesseract_version()
+        _engine = pytesseract
+    except Exception:
+        _engine = None
+
+
+def engine_name():
+    return "tesseract" if _engine is not None else "metadata-only"
+
+
+def extract_image(path):
+    if Image is None:
+        return {'engine': engine_name(), 'text': "", 'metadata': {'error': "Pillow is not installed"}}
+    try:
+        with Image.open(path) as image:
+            metadata = {'format': image.format, 'width': image.width, 'height': image.height}
+            exif = image.getexif()
+            for tag_id, value in exif.items():
+                tag = ExifTags.TAGS.get(tag_id)
+                if tag in ('DateTime', 'Make', 'Model'):
+                    metadata[tag] = str(value)
+            if ExifTags.IFD.GPSInfo in exif:
+                metadata['has_gps'] = True
+            text = ""
+            if _engine is not None:
+                text = _engine.image_to_string(image.convert("L"), lang=_language).strip()
+    except Exception as e:
+        return {'engine': engine_name(), 'text': "", 'metadata': {'error': str(e)}}
+    return {'engine': engine_name(), 'text': text, 'metadata': metadata}
+
+
+def extract_batch(paths):
+    return [extract_image(path) for path in paths]
+
+
+class OcrPipeline:
+    """Extracts text and metadata from image attachments on a process pool.
+
+    Attachments are pulled off a work queue in small batches (one round trip
+    to a worker per batch), and results are cached by content hash so an
+    identical image is only ever read once, by whichever process claims it.
+    """
+
+    def __init__(self, document_store, workers=None, batch_size=8, batch_wait=0.05, language="eng"):
+        self.documents = document_store
+        self.db = document_store.db
+        self.db.executescript(OCR_SCHEMA)
+        self.workers = workers or int(OCR_WORKERS or 0) or os.cpu_count() or 1
+        self.batch_size = batch_size
+        self.batch_wait = batch_wait
+        self._queue = queue.Queue()
+        self._in_flight = set()
+        self._idle = threading.Condition()
+        # spawn rather than fork: the app process is full of threads
+        self._pool = ProcessPoolExecutor(
+            max_workers=self.workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=load_engine,
+            initargs=(language,),
+        )
+        self._dispatcher = threading.Thread(target=self._dispatch, name="ocr-dispatcher", daemon=True)
+        self._dispatcher.start()
+
+    def enqueue(self, sha256):
+        with self._idle:
+            if sha256 in self._in_flight:
+                return
+            self._in_flight.add(sha256)
+        self._queue.put(sha256)
+
+    def recover(self):
+        # Queues every image that has no result and no live claim, e.g. left
+        # in the queue of a process that was restarted. Images another worker
+        # is still on are left to it.
+        placeholders = ", ".join("?" * len(IMAGE_EXTENSIONS))
+        rows = self.db.connection().execute(
+            f"SELECT sha256 FROM documents WHERE extension IN ({placeholders})"
+            " AND sha256 NOT IN (SELECT sha256 FROM ocr_results)"
+            " AND sha256 NOT IN (SELECT sha256 FROM ocr_claims WHERE claimed_at > ?)",
+            IMAGE_EXTENSIONS + (time.time() - CLAIM_TIMEOUT,),
+        ).fetchall()
+        for row in rows:
+            self.enqueue(row[0])
+        return len(rows)
+
+    def result(self, sha256):
+        row = self.db.connection().execute(
+            "SELECT engine, text, metadata FROM ocr_results WHERE sha256 = ?", (sha256,)
+        ).fetchone()
+        if row is None:
+            return None
+        return {'engine': row['engine'], 'text': row['text'], 'metadata': json.loads(row['metadata'])}
+
+    def text_for_complaint(self, complaint_id):
+        rows = self.db.connection().execute(
+            "SELECT r.text FROM complaint_attachments a JOIN ocr_results r USING (sha256)"
+            " WHERE a.complaint_id = ? AND r.text != ''",
+            (complaint_id,),
+        ).fetchall()
+        return "\n".join(row[0] for row in rows)
+
+    def wait(self, timeout=None):
+        # Blocks until every enqueued image has a result, or is being worked
+        # on by another process
+        with self._idle:
+            return self._idle.wait_for(lambda: not self._in_flight, timeout)
+
+    def shutdown(self):
+        self._queue.put(_SHUTDOWN)
+        self._dispatcher.join()
+        self._pool.shutdown()
+
+    def _next_batch(self):
+        batch = [self._queue.get()]
+        deadline = time.monotonic() + self.batch_wait
+        while len(batch) < self.batch_size and batch[-1] is not _SHUTDOWN:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(self._queue.get(timeout=remaining))
+            except queue.Empty:
+                break
+        return batch
+
+    def _dispatch(self):
+        while True:
+            batch = self._next_batch()
+            shutting_down = batch[-1] is _SHUTDOWN
+            if shutting_down:
+                batch.pop()
+            pending = self._claim(batch)
+            self._finish([sha256 for sha256 in batch if sha256 not in pending])
+            if pending:
+                future = self._pool.submit(extract_batch, [self.documents.blob_path(sha256) for sha256 in pending])
+                future.add_done_callback(partial(self._store, pending))
+            if shutting_down:
+                return
+
+    def _claim(self, batch):
+        # Returns the images in batch this process now owns: no result yet,
+        # and no claim by another process, or only one that has timed out
+        now = time.time()
+        claimed = []
+        with self.db.transaction() as conn:
+            for sha256 in batch:
+                if conn.execute("SELECT 1 FROM ocr_results WHERE sha256 = ?", (sha256,)).fetchone():
+                    continue
+                if conn.execute(
+                    "INSERT INTO ocr_claims (sha256, claimed_at) VALUES (?, ?)"
+                    " ON CONFLICT (sha256) DO UPDATE SET claimed_at = excluded.claimed_at WHERE claimed_at <= ?",
+                    (sha256, now, now - CLAIM_TIMEOUT),
+                ).rowcount:
+                    claimed.append(sha256)
+        return claimed
+
+    def _store(self, batch, future):
+        try:
+            results = future.result()
+            with self.db.transaction() as conn:
+                conn.executemany(
+                    "INSERT OR REPLACE INTO ocr_results (sha256, engine, text, metadata, created_at)"
+                    " VALUES (?, ?, ?, ?, ?)",
+                    [(sha256, r['engine'], r['text'], json.dumps(r['metadata']), time.time())
+                     for sha256, r in zip(batch, results)],
+                )
+        finally:
+            # Released on failure too, so the next recover() tries again
+            with self.db.transaction() as conn:
+                conn.executemany("DELETE FROM ocr_claims WHERE sha256 = ?", [(sha256,) for sha256 in batch])
+            self._finish(batch)
+
+    def _finish(self, batch):
+        with self._idle:
+            self._in_flight.difference_update(batch)
+            self._idle.notify_all()
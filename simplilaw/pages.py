@@ -0,0 +1,58 @@
+from functools import lru_cache
+
+from simplilaw.i18n import gettext
+
+# The static parts of the home, about and features pages. They are built here
+# rather than in app.py because Streamlit re-executes app.py on every rerun,
+# which would start each cache over; in an imported module they are rendered
+# once per language and process.
+HOW_IT_WORKS_STEPS = [
+    ("✏️", "1. Report", "Describe your issue in simple words or upload photos. Our AI will help generate a proper complaint."),
+    ("🔍", "2. Review", "We automatically route your complaint to the right authority based on your location and issue type."),
+    ("✅", "3. Resolve", "Track your complaint status in real-time and receive updates until your issue is resolved.")
+]
+
+FEATURES = [
+    ("🤖", "AI-Powered Assistant", "Get instant legal guidance and complaint drafting help from our intelligent chatbot."),
+    ("🌐", "Multilingual Support", "Access services in English, Hindi, Telugu, and more regional languages."),
+    ("📷", "Image Recognition", "Upload photos of documents or issues - our AI will extract relevant information."),
+    ("📍", "Smart Routing", "Automatically connect with the right authorities based on your location and issue type."),
+    ("📊", "Real-time Tracking", "Monitor your complaint progress with live updates and status notifications."),
+    ("🛡️", "Secure & Private", "Your data is encrypted and protected with enterprise-grade security measures.")
+]
+
+
+@lru_cache(maxsize=None)
+def hero_html(language):
+    return f"""
+    <div class="main-header">
+        <h1 style="font-size: 3.5rem; font-weight: bold; margin-bottom: 1rem;">{gettext("Justice Made Simple", language)}</h1>
+        <p style="font-size: 1.25rem; margin-bottom: 2rem; max-width: 800px; margin-left: auto; margin-right: auto;">
+            {gettext("AI-powered legal support platform helping Indian citizens access justice easily, affordably, and in their own language.", language)}
+        </p>
+    </div>
+    """
+
+
+@lru_cache(maxsize=None)
+def step_card_html(icon, title, text, language):
+    return f"""
+    <div class="step-card">
+        <div style="background: #dbeafe; width: 64px; height: 64px; border-radius: 50%; display: flex; align-items: center; justify-content: center; margin: 0 auto 1.5rem auto;">
+            <span style="font-size: 1.5rem;">{icon}</span>
+        </div>
+        <h3 style="font-size: 1.25rem; font-weight: 600; margin-bottom: 1rem;">{gettext(title, language)}</h3>
+        <p style="color: #6b7280;">{gettext(text, language)}</p>
+    </div>
+    """
+
+
+@lru_cache(maxsize=None)
+def feature_card_html(icon, title, description, language):
+    return f"""
+    <div class="feature-card">
+        <div style="font-size: 2rem; margin-bottom: 1rem;">{icon}</div>
+        <h3 style="font-size: 1.25rem; font-weight: 600; margin-bottom: 0.75rem;">{gettext(title, language)}</h3>
+        <p style="color: #6b7280;">{gettext(description, language)}</p>
+    </div>
+    """
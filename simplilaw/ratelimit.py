@@ -0,0 +1,160 @@
+import os
+import threading
+import time
+from collections import OrderedDict
+
+# Set SIMPLILAW_RATE_LIMIT_DB to a SQLite file to share buckets between worker
+# processes (it may be the main database); unset, each process counts alone.
+RATE_LIMIT_DB_PATH = os.environ.get("SIMPLILAW_RATE_LIMIT_DB")
+
+# action -> {key kind: (burst, seconds per extra request)}. A request must find
+# a token in the bucket of every key it carries; keys left as None are skipped.
+# Mobile carriers put hundreds of citizens behind one address (carrier-grade
+# NAT), so the per-IP buckets only stop floods well beyond what a crowd of real
+# users sends; the session and email buckets do the per-person limiting.
+RATE_LIMITS = {
+    'login': {'session': (10, 6), 'ip': (300, 0.2), 'email': (5, 60)},
+    'register': {'session': (3, 60), 'ip': (100, 6)},
+    'chat': {'session': (10, 3), 'ip': (600, 0.02), 'email': (20, 3)},
+}
+
+RATE_LIMIT_SCHEMA = """
+CREATE TABLE IF NOT EXISTS rate_limits (
+    key TEXT PRIMARY KEY,
+    tokens REAL NOT NULL,
+    updated_at REAL NOT NULL,
+    full_at REAL NOT NULL
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS idx_rate_limits_full ON rate_limits (full_at);
+"""
+
+
+def _refill(tokens, updated_at, capacity, interval, now):
+    return min(capacity, tokens + (now - updated_at) / interval)
+
+
+def _take(buckets, state, now):
+    # buckets: [(key, capacity, interval)]; state: {key: (tokens, updated_at)}.
+    # Returns (seconds to wait, {key: new state}); nothing is taken unless every
+    # bucket has a whole token, so a blocked IP does not drain its users' buckets.
+    levels = []
+    wait = 0.0
+    for key, capacity, interval in buckets:
+        tokens = capacity
+        if key in state:
+            tokens = _refill(*state[key], capacity, interval, now)
+        if tokens < 1:
+            wait = max(wait, (1 - tokens) * interval)
+        levels.append((key, tokens - 1, now + (capacity - tokens + 1) * interval))
+    if wait:
+        return wait, {}
+    return 0.0, {key: (tokens, now, full_at) for key, tokens, full_at in levels}
+
+
+class MemoryBucketStore:
+    """Token buckets in a dict, for a single process.
+
+    A bucket that has refilled is the same as no bucket, so idle entries are
+    dropped from the front of the LRU order as requests come in; maxsize caps
+    the table if many keys stay busy at once.
+    """
+
+    def __init__(self, maxsize=100000):
+        self.maxsize = maxsize
+        self._buckets = OrderedDict()
+        self._lock = threading.Lock()
+
+    def take(self, buckets, now):
+        with self._lock:
+            state = {key: self._buckets[key][:2] for key, _, _ in buckets if key in self._buckets}
+            wait, updates = _take(buckets, state, now)
+            for key, entry in updates.items():
+                self._buckets[key] = entry
+                self._buckets.move_to_end(key)
+            while self._buckets:
+                key, (_, _, full_at) = next(iter(self._buckets.items()))
+                if full_at > now and len(self._buckets) <= self.maxsize:
+                    break
+                del self._buckets[key]
+            return wait
+
+    def __len__(self):
+        return len(self._buckets)
+
+
+class SQLiteBucketStore:
+    """Token buckets in a SQLite table, shared by every process using the file.
+
+    Each check is a primary-key read and upsert of at most three rows inside
+    one write transaction. Refilled rows are deleted every prune_every checks.
+    """
+
+    def __init__(self, db, prune_every=1000):
+        self.db = db
+        self.prune_every = prune_every
+        self._checks = 0
+        self.db.executescript(RATE_LIMIT_SCHEMA)
+
+    def take(self, buckets, now):
+        keys = [key for key, _, _ in buckets]
+        with self.db.transaction() as conn:
+            state = {
+                row['key']: (row['tokens'], row['updated_at'])
+                for row in conn.execute(
+                    f"SELECT key, tokens, updated_at FROM rate_limits WHERE key IN ({', '.join('?' * len(keys))})",
+                    keys,
+                )
+            }
+            wait, updates = _take(buckets, state, now)
+            conn.executemany(
+                "INSERT INTO rate_limits (key, tokens, updated_at, full_at) VALUES (?, ?, ?, ?)"
+                " ON CONFLICT (key) DO UPDATE SET tokens = excluded.tokens,"
+                " updated_at = excluded.updated_at, full_at = excluded.full_at",
+                [(key, *entry) for key, entry in updates.items()],
+            )
+            self._checks += 1
+            if self._checks % self.prune_every == 0:
+                conn.execute("DELETE FROM rate_limits WHERE full_at <= ?", (now,))
+        return wait
+
+    def __len__(self):
+        return self.db.connection().execute("SELECT COUNT(*) FROM rate_limits").fetchone()[0]
+
+
+class RateLimiter:
+    """Token-bucket limits per action, keyed by session, IP address and email.
+
+    hit() costs one dict or primary-key lookup per key whatever the traffic,
+    and returns 0.0 when the request may go ahead or the seconds until it may.
+    Rejections are counted here and, if given, in metrics.
+    """
+
+    def __init__(self, limits=RATE_LIMITS, store=None, metrics=None, clock=time.time):
+        self.limits = limits
+        self.store = store if store is not None else MemoryBucketStore()
+        self.metrics = metrics
+        self._clock = clock
+        self._lock = threading.Lock()
+        self.allowed = {}
+        self.rejected = {}
+
+    def hit(self, action, **keys):
+        rules = self.limits[action]
+        buckets = [
+            (f"{action}:{kind}:{str(value).lower()}", *rules[kind])
+            for kind, value in keys.items() if value and kind in rules
+        ]
+        wait = self.store.take(buckets, self._clock()) if buckets else 0.0
+        with self._lock:
+            counts = self.rejected if wait else self.allowed
+            counts[action] = counts.get(action, 0) + 1
+        if wait and self.metrics is not None:
+            self.metrics.increment("simplilaw_rate_limited_total", action=action)
+        return wait
+
+    def stats(self):
+        with self._lock:
+            stats = {f"allowed_{action}": count for action, count in self.allowed.items()}
+            stats.update({f"rejected_{action}": count for action, count in self.rejected.items()})
+        stats['buckets'] = len(self.store)
+        return stats
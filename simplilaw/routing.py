@@ -0,0 +1,146 @@
+import csv
+import os
+import re
+import time
+
+GAZETTEER_PATH = os.path.join(os.path.dirname(__file__), "data", "gazetteer.csv")
+
+# Where each complaint category is heard, at district level and as a state-level fallback
+AUTHORITIES = {
+    "Consumer Rights": ("District Consumer Disputes Redressal Commission, {district}",
+                        "State Consumer Disputes Redressal Commission, {state}"),
+    "Property Dispute": ("Civil Court and Revenue Divisional Office, {district}",
+                         "Revenue Department, Government of {state}"),
+    "Employment Issue": ("Assistant Labour Commissioner, {district}",
+                         "Labour Commissioner, Government of {state}"),
+    "Public Services": ("District Collector and Municipal Commissioner, {district}",
+                        "Public Grievance Cell, Government of {state}"),
+    "Family Law": ("Family Court, {district}",
+                   "Family Court (Principal), {state}"),
+    "Other": ("District Legal Services Authority, {district}",
+              "State Legal Services Authority, {state}"),
+}
+NATIONAL_FALLBACK = "Centralized Public Grievance Redress and Monitoring System (CPGRAMS)"
+
+PINCODE_RE = re.compile(r"\b(\d{6})\b")
+WORD_RE = re.compile(r"[a-z]+")
+
+
+def name_key(name):
+    return tuple(WORD_RE.findall(name.lower()))
+
+
+class Trie:
+    """Prefix trie mapping a sequence (digits or words) to a value."""
+
+    def __init__(self):
+        self.root = {}
+
+    def insert(self, sequence, value):
+        node = self.root
+        for item in sequence:
+            node = node.setdefault(item, {})
+        # First entry wins when two places share a key
+        node.setdefault(None, value)
+
+    def longest_match(self, sequence, start=0):
+        # Returns (value, length) of the longest key that prefixes sequence[start:]
+        node, best = self.root, (None, 0)
+        for offset, item in enumerate(sequence[start:], 1):
+            node = node.get(item)
+            if node is None:
+                break
+            if None in node:
+                best = (node[None], offset)
+        return best
+
+
+class Router:
+    """Maps a free-text location and category to the authority that handles it."""
+
+    def __init__(self, gazetteer_path=GAZETTEER_PATH):
+        self.pincodes = Trie()
+        self.names = Trie()
+        self.authorities = {}
+        with open(gazetteer_path, newline="", encoding="utf-8") as f:
+            for row in csv.DictReader(f):
+                place = {'state': row['state'], 'district': row['district']}
+                for prefix in row['pin_prefixes'].split(';'):
+                    self.pincodes.insert(prefix, place)
+                names = [row['district']] + [alias for alias in row['aliases'].split(';') if alias]
+                for name in names:
+                    self.names.insert(name_key(name), place)
+                self.names.insert(name_key(row['state']), {'state': row['state'], 'district': None})
+                for category, (district_authority, state_authority) in AUTHORITIES.items():
+                    self.authorities[(category, row['state'], row['district'])] = district_authority.format(**place)
+                    self.authorities[(category, row['state'], None)] = state_authority.format(**place)
+
+    def resolve(self, location):
+        # A pincode is the most precise signal; otherwise the most specific place named
+        match = PINCODE_RE.search(location)
+        if match:
+            place, _ = self.pincodes.longest_match(match.group(1))
+            if place:
+                return dict(place, pincode=match.group(1))
+        words = name_key(location)
+        best = None
+        for start in range(len(words)):
+            place, _ = self.names.longest_match(words, start)
+            if place and (best is None or (place['district'] and not best['district'])):
+                best = place
+        return dict(best, pincode=None) if best else None
+
+    def route(self, location, category):
+        place = self.resolve(location)
+        if place is None:
+            return {'state': None, 'district': None, 'pincode': None, 'authority': NATIONAL_FALLBACK}
+        authority = (
+            self.authorities.get((category, place['state'], place['district']))
+            or self.authorities.get(("Other", place['state'], place['district']))
+        )
+        return dict(place, authority=authority)
+
+    def route_many(self, complaints):
+        return [self.route(c['location'], c['category']) for c in complaints]
+
+
+ROUTES_SCHEMA = """
+CREATE TABLE IF NOT EXISTS complaint_routes (
+    complaint_id TEXT PRIMARY KEY,
+    state TEXT,
+    district TEXT,
+    pincode TEXT,
+    authority TEXT NOT NULL,
+    routed_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_routes_authority ON complaint_routes (authority);
+"""
+
+
+class RouteStore:
+    """Records which authority each complaint was routed to."""
+
+    def __init__(self, db, router):
+        self.db = db
+        self.router = router
+        self.db.executescript(ROUTES_SCHEMA)
+
+    def route_complaints(self, complaints):
+        # Routes and saves any number of complaints in one transaction
+        routes = self.router.route_many(complaints)
+        now = time.time()
+        with self.db.transaction() as conn:
+            conn.executemany(
+                "INSERT OR REPLACE INTO complaint_routes"
+                " (complaint_id, state, district, pincode, authority, routed_at) VALUES (?, ?, ?, ?, ?, ?)",
+                [(c['id'], r['state'], r['district'], r['pincode'], r['authority'], now)
+                 for c, r in zip(complaints, routes)],
+            )
+        return routes
+
+    def get(self, complaint_id):
+        row = self.db.connection().execute(
+            "SELECT state, district, pincode, authority FROM complaint_routes WHERE complaint_id = ?",
+            (complaint_id,),
+        ).fetchone()
+        return dict(row) if row else None
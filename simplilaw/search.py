@@ -0,0 +1,257 @@
+import calendar
+import re
+
+from simplilaw.routing import ROUTES_SCHEMA
+from simplilaw.storage import COMPLAINTS_SCHEMA, row_to_complaint
+
+FACETS = ('category', 'status', 'district', 'month')
+
+# The district facet is where a complaint was routed, not the free-text
+# location a citizen typed: "District, State", "State" when only the state was
+# recognised, or UNKNOWN_DISTRICT. That keeps it to one value per gazetteer
+# entry however people spell their ward or street. 'Unknown' is spelled out
+# in the SQL below.
+UNKNOWN_DISTRICT = "Unknown"
+
+# Descriptions are indexed with FTS5 as an external-content table over
+# complaints, and facet counts are kept in a small cube (one row per
+# category/status/district/month combination). Triggers on complaints and
+# complaint_routes keep both in step with every write, so nothing is ever
+# re-scanned.
+SEARCH_SCHEMA = """
+CREATE VIRTUAL TABLE IF NOT EXISTS complaints_fts USING fts5(
+    description, content='complaints', content_rowid='rowid', tokenize='porter unicode61'
+);
+CREATE TABLE IF NOT EXISTS complaint_facets (
+    category TEXT NOT NULL,
+    status TEXT NOT NULL,
+    district TEXT NOT NULL,
+    month TEXT NOT NULL,
+    count INTEGER NOT NULL,
+    PRIMARY KEY (category, status, district, month)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS idx_complaints_created ON complaints (created_at);
+CREATE INDEX IF NOT EXISTS idx_routes_place ON complaint_routes (state, district);
+
+CREATE TRIGGER IF NOT EXISTS complaints_fts_insert AFTER INSERT ON complaints BEGIN
+    INSERT INTO complaints_fts (rowid, description) VALUES (NEW.rowid, NEW.description);
+END;
+CREATE TRIGGER IF NOT EXISTS complaints_fts_delete AFTER DELETE ON complaints BEGIN
+    INSERT INTO complaints_fts (complaints_fts, rowid, description) VALUES ('delete', OLD.rowid, OLD.description);
+END;
+CREATE TRIGGER IF NOT EXISTS complaints_fts_update AFTER UPDATE OF description ON complaints BEGIN
+    INSERT INTO complaints_fts (complaints_fts, rowid, description) VALUES ('delete', OLD.rowid, OLD.description);
+    INSERT INTO complaints_fts (rowid, description) VALUES (NEW.rowid, NEW.description);
+END;
+
+CREATE TRIGGER IF NOT EXISTS complaints_facets_insert AFTER INSERT ON complaints BEGIN
+    INSERT INTO complaint_facets VALUES (
+        NEW.category, NEW.status,
+        COALESCE((SELECT COALESCE(district || ', ' || state, state) FROM complaint_routes WHERE complaint_id = NEW.id), 'Unknown'),
+        strftime('%Y-%m', NEW.created_at, 'unixepoch'), 1
+    ) ON CONFLICT (category, status, district, month) DO UPDATE SET count = count + 1;
+END;
+CREATE TRIGGER IF NOT EXISTS complaints_facets_delete AFTER DELETE ON complaints BEGIN
+    UPDATE complaint_facets SET count = count - 1
+    WHERE category = OLD.category AND status = OLD.status AND month = strftime('%Y-%m', OLD.created_at, 'unixepoch')
+      AND district = COALESCE(
+          (SELECT COALESCE(district || ', ' || state, state) FROM complaint_routes WHERE complaint_id = OLD.id), 'Unknown'
+      );
+END;
+CREATE TRIGGER IF NOT EXISTS complaints_facets_update AFTER UPDATE OF category, status, created_at ON complaints BEGIN
+    UPDATE complaint_facets SET count = count - 1
+    WHERE category = OLD.category AND status = OLD.status AND month = strftime('%Y-%m', OLD.created_at, 'unixepoch')
+      AND district = COALESCE(
+          (SELECT COALESCE(district || ', ' || state, state) FROM complaint_routes WHERE complaint_id = OLD.id), 'Unknown'
+      );
+    INSERT INTO complaint_facets VALUES (
+        NEW.category, NEW.status,
+        COALESCE((SELECT COALESCE(district || ', ' || state, state) FROM complaint_routes WHERE complaint_id = NEW.id), 'Unknown'),
+        strftime('%Y-%m', NEW.created_at, 'unixepoch'), 1
+    ) ON CONFLICT (category, status, district, month) DO UPDATE SET count = count + 1;
+END;
+
+-- Complaints are routed just after they are stored, and routes are written
+-- with INSERT OR REPLACE, so a route moves its complaint out of the cell it
+-- was counted in (usually 'Unknown') and into its district's
+CREATE TRIGGER IF NOT EXISTS routes_facets_replace BEFORE INSERT ON complaint_routes BEGIN
+    UPDATE complaint_facets SET count = count - 1
+    WHERE (category, status, district, month) IN (
+        SELECT c.category, c.status, COALESCE(r.district || ', ' || r.state, r.state, 'Unknown'),
+               strftime('%Y-%m', c.created_at, 'unixepoch')
+        FROM complaints c LEFT JOIN complaint_routes r ON r.complaint_id = c.id
+        WHERE c.id = NEW.complaint_id
+    );
+END;
+CREATE TRIGGER IF NOT EXISTS routes_facets_insert AFTER INSERT ON complaint_routes BEGIN
+    INSERT INTO complaint_facets
+    SELECT category, status, COALESCE(NEW.district || ', ' || NEW.state, NEW.state, 'Unknown'),
+           strftime('%Y-%m', created_at, 'unixepoch'), 1
+    FROM complaints WHERE id = NEW.complaint_id
+    ON CONFLICT (category, status, district, month) DO UPDATE SET count = count + 1;
+END;
+"""
+
+# The facet value for a complaint c with its route r left-joined
+DISTRICT_SQL = "COALESCE(r.district || ', ' || r.state, r.state, 'Unknown')"
+
+TOKEN_RE = re.compile(r"\w+")
+
+# Facet counts for a text query are taken over at most this many of the newest
+# matches and scaled up, so a very common word costs the same as a rare one.
+FACET_SAMPLE = 5000
+
+
+def fts_query(text):
+    # Every word must match (after stemming); words are quoted so user input
+    # is never parsed as FTS5 query syntax
+    tokens = TOKEN_RE.findall(text.lower())
+    if not tokens:
+        return None
+    return " ".join(f'"{token}"' for token in tokens)
+
+
+def month_range(month):
+    # 'YYYY-MM' -> [start, end) in epoch seconds (UTC, as the cube buckets them)
+    year, number = (int(part) for part in month.split("-"))
+    start = calendar.timegm((year, number, 1, 0, 0, 0))
+    end = calendar.timegm((year + number // 12, number % 12 + 1, 1, 0, 0, 0))
+    return start, end
+
+
+class ComplaintSearch:
+    """Full-text and faceted search over every complaint, for authorities and NGOs.
+
+    Filters are exact facet values: category, status, district (as listed in
+    the facet counts) and month ('YYYY-MM'). Without text, totals and facet
+    counts are summed from the cube; with text they are exact up to
+    FACET_SAMPLE matches and estimated beyond that.
+    """
+
+    def __init__(self, db):
+        self.db = db
+        for schema in (COMPLAINTS_SCHEMA, ROUTES_SCHEMA, SEARCH_SCHEMA):
+            self.db.executescript(schema)
+        conn = self.db.connection()
+        if conn.execute("SELECT NOT EXISTS (SELECT 1 FROM complaint_facets)").fetchone()[0] and \
+                conn.execute("SELECT EXISTS (SELECT 1 FROM complaints)").fetchone()[0]:
+            self.rebuild()
+
+    def rebuild(self):
+        # For complaints stored before the index existed
+        with self.db.transaction() as conn:
+            conn.execute("INSERT INTO complaints_fts (complaints_fts) VALUES ('rebuild')")
+            conn.execute("DELETE FROM complaint_facets")
+            conn.execute(
+                "INSERT INTO complaint_facets"
+                f" SELECT c.category, c.status, {DISTRICT_SQL}, strftime('%Y-%m', c.created_at, 'unixepoch'), COUNT(*)"
+                " FROM complaints c LEFT JOIN complaint_routes r ON r.complaint_id = c.id GROUP BY 1, 2, 3, 4"
+            )
+
+    def _filters(self, filters):
+        clauses, params = [], []
+        for facet, value in (filters or {}).items():
+            if not value:
+                continue
+            if facet == 'month':
+                clauses.append("c.created_at >= ? AND c.created_at < ?")
+                params.extend(month_range(value))
+            elif facet == 'district':
+                if value == UNKNOWN_DISTRICT:
+                    clauses.append(
+                        "NOT EXISTS (SELECT 1 FROM complaint_routes r WHERE r.complaint_id = c.id AND r.state IS NOT NULL)"
+                    )
+                    continue
+                district, _, state = value.rpartition(", ")
+                if district:
+                    clauses.append("c.id IN (SELECT complaint_id FROM complaint_routes WHERE state = ? AND district = ?)")
+                    params.extend((state, district))
+                else:
+                    clauses.append("c.id IN (SELECT complaint_id FROM complaint_routes WHERE state = ? AND district IS NULL)")
+                    params.append(state)
+            elif facet in FACETS:
+                clauses.append(f"c.{facet} = ?")
+                params.append(value)
+            else:
+                raise ValueError(f"Unknown facet: {facet}")
+        return clauses, params
+
+    def _cube_counts(self, filters, top):
+        # One aggregate per facet over the cube. Its size is bounded by the
+        # gazetteer, categories and months, not by the number of complaints.
+        clauses, params = [], []
+        for facet, value in (filters or {}).items():
+            if not value:
+                continue
+            if facet not in FACETS:
+                raise ValueError(f"Unknown facet: {facet}")
+            clauses.append(f"{facet} = ?")
+            params.append(value)
+        where = f" WHERE {' AND '.join(clauses)}" if clauses else ""
+        conn = self.db.connection()
+        total = conn.execute(f"SELECT COALESCE(SUM(count), 0) FROM complaint_facets{where}", params).fetchone()[0]
+        facets = {}
+        for facet in FACETS:
+            order, limit = (f"{facet} DESC", "") if facet == 'month' else (f"2 DESC, {facet}", f" LIMIT {int(top)}")
+            facets[facet] = [tuple(row) for row in conn.execute(
+                f"SELECT {facet}, SUM(count) FROM complaint_facets{where}"
+                f" GROUP BY {facet} HAVING SUM(count) > 0 ORDER BY {order}{limit}",
+                params,
+            )]
+        return total, True, facets
+
+    def _sample_cells(self, query, filters):
+        # (category, status, district, month, count) rows for the newest
+        # FACET_SAMPLE text matches, and the factor to scale them up by
+        conn = self.db.connection()
+        matches = conn.execute(
+            "SELECT COUNT(*) FROM complaints_fts WHERE complaints_fts MATCH ?", (query,)
+        ).fetchone()[0]
+        clauses, params = self._filters(filters)
+        where = "".join(f" AND {clause}" for clause in clauses)
+        rows = conn.execute(
+            f"SELECT c.category, c.status, {DISTRICT_SQL}, strftime('%Y-%m', c.created_at, 'unixepoch'), COUNT(*)"
+            " FROM complaints c LEFT JOIN complaint_routes r ON r.complaint_id = c.id WHERE c.rowid IN ("
+            "  SELECT rowid FROM complaints_fts WHERE complaints_fts MATCH ? ORDER BY rowid DESC LIMIT ?"
+            f"){where} GROUP BY 1, 2, 3, 4",
+            [query, FACET_SAMPLE] + params,
+        ).fetchall()
+        return rows, max(1.0, matches / FACET_SAMPLE)
+
+    def facet_counts(self, text=None, filters=None, top=20):
+        # Returns (total, exact, {facet: [(value, count), ...]})
+        query = fts_query(text) if text else None
+        if query is None:
+            return self._cube_counts(filters, top)
+        rows, scale = self._sample_cells(query, filters)
+        counts = {facet: {} for facet in FACETS}
+        total = 0
+        for *values, count in rows:
+            total += count
+            for facet, value in zip(FACETS, values):
+                counts[facet][value] = counts[facet].get(value, 0) + count
+        facets = {}
+        for facet, by_value in counts.items():
+            ordered = sorted(((value, round(count * scale)) for value, count in by_value.items()),
+                             key=lambda item: (-item[1], item[0]))
+            facets[facet] = ordered if facet == 'month' else ordered[:top]
+        facets['month'].sort(reverse=True)
+        return round(total * scale), scale == 1.0, facets
+
+    def search(self, text=None, filters=None, limit=20, offset=0):
+        # Returns {'total', 'exact', 'results', 'facets'}, results newest first
+        total, exact, facets = self.facet_counts(text, filters)
+        query = fts_query(text) if text else None
+        clauses, params = self._filters(filters)
+        if query is None:
+            where = f" WHERE {' AND '.join(clauses)}" if clauses else ""
+            sql = f"SELECT c.* FROM complaints c{where} ORDER BY c.created_at DESC LIMIT ? OFFSET ?"
+        else:
+            where = "".join(f" AND {clause}" for clause in clauses)
+            sql = (
+                "SELECT c.* FROM complaints_fts f JOIN complaints c ON c.rowid = f.rowid"
+                f" WHERE complaints_fts MATCH ?{where} ORDER BY f.rowid DESC LIMIT ? OFFSET ?"
+            )
+            params = [query] + params
+        rows = self.db.connection().execute(sql, params + [limit, offset]).fetchall()
+        return {'total': total, 'exact': exact, 'results': [row_to_complaint(row) for row in rows], 'facets': facets}
@@ -0,0 +1,114 @@
+import threading
+import time
+from collections import deque
+
+from simplilaw.cache import TTLCache
+
+
+class ChatMessage:
+    __slots__ = ('id', 'role', 'content')
+
+    def __init__(self, id, role, content):
+        self.id = id
+        self.role = role
+        self.content = content
+
+
+class ChatWindow:
+    """The most recent messages of one conversation, as far back as the user has paged."""
+
+    __slots__ = ('messages', 'last_seen')
+
+    def __init__(self, messages, limit):
+        self.messages = deque(messages, maxlen=limit)
+        self.last_seen = time.monotonic()
+
+
+class SessionStore:
+    """Process-wide home for per-session data that st.session_state only holds handles to.
+
+    A session keeps its user's email and its conversation id; the user record
+    and a bounded window of the conversation are shared here, loaded from the
+    database on first use and dropped again once the session has been idle for
+    idle_timeout seconds.
+    """
+
+    def __init__(self, chat_store, user_store, window=20, max_window=200,
+                 idle_timeout=30 * 60, interval=60):
+        self.chats = chat_store
+        self.users = user_store
+        self.window = window
+        self.max_window = max_window
+        self.idle_timeout = idle_timeout
+        self._users = TTLCache(maxsize=10000, ttl=5 * 60)
+        self._windows = {}
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._evict_loop, args=(interval,), name="session-evictor", daemon=True)
+        self._thread.start()
+
+    def user(self, email):
+        if not email:
+            return None
+        return self._users.get_or_compute(email, lambda: self.users.get(email))
+
+    def chat(self, conversation_id):
+        with self._lock:
+            window = self._windows.get(conversation_id)
+        if window is None:
+            messages = [ChatMessage(**m) for m in self.chats.recent(conversation_id, self.window)]
+            window = ChatWindow(messages, self.window)
+            with self._lock:
+                window = self._windows.setdefault(conversation_id, window)
+        window.last_seen = time.monotonic()
+        return window
+
+    def append(self, conversation_id, role, content):
+        stored = self.chats.append(conversation_id, role, content)
+        message = ChatMessage(**stored)
+        self.chat(conversation_id).messages.append(message)
+        return message
+
+    def refresh(self, conversation_id):
+        # Picks up messages another worker added to this conversation since
+        # the window was loaded here; one indexed range query
+        window = self.chat(conversation_id)
+        last_id = window.messages[-1].id if window.messages else 0
+        newer = self.chats.after(conversation_id, last_id, window.messages.maxlen)
+        window.messages.extend(ChatMessage(**m) for m in newer)
+
+    def has_earlier(self, conversation_id):
+        messages = self.chat(conversation_id).messages
+        return bool(messages) and len(messages) < self.max_window and self.chats.has_before(
+            conversation_id, messages[0].id
+        )
+
+    def load_earlier(self, conversation_id):
+        # Grows the window by one page of older messages, up to max_window
+        window = self.chat(conversation_id)
+        if not window.messages:
+            return
+        limit = min(window.messages.maxlen + self.window, self.max_window)
+        older = self.chats.recent(conversation_id, limit - len(window.messages), before_id=window.messages[0].id)
+        window.messages = deque(
+            [ChatMessage(**m) for m in older] + list(window.messages), maxlen=limit
+        )
+
+    def evict_idle(self, now=None):
+        cutoff = (now or time.monotonic()) - self.idle_timeout
+        with self._lock:
+            idle = [key for key, window in self._windows.items() if window.last_seen < cutoff]
+            for key in idle:
+                del self._windows[key]
+        return len(idle)
+
+    def __len__(self):
+        return len(self._windows)
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+
+    def _evict_loop(self, interval):
+        while not self._stop.wait(interval):
+            self.evict_idle()
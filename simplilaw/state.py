@@ -0,0 +1,203 @@
+import hashlib
+import json
+import os
+import tempfile
+import time
+
+from simplilaw.cache import TTLCache
+
+# Users, complaints and chat history are rows in the SQLite database every
+# worker opens (SIMPLILAW_DB). What used to live only in one worker's memory,
+# session handles and caches, goes through a StateBackend: a table in that
+# same database by default, or one JSON file per key under SIMPLILAW_STATE_DIR.
+STATE_DIR = os.environ.get("SIMPLILAW_STATE_DIR")
+
+STATE_SCHEMA = """
+CREATE TABLE IF NOT EXISTS shared_state (
+    namespace TEXT NOT NULL,
+    key TEXT NOT NULL,
+    value TEXT NOT NULL,
+    expires_at REAL,
+    PRIMARY KEY (namespace, key)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS idx_shared_state_expiry ON shared_state (expires_at);
+"""
+
+_MISSING = object()
+
+
+class SQLiteStateBackend:
+    """JSON values by (namespace, key) in a table of the shared database.
+
+    Backends only need get/set/delete/prune, so anything that can store a
+    string with an expiry time can take this one's place.
+    """
+
+    def __init__(self, db, prune_every=1000):
+        self.db = db
+        self.prune_every = prune_every
+        self._writes = 0
+        self.db.executescript(STATE_SCHEMA)
+
+    def get(self, namespace, key, default=None):
+        row = self.db.connection().execute(
+            "SELECT value FROM shared_state WHERE namespace = ? AND key = ?"
+            " AND (expires_at IS NULL OR expires_at > ?)",
+            (namespace, key, time.time()),
+        ).fetchone()
+        return json.loads(row[0]) if row else default
+
+    def set(self, namespace, key, value, ttl=None):
+        expires_at = time.time() + ttl if ttl is not None else None
+        with self.db.transaction() as conn:
+            conn.execute(
+                "INSERT INTO shared_state (namespace, key, value, expires_at) VALUES (?, ?, ?, ?)"
+                " ON CONFLICT (namespace, key) DO UPDATE SET value = excluded.value, expires_at = excluded.expires_at",
+                (namespace, key, json.dumps(value), expires_at),
+            )
+        self._writes += 1
+        if self._writes % self.prune_every == 0:
+            self.prune()
+
+    def delete(self, namespace, key):
+        with self.db.transaction() as conn:
+            conn.execute("DELETE FROM shared_state WHERE namespace = ? AND key = ?", (namespace, key))
+
+    def prune(self):
+        with self.db.transaction() as conn:
+            return conn.execute("DELETE FROM shared_state WHERE expires_at <= ?", (time.time(),)).rowcount
+
+
+class FileStateBackend:
+    """JSON values as one file per key, for workers that share a directory.
+
+    Writes go to a temporary file that is renamed over the old one, so a
+    reader in another process sees either the old value or the new one.
+    """
+
+    def __init__(self, directory, prune_every=1000):
+        self.directory = directory
+        self.prune_every = prune_every
+        self._writes = 0
+        os.makedirs(directory, exist_ok=True)
+
+    def _path(self, namespace, key):
+        digest = hashlib.sha256(str(key).encode("utf-8")).hexdigest()
+        return os.path.join(self.directory, namespace, digest[:2], digest + ".json")
+
+    def get(self, namespace, key, default=None):
+        try:
+            with open(self._path(namespace, key), encoding="utf-8") as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            return default
+        if entry['expires_at'] is not None and entry['expires_at'] <= time.time():
+            return default
+        return entry['value']
+
+    def set(self, namespace, key, value, ttl=None):
+        path = self._path(namespace, key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        entry = {'value': value, 'expires_at': time.time() + ttl if ttl is not None else None}
+        # A temp file of its own per write: sessions run on threads, so two of
+        # them may be writing the same key in one process
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(entry, f)
+            os.replace(tmp_path, path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+        self._writes += 1
+        if self._writes % self.prune_every == 0:
+            self.prune()
+
+    def delete(self, namespace, key):
+        try:
+            os.remove(self._path(namespace, key))
+        except FileNotFoundError:
+            pass
+
+    def prune(self):
+        removed = 0
+        now = time.time()
+        for root, _, files in os.walk(self.directory):
+            for name in files:
+                path = os.path.join(root, name)
+                try:
+                    with open(path, encoding="utf-8") as f:
+                        expires_at = json.load(f)['expires_at']
+                    if expires_at is not None and expires_at <= now:
+                        os.remove(path)
+                        removed += 1
+                except (OSError, ValueError, KeyError):
+                    pass  # being replaced by another process, or a stray temp file
+        return removed
+
+
+def state_backend(db, directory=STATE_DIR):
+    if directory:
+        return FileStateBackend(directory)
+    return SQLiteStateBackend(db)
+
+
+class SharedCache:
+    """A per-process TTLCache in front of the shared backend.
+
+    Hits are served from memory; a local miss looks in the backend before
+    computing, so a value computed by any worker is reused by all of them.
+    Values must be JSON-serializable.
+    """
+
+    def __init__(self, backend, namespace, maxsize=1024, ttl=3600):
+        self.backend = backend
+        self.namespace = namespace
+        self.ttl = ttl
+        self.local = TTLCache(maxsize=maxsize, ttl=ttl)
+        self.shared_hits = 0
+
+    def get_or_compute(self, key, compute):
+        value = self.local.get(key, _MISSING)
+        if value is _MISSING:
+            value = self.backend.get(self.namespace, key, _MISSING)
+            if value is _MISSING:
+                value = compute()
+                self.backend.set(self.namespace, key, value, ttl=self.ttl)
+            else:
+                self.shared_hits += 1
+            self.local.set(key, value)
+        return value
+
+    def clear(self):
+        self.local.clear()
+
+    def __len__(self):
+        return len(self.local)
+
+    def stats(self):
+        return dict(self.local.stats(), shared_hits=self.shared_hits)
+
+
+class UserSessions:
+    """The small handles a logged-in user's session keeps, saved per account.
+
+    Streamlit's session state lives in the memory of whichever worker holds
+    the connection. A browser that reconnects to another worker logs in again
+    there, and these handles let it pick up the same conversation. They are
+    only read after a successful login, never looked up from anything the
+    browser sends, so a copied page URL carries no access.
+    """
+
+    NAMESPACE = "user_session"
+
+    def __init__(self, backend, ttl=30 * 24 * 3600):
+        self.backend = backend
+        self.ttl = ttl
+
+    def load(self, email):
+        return self.backend.get(self.NAMESPACE, email) if email else None
+
+    def save(self, email, handles):
+        self.backend.set(self.NAMESPACE, email, handles, ttl=self.ttl)
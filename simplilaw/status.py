@@ -0,0 +1,209 @@
+import queue
+import sys
+import threading
+import time
+import weakref
+
+STATUSES = ('Submitted', 'Under Review', 'Action Taken', 'Resolved')
+
+EVENTS_SCHEMA = """
+CREATE TABLE IF NOT EXISTS complaint_events (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    complaint_id TEXT NOT NULL,
+    status TEXT NOT NULL,
+    actor TEXT NOT NULL,
+    note TEXT NOT NULL DEFAULT '',
+    created_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_events_complaint ON complaint_events (complaint_id, id);
+"""
+
+# SQLite caps the number of bound parameters per statement
+BATCH_SIZE = 500
+
+
+class Subscription:
+    """One open session's inbox of status events."""
+
+    def __init__(self, maxsize=100):
+        self._events = queue.Queue(maxsize)
+
+    def put(self, event):
+        try:
+            self._events.put_nowait(event)
+        except queue.Full:
+            pass  # The session is not reading; it will see the latest status on its next rerun
+
+    def drain(self):
+        events = []
+        while True:
+            try:
+                events.append(self._events.get_nowait())
+            except queue.Empty:
+                return events
+
+
+class StatusBroker:
+    """Publishes status events from the shared log to subscribed sessions.
+
+    A single background thread per process tails the event log, so events
+    written by any process reach every open session without each session
+    polling the database. Subscriptions are held weakly and disappear with
+    their session.
+    """
+
+    def __init__(self, db, interval=0.5):
+        self.db = db
+        self.interval = interval
+        self.db.executescript(EVENTS_SCHEMA)
+        self._subscribers = {}
+        self._lock = threading.Lock()
+        self._last_id = self.db.connection().execute(
+            "SELECT COALESCE(MAX(id), 0) FROM complaint_events"
+        ).fetchone()[0]
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._follow, name="status-broker", daemon=True)
+        self._thread.start()
+
+    def subscribe(self, user_email):
+        subscription = Subscription()
+        with self._lock:
+            self._subscribers.setdefault(user_email, weakref.WeakSet()).add(subscription)
+        return subscription
+
+    def publish(self, user_email, event):
+        with self._lock:
+            subscribers = list(self._subscribers.get(user_email, ()))
+        for subscription in subscribers:
+            subscription.put(event)
+
+    def poll(self):
+        # The citizen who filed a complaint already saw it confirmed, so
+        # 'Submitted' events only move the cursor; publishing them would
+        # toast and rerun the filing session for nothing.
+        rows = self.db.connection().execute(
+            "SELECT e.id, e.complaint_id, e.status, e.note, e.created_at, c.user_email"
+            " FROM complaint_events e JOIN complaints c ON c.id = e.complaint_id"
+            " WHERE e.id > ? ORDER BY e.id LIMIT 5000",
+            (self._last_id,),
+        ).fetchall()
+        for row in rows:
+            if row['status'] != 'Submitted':
+                self.publish(row['user_email'], dict(row))
+            self._last_id = row['id']
+        return len(rows)
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+
+    def _follow(self):
+        while not self._stop.wait(self.interval):
+            try:
+                self.poll()
+            except Exception:
+                pass  # e.g. the database is briefly locked; try again next tick
+
+
+class StatusTracker:
+    """Moves complaints through STATUSES, appending every change to the event log."""
+
+    def __init__(self, db):
+        self.db = db
+        self.db.executescript(EVENTS_SCHEMA)
+
+    def submitted(self, complaint_id, actor="citizen"):
+        self.submitted_many([complaint_id], actor)
+
+    def submitted_many(self, complaint_ids, actor="citizen"):
+        now = time.time()
+        with self.db.transaction() as conn:
+            conn.executemany(
+                "INSERT INTO complaint_events (complaint_id, status, actor, created_at) VALUES (?, 'Submitted', ?, ?)",
+                [(complaint_id, actor, now) for complaint_id in complaint_ids],
+            )
+
+    def transition(self, complaint_id, status, actor, note=""):
+        return complaint_id in self.bulk_transition([complaint_id], status, actor, note)
+
+    def bulk_transition(self, complaint_ids, status, actor, note=""):
+        # Moves every listed complaint that is behind `status` forward to it, in a
+        # single transaction, and returns the ids that changed.
+        if status not in STATUSES:
+            raise ValueError(f"Unknown status: {status}")
+        earlier = STATUSES[:STATUSES.index(status)]
+        complaint_ids = list(complaint_ids)
+        changed = []
+        now = time.time()
+        with self.db.transaction() as conn:
+            for start in range(0, len(complaint_ids), BATCH_SIZE):
+                batch = complaint_ids[start:start + BATCH_SIZE]
+                # "+status" keeps SQLite on the primary key; given a long id
+                # list it otherwise walks every complaint with an earlier status
+                rows = conn.execute(
+                    f"UPDATE complaints SET status = ? WHERE id IN ({','.join('?' * len(batch))})"
+                    f" AND +status IN ({','.join('?' * len(earlier))}) RETURNING id",
+                    [status] + batch + list(earlier),
+                ).fetchall()
+                changed.extend(row[0] for row in rows)
+            conn.executemany(
+                "INSERT INTO complaint_events (complaint_id, status, actor, note, created_at) VALUES (?, ?, ?, ?, ?)",
+                [(complaint_id, status, actor, note, now) for complaint_id in changed],
+            )
+        return changed
+
+    def history(self, complaint_id):
+        rows = self.db.connection().execute(
+            "SELECT status, actor, note, created_at FROM complaint_events WHERE complaint_id = ? ORDER BY id",
+            (complaint_id,),
+        ).fetchall()
+        return [dict(row) for row in rows]
+
+
+def main(argv=None):
+    # python -m simplilaw.status move "Under Review" SL20260001 SL20260002 --actor "Collector, Warangal"
+    # python -m simplilaw.status move Resolved --file resolved.txt --with-duplicates --actor "Ward office"
+    # python -m simplilaw.status history SL20260001
+    import argparse
+
+    from simplilaw.storage import Database
+
+    parser = argparse.ArgumentParser(description="Move complaints through their statuses or show their history.")
+    commands = parser.add_subparsers(dest="command", required=True)
+    move = commands.add_parser("move", help="move complaints forward to a status")
+    move.add_argument("status", choices=STATUSES)
+    move.add_argument("ids", nargs="*", help="complaint ids")
+    move.add_argument("--file", help="read further ids from this file, one per line ('-' for stdin)")
+    move.add_argument("--with-duplicates", action="store_true", help="also move complaints linked to each id")
+    move.add_argument("--actor", required=True, help="who made the change, shown to citizens")
+    move.add_argument("--note", default="")
+    history = commands.add_parser("history", help="print a complaint's status events")
+    history.add_argument("id")
+    args = parser.parse_args(argv)
+
+    db = Database()
+    tracker = StatusTracker(db)
+    if args.command == "history":
+        for event in tracker.history(args.id):
+            when = time.strftime("%Y-%m-%d %H:%M", time.localtime(event['created_at']))
+            print(f"{when}  {event['status']:<13} {event['actor']}" + (f" - {event['note']}" if event['note'] else ""))
+        return
+
+    complaint_ids = list(args.ids)
+    if args.file:
+        with (sys.stdin if args.file == "-" else open(args.file, encoding="utf-8")) as f:
+            complaint_ids.extend(line.strip() for line in f if line.strip())
+    if args.with_duplicates:
+        from simplilaw.dedup import DuplicateDetector
+
+        detector = DuplicateDetector(db)
+        complaint_ids = [linked for complaint_id in complaint_ids for linked in detector.cluster(complaint_id)]
+    complaint_ids = list(dict.fromkeys(complaint_ids))
+    start = time.perf_counter()
+    changed = tracker.bulk_transition(complaint_ids, args.status, args.actor, args.note)
+    print(f"moved {len(changed)} of {len(complaint_ids)} complaints to {args.status}"
+          f" in {time.perf_counter() - start:.1f}s", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,166 @@
+import os
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+
+DEFAULT_DB_PATH = os.environ.get("SIMPLILAW_DB", "simplilaw.db")
+
+COMPLAINT_FIELDS = (
+    'id', 'name', 'phone', 'category', 'location',
+    'description', 'status', 'date', 'user_email'
+)
+
+COMPLAINTS_SCHEMA = """
+CREATE TABLE IF NOT EXISTS complaints (
+    id TEXT PRIMARY KEY,
+    name TEXT NOT NULL,
+    phone TEXT NOT NULL,
+    category TEXT NOT NULL,
+    location TEXT NOT NULL,
+    description TEXT NOT NULL,
+    status TEXT NOT NULL,
+    date TEXT NOT NULL,
+    user_email TEXT NOT NULL,
+    created_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_complaints_user ON complaints (user_email, created_at);
+CREATE INDEX IF NOT EXISTS idx_complaints_user_status ON complaints (user_email, status, created_at);
+CREATE INDEX IF NOT EXISTS idx_complaints_status ON complaints (status);
+CREATE INDEX IF NOT EXISTS idx_complaints_category ON complaints (category);
+CREATE INDEX IF NOT EXISTS idx_complaints_location ON complaints (location);
+"""
+
+
+class Database:
+    """SQLite database in WAL mode, shared by every session and worker on a node."""
+
+    def __init__(self, path=DEFAULT_DB_PATH):
+        self.path = path
+        self._local = threading.local()
+
+    def connection(self):
+        # One connection per thread; WAL lets readers run alongside a writer,
+        # including writers in other processes.
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute("PRAGMA busy_timeout=30000")
+            self._local.conn = conn
+        return conn
+
+    def executescript(self, script):
+        self.connection().executescript(script)
+
+    @contextmanager
+    def transaction(self):
+        # BEGIN IMMEDIATE takes the write lock up front so concurrent writers
+        # wait on busy_timeout instead of failing halfway through.
+        conn = self.connection()
+        if conn.in_transaction:
+            # Nested use joins the enclosing transaction
+            yield conn
+            return
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            yield conn
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        else:
+            conn.execute("COMMIT")
+
+
+def row_to_complaint(row):
+    return {field: row[field] for field in COMPLAINT_FIELDS}
+
+
+class ComplaintStore:
+    """Complaint repository indexed by user email, id, status, category and location."""
+
+    def __init__(self, db):
+        self.db = db
+        self.db.executescript(COMPLAINTS_SCHEMA)
+
+    def add(self, complaint):
+        with self.db.transaction() as conn:
+            self._insert(conn, complaint)
+        return complaint
+
+    def add_many(self, complaints):
+        # Bulk insert in one transaction (or the caller's)
+        now = time.time()
+        with self.db.transaction() as conn:
+            conn.executemany(
+                "INSERT INTO complaints (id, name, phone, category, location, description,"
+                " status, date, user_email, created_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                [[complaint[field] for field in COMPLAINT_FIELDS] + [now] for complaint in complaints],
+            )
+        return complaints
+
+    def _insert(self, conn, complaint):
+        conn.execute(
+            "INSERT INTO complaints (id, name, phone, category, location, description,"
+            " status, date, user_email, created_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            [complaint[field] for field in COMPLAINT_FIELDS] + [time.time()],
+        )
+
+    def get(self, complaint_id):
+        row = self.db.connection().execute(
+            "SELECT * FROM complaints WHERE id = ?", (complaint_id,)
+        ).fetchone()
+        return row_to_complaint(row) if row else None
+
+    def for_user(self, user_email):
+        rows = self.db.connection().execute(
+            "SELECT * FROM complaints WHERE user_email = ? ORDER BY created_at",
+            (user_email,),
+        ).fetchall()
+        return [row_to_complaint(row) for row in rows]
+
+    def _user_filters(self, user_email, status, category, since):
+        clauses, params = ["user_email = ?"], [user_email]
+        if status:
+            clauses.append("status = ?")
+            params.append(status)
+        if category:
+            clauses.append("category = ?")
+            params.append(category)
+        if since is not None:
+            clauses.append("created_at >= ?")
+            params.append(since)
+        return " AND ".join(clauses), params
+
+    def page_for_user(self, user_email, status=None, category=None, since=None,
+                      newest_first=True, limit=10, offset=0):
+        where, params = self._user_filters(user_email, status, category, since)
+        order = "DESC" if newest_first else "ASC"
+        rows = self.db.connection().execute(
+            f"SELECT * FROM complaints WHERE {where} ORDER BY created_at {order} LIMIT ? OFFSET ?",
+            params + [limit, offset],
+        ).fetchall()
+        return [row_to_complaint(row) for row in rows]
+
+    def count_for_user(self, user_email, status=None, category=None, since=None):
+        where, params = self._user_filters(user_email, status, category, since)
+        return self.db.connection().execute(
+            f"SELECT COUNT(*) FROM complaints WHERE {where}", params
+        ).fetchone()[0]
+
+    def find(self, status=None, category=None, location=None):
+        clauses, params = [], []
+        for column, value in (('status', status), ('category', category), ('location', location)):
+            if value is not None:
+                clauses.append(f"{column} = ?")
+                params.append(value)
+        where = f" WHERE {' AND '.join(clauses)}" if clauses else ""
+        rows = self.db.connection().execute(
+            f"SELECT * FROM complaints{where} ORDER BY created_at", params
+        ).fetchall()
+        return [row_to_complaint(row) for row in rows]
+
+    def count(self):
+        return self.db.connection().execute("SELECT COUNT(*) FROM complaints").fetchone()[0]
@@ -0,0 +1,311 @@
+import gzip
+import json
+import os
+import sys
+import time
+from datetime import datetime
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = pq = None
+
+from simplilaw.ids import ID_SEQUENCES_SCHEMA, ComplaintIdAllocator, advance_sequences
+from simplilaw.routing import Router, RouteStore
+from simplilaw.status import STATUSES
+from simplilaw.storage import COMPLAINT_FIELDS, COMPLAINTS_SCHEMA, Database
+
+# Bulk export and import of complaints as JSON Lines (optionally gzipped),
+# Parquet or Arrow IPC files. Everything moves in batches of BATCH_SIZE rows,
+# so memory use is the same for a thousand complaints or ten million.
+BATCH_SIZE = 10000
+DATE_FORMAT = '%B %d, %Y'
+FORMATS = {'.jsonl': 'jsonl', '.jsonl.gz': 'jsonl', '.parquet': 'parquet', '.arrow': 'arrow'}
+# Name and phone may be blank; everything else must be present
+REQUIRED = [COMPLAINT_FIELDS.index(field) for field in COMPLAINT_FIELDS if field not in ('name', 'phone')]
+STATUS = COMPLAINT_FIELDS.index('status')
+DATE = COMPLAINT_FIELDS.index('date')
+
+# Complaints imported from another system get ids from our own sequence; the
+# id they had there is kept here, so importing the same file again finds them.
+IMPORTS_SCHEMA = """
+CREATE TABLE IF NOT EXISTS imported_complaints (
+    source TEXT NOT NULL,
+    source_id TEXT NOT NULL,
+    complaint_id TEXT NOT NULL,
+    imported_at REAL NOT NULL,
+    PRIMARY KEY (source, source_id)
+) WITHOUT ROWID;
+"""
+
+
+def file_format(path):
+    for suffix, name in FORMATS.items():
+        if path.lower().endswith(suffix):
+            return name
+    raise ValueError(f"Unknown file format: {path} (use {', '.join(FORMATS)})")
+
+
+def _require_pyarrow():
+    if pa is None:
+        raise RuntimeError("Parquet and Arrow files need pyarrow: pip install pyarrow")
+
+
+def _arrow_schema():
+    return pa.schema([(field, pa.string()) for field in COMPLAINT_FIELDS])
+
+
+def _record_batch(rows):
+    columns = zip(*rows)
+    return pa.RecordBatch.from_arrays([pa.array(column, pa.string()) for column in columns], schema=_arrow_schema())
+
+
+def _rows_from_arrow(record_batch):
+    return list(zip(*(record_batch.column(field).to_pylist() for field in COMPLAINT_FIELDS)))
+
+
+def export_batches(db, batch_size=BATCH_SIZE, since=None):
+    # Yields lists of complaint tuples in COMPLAINT_FIELDS order, oldest first.
+    # Pages by rowid, so each batch is one short read and no read transaction
+    # stays open for the length of the export.
+    conn = db.connection()
+    columns = ", ".join(COMPLAINT_FIELDS)
+    where, params = ("AND created_at >= ?", [since]) if since is not None else ("", [])
+    last_rowid = 0
+    while True:
+        rows = conn.execute(
+            f"SELECT rowid, {columns} FROM complaints WHERE rowid > ? {where} ORDER BY rowid LIMIT ?",
+            [last_rowid] + params + [batch_size],
+        ).fetchall()
+        if not rows:
+            return
+        last_rowid = rows[-1][0]
+        yield [tuple(row)[1:] for row in rows]
+
+
+def write_jsonl(batches, path):
+    count = 0
+    if path.lower().endswith(".gz"):
+        out = gzip.open(path, "wt", encoding="utf-8", compresslevel=6)  # 9 is 2.5x slower for ~5% smaller files
+    else:
+        out = open(path, "w", encoding="utf-8")
+    with out:
+        for batch in batches:
+            out.write("".join(
+                json.dumps(dict(zip(COMPLAINT_FIELDS, row)), ensure_ascii=False) + "\n" for row in batch
+            ))
+            count += len(batch)
+    return count
+
+
+def write_parquet(batches, path):
+    _require_pyarrow()
+    count = 0
+    with pq.ParquetWriter(path, _arrow_schema(), compression="zstd") as writer:
+        for batch in batches:
+            writer.write_batch(_record_batch(batch))
+            count += len(batch)
+    return count
+
+
+def write_arrow(batches, path):
+    _require_pyarrow()
+    count = 0
+    with pa.OSFile(path, "wb") as sink, pa.ipc.new_file(sink, _arrow_schema()) as writer:
+        for batch in batches:
+            writer.write_batch(_record_batch(batch))
+            count += len(batch)
+    return count
+
+
+def read_jsonl(path, batch_size=BATCH_SIZE):
+    opener = gzip.open if path.lower().endswith(".gz") else open
+    batch = []
+    with opener(path, "rt", encoding="utf-8") as f:
+        for line in f:
+            if not line.strip():
+                continue
+            record = json.loads(line)
+            batch.append(tuple(record.get(field) for field in COMPLAINT_FIELDS))
+            if len(batch) == batch_size:
+                yield batch
+                batch = []
+    if batch:
+        yield batch
+
+
+def read_parquet(path, batch_size=BATCH_SIZE):
+    _require_pyarrow()
+    for record_batch in pq.ParquetFile(path).iter_batches(batch_size=batch_size, columns=list(COMPLAINT_FIELDS)):
+        yield _rows_from_arrow(record_batch)
+
+
+def read_arrow(path, batch_size=BATCH_SIZE):
+    # Read batch by batch through a plain file; a memory map would keep every
+    # page already read resident until the import finishes
+    _require_pyarrow()
+    with pa.OSFile(path, "rb") as source:
+        reader = pa.ipc.open_file(source)
+        for index in range(reader.num_record_batches):
+            record_batch = reader.get_batch(index)
+            for offset in range(0, record_batch.num_rows, batch_size):
+                yield _rows_from_arrow(record_batch.slice(offset, batch_size))
+
+
+WRITERS = {'jsonl': write_jsonl, 'parquet': write_parquet, 'arrow': write_arrow}
+READERS = {'jsonl': read_jsonl, 'parquet': read_parquet, 'arrow': read_arrow}
+
+
+def export_complaints(db, path, since=None, batch_size=BATCH_SIZE):
+    # Written next to the target and renamed into place, so a reader never
+    # sees half a file; returns the number of complaints written
+    writer = WRITERS[file_format(path)]
+    tmp_path = os.path.join(os.path.dirname(path), f".tmp-{os.path.basename(path)}")  # keeps the suffix
+    try:
+        count = writer(export_batches(db, batch_size, since), tmp_path)
+        os.replace(tmp_path, path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+    return count
+
+
+class _FiledAt:
+    # 'March 05, 2025' -> epoch seconds, so imported complaints sort and roll
+    # up by the day they were filed; repeated dates are parsed once
+    def __init__(self):
+        self._cache = {}
+
+    def __call__(self, value, default):
+        if value not in self._cache:
+            try:
+                self._cache[value] = datetime.strptime(value, DATE_FORMAT).timestamp()
+            except ValueError:
+                self._cache[value] = None
+        return self._cache[value] or default
+
+
+def _imported_ids(conn, source, source_ids):
+    return dict(conn.execute(
+        "SELECT source_id, complaint_id FROM imported_complaints"
+        " WHERE source = ? AND source_id IN (SELECT value FROM json_each(?))",
+        (source, json.dumps(source_ids)),
+    ).fetchall())
+
+
+def import_batches(db, batches, update=False, source=None, routes=None):
+    # Inserts each batch in one transaction. Rows missing a required field or
+    # with an unknown status are rejected.
+    #
+    # Without a source, complaints keep their ids (a restore, or a move between
+    # SimpliLaw databases) and the id sequences are advanced past them. An id
+    # that already exists is skipped if the complaint is the same, counted as a
+    # conflict if it is not, or with update=True overwritten field by field.
+    #
+    # With a source (a partner's export), every complaint gets a new id here
+    # and the partner's id is recorded in imported_complaints; re-importing
+    # skips or, with update=True, overwrites the complaints already imported.
+    #
+    # With a RouteStore, new and changed complaints are routed in the same
+    # transaction, so they count under their district like filed ones.
+    #
+    # Returns {'inserted', 'updated', 'skipped', 'conflicts', 'rejected'}.
+    for schema in (COMPLAINTS_SCHEMA, ID_SEQUENCES_SCHEMA, IMPORTS_SCHEMA):
+        db.executescript(schema)
+    allocator = ComplaintIdAllocator(db) if source is not None else None
+    columns = ", ".join(COMPLAINT_FIELDS)
+    if update:
+        changed = " OR ".join(f"complaints.{field} IS NOT excluded.{field}" for field in COMPLAINT_FIELDS[1:])
+        assignments = ", ".join(f"{field} = excluded.{field}" for field in COMPLAINT_FIELDS[1:])
+        conflict = f"DO UPDATE SET {assignments} WHERE {changed}"
+    else:
+        conflict = "DO NOTHING"
+    sql = (f"INSERT INTO complaints ({columns}, created_at) VALUES ({', '.join('?' * (len(COMPLAINT_FIELDS) + 1))})"
+           f" ON CONFLICT (id) {conflict}")
+    filed_at = _FiledAt()
+    totals = {'inserted': 0, 'updated': 0, 'skipped': 0, 'conflicts': 0, 'rejected': 0}
+    for batch in batches:
+        now = time.time()
+        rows = {}
+        for row in batch:
+            if len(row) != len(COMPLAINT_FIELDS) or any(value is None for value in row):
+                totals['rejected'] += 1
+                continue
+            row = tuple(str(value) for value in row)
+            if not all(row[index] for index in REQUIRED) or row[STATUS] not in STATUSES:
+                totals['rejected'] += 1
+                continue
+            rows[row[0]] = row + (filed_at(row[DATE], now),)
+        if source is not None:
+            # New ids are reserved before the transaction (see ComplaintIdAllocator)
+            imported = _imported_ids(db.connection(), source, list(rows))
+            new_ids = {source_id: allocator.next_id() for source_id in rows if source_id not in imported}
+        with db.transaction() as conn:
+            if source is not None:
+                imported = _imported_ids(conn, source, list(rows))
+                fresh = [(source, source_id, new_ids[source_id], now) for source_id in rows if source_id not in imported]
+                conn.executemany("INSERT INTO imported_complaints VALUES (?, ?, ?, ?)", fresh)
+                imported.update((source_id, complaint_id) for _, source_id, complaint_id, _ in fresh)
+                rows = {imported[source_id]: (imported[source_id],) + row[1:] for source_id, row in rows.items()}
+            existing = {
+                row[0]: tuple(row) for row in conn.execute(
+                    f"SELECT {columns} FROM complaints WHERE id IN (SELECT value FROM json_each(?))",
+                    (json.dumps(list(rows)),),
+                )
+            }
+            conn.executemany(sql, rows.values())
+            advance_sequences(conn, [complaint_id for complaint_id in rows if complaint_id not in existing])
+            different = [complaint_id for complaint_id, row in existing.items() if rows[complaint_id][:-1] != row]
+            if routes is not None:
+                stored = [complaint_id for complaint_id in rows if complaint_id not in existing]
+                if update:
+                    stored += different
+                routes.route_complaints([dict(zip(COMPLAINT_FIELDS, rows[complaint_id])) for complaint_id in stored])
+        totals['inserted'] += len(rows) - len(existing)
+        totals['updated' if update else 'conflicts'] += len(different)
+        totals['skipped'] += len(existing) - len(different)
+    return totals
+
+
+def import_complaints(db, path, update=False, source=None, routes=None, batch_size=BATCH_SIZE):
+    return import_batches(db, READERS[file_format(path)](path, batch_size), update=update, source=source,
+                          routes=routes)
+
+
+def main(argv=None):
+    # python -m simplilaw.transfer export complaints.parquet --since 2025-01-01
+    # python -m simplilaw.transfer import backup.jsonl.gz --update
+    # python -m simplilaw.transfer import partner.parquet --source district-ngo
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Bulk export or import complaints as JSONL, Parquet or Arrow.")
+    parser.add_argument("command", choices=("export", "import"))
+    parser.add_argument("path", help="file ending in " + ", ".join(FORMATS))
+    parser.add_argument("--since", help="export only complaints filed on or after this date (YYYY-MM-DD)")
+    parser.add_argument("--update", action="store_true", help="on import, overwrite complaints that already exist")
+    parser.add_argument("--source", help="on import, the partner the file came from: its complaints get new ids here")
+    parser.add_argument("--batch-size", type=int, default=BATCH_SIZE)
+    args = parser.parse_args(argv)
+
+    db = Database()
+    start = time.perf_counter()
+    if args.command == "export":
+        since = datetime.strptime(args.since, "%Y-%m-%d").timestamp() if args.since else None
+        count = export_complaints(db, args.path, since=since, batch_size=args.batch_size)
+        summary = f"exported {count} complaints"
+    else:
+        totals = import_complaints(db, args.path, update=args.update, source=args.source,
+                                   routes=RouteStore(db, Router()), batch_size=args.batch_size)
+        summary = "imported: " + ", ".join(f"{count} {name}" for name, count in totals.items())
+        if totals['conflicts'] and args.source:
+            print(f"{totals['conflicts']} complaints changed since they were last imported from {args.source};"
+                  " use --update to apply the changes", file=sys.stderr)
+        elif totals['conflicts']:
+            print(f"{totals['conflicts']} complaints were not imported because their ids belong to different"
+                  " complaints here; use --source NAME to import them under new ids", file=sys.stderr)
+    print(f"{summary} in {time.perf_counter() - start:.1f}s", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,176 @@
+import hashlib
+import os
+import re
+import tempfile
+import time
+import zipfile
+from concurrent.futures import ThreadPoolExecutor
+
+try:
+    from PIL import Image
+except ImportError:
+    Image = None
+
+try:
+    from pypdf import PdfReader
+except ImportError:
+    PdfReader = None
+
+DEFAULT_UPLOAD_DIR = os.environ.get("SIMPLILAW_UPLOADS", "uploads")
+CHUNK_SIZE = 1024 * 1024
+THUMBNAIL_SIZE = (256, 256)
+IMAGE_EXTENSIONS = ('jpg', 'jpeg', 'png')
+
+DOCUMENTS_SCHEMA = """
+CREATE TABLE IF NOT EXISTS documents (
+    sha256 TEXT PRIMARY KEY,
+    size INTEGER NOT NULL,
+    extension TEXT NOT NULL,
+    status TEXT NOT NULL,
+    text TEXT,
+    thumbnail TEXT,
+    created_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS complaint_attachments (
+    complaint_id TEXT NOT NULL,
+    sha256 TEXT NOT NULL,
+    filename TEXT NOT NULL,
+    PRIMARY KEY (complaint_id, sha256)
+);
+CREATE INDEX IF NOT EXISTS idx_attachments_sha256 ON complaint_attachments (sha256);
+"""
+
+
+def file_extension(filename):
+    return os.path.splitext(filename)[1].lstrip('.').lower()
+
+
+def extract_docx_text(path):
+    with zipfile.ZipFile(path) as docx:
+        xml = docx.read("word/document.xml").decode("utf-8", errors="ignore")
+    paragraphs = re.split(r"</w:p>", xml)
+    return "\n".join(
+        "".join(re.findall(r"<w:t[^>]*>([^<]*)</w:t>", paragraph)) for paragraph in paragraphs
+    ).strip()
+
+
+def extract_pdf_text(path):
+    if PdfReader is None:
+        return None
+    return "\n".join(page.extract_text() or "" for page in PdfReader(path).pages).strip()
+
+
+class DocumentStore:
+    """Content-addressed store for complaint attachments.
+
+    Uploads are copied to disk in chunks while being hashed, identical files
+    are stored once, and thumbnails and text extraction run on a background
+    pool so submitting a complaint never waits for them.
+    """
+
+    def __init__(self, db, root=DEFAULT_UPLOAD_DIR, workers=2):
+        self.db = db
+        self.root = root
+        self.db.executescript(DOCUMENTS_SCHEMA)
+        os.makedirs(os.path.join(root, "tmp"), exist_ok=True)
+        self._pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="document-worker")
+
+    def blob_path(self, sha256, suffix=""):
+        return os.path.join(self.root, "blobs", sha256[:2], sha256 + suffix)
+
+    def save(self, fileobj, filename):
+        # Returns the sha256 of the content; duplicate content is not stored twice
+        digest = hashlib.sha256()
+        size = 0
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.join(self.root, "tmp"))
+        try:
+            with os.fdopen(fd, "wb") as out:
+                for chunk in iter(lambda: fileobj.read(CHUNK_SIZE), b""):
+                    digest.update(chunk)
+                    out.write(chunk)
+                    size += len(chunk)
+            sha256 = digest.hexdigest()
+            path = self.blob_path(sha256)
+            if os.path.exists(path):
+                os.remove(tmp_path)
+            else:
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                os.replace(tmp_path, path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+        with self.db.transaction() as conn:
+            conn.execute(
+                "INSERT OR IGNORE INTO documents (sha256, size, extension, status, created_at)"
+                " VALUES (?, ?, ?, 'pending', ?)",
+                (sha256, size, file_extension(filename), time.time()),
+            )
+        return sha256
+
+    def attach(self, complaint_id, sha256, filename):
+        with self.db.transaction() as conn:
+            conn.execute(
+                "INSERT OR IGNORE INTO complaint_attachments (complaint_id, sha256, filename)"
+                " VALUES (?, ?, ?)",
+                (complaint_id, sha256, filename),
+            )
+
+    def for_complaint(self, complaint_id):
+        rows = self.db.connection().execute(
+            "SELECT a.filename, d.* FROM complaint_attachments a JOIN documents d USING (sha256)"
+            " WHERE a.complaint_id = ? ORDER BY a.filename",
+            (complaint_id,),
+        ).fetchall()
+        return [dict(row) for row in rows]
+
+    def process_async(self, sha256):
+        return self._pool.submit(self.process, sha256)
+
+    def recover(self):
+        # The pool only lives in memory, so documents that were queued or
+        # half-processed when a process stopped are queued again at startup.
+        # A claim held by another live process is reset too; processing is
+        # idempotent, so that only costs a repeat of the work.
+        with self.db.transaction() as conn:
+            conn.execute("UPDATE documents SET status = 'pending' WHERE status = 'processing'")
+            pending = [row[0] for row in conn.execute("SELECT sha256 FROM documents WHERE status = 'pending'")]
+        for sha256 in pending:
+            self.process_async(sha256)
+        return len(pending)
+
+    def process(self, sha256):
+        # Claim the document so duplicate uploads are processed only once
+        with self.db.transaction() as conn:
+            claimed = conn.execute(
+                "UPDATE documents SET status = 'processing' WHERE sha256 = ? AND status = 'pending'",
+                (sha256,),
+            ).rowcount
+            extension = conn.execute(
+                "SELECT extension FROM documents WHERE sha256 = ?", (sha256,)
+            ).fetchone()[0]
+        if not claimed:
+            return
+
+        path = self.blob_path(sha256)
+        text = thumbnail = None
+        status = 'done'
+        try:
+            if extension in IMAGE_EXTENSIONS and Image is not None:
+                thumbnail = self.blob_path(sha256, ".thumb.png")
+                with Image.open(path) as image:
+                    image.thumbnail(THUMBNAIL_SIZE)
+                    image.save(thumbnail, "PNG")
+            elif extension == 'pdf':
+                text = extract_pdf_text(path)
+            elif extension == 'docx':
+                text = extract_docx_text(path)
+        except Exception:
+            status = 'failed'
+
+        with self.db.transaction() as conn:
+            conn.execute(
+                "UPDATE documents SET status = ?, text = ?, thumbnail = ? WHERE sha256 = ?",
+                (status, text, thumbnail, sha256),
+            )
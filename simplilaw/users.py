@@ -0,0 +1,167 @@
+import hashlib
+import hmac
+import os
+import sqlite3
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+USERS_SCHEMA = """
+CREATE TABLE IF NOT EXISTS users (
+    email TEXT PRIMARY KEY,
+    name TEXT NOT NULL,
+    phone TEXT NOT NULL,
+    password_hash TEXT NOT NULL,
+    created_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS user_roles (
+    email TEXT NOT NULL REFERENCES users (email),
+    role TEXT NOT NULL,
+    granted_at REAL NOT NULL,
+    PRIMARY KEY (email, role)
+) WITHOUT ROWID;
+"""
+
+# Registration does not prove anyone owns an email address, so roles are never
+# derived from one. They are granted by an operator with shell access:
+#   python -m simplilaw.users grant official@example.gov.in
+ROLES = ('admin',)
+
+# scrypt cost parameters: 16 MiB of memory per hash
+SCRYPT_N = 2 ** 14
+SCRYPT_R = 8
+SCRYPT_P = 1
+
+
+def normalize_email(email):
+    return email.strip().lower()
+
+
+def hash_password(password, salt=None, n=SCRYPT_N, r=SCRYPT_R, p=SCRYPT_P):
+    salt = salt or os.urandom(16)
+    digest = hashlib.scrypt(password.encode(), salt=salt, n=n, r=r, p=p,
+                            maxmem=2 * 128 * n * r * p)
+    return f"scrypt${n}${r}${p}${salt.hex()}${digest.hex()}"
+
+
+def verify_password(password, password_hash):
+    _, n, r, p, salt, _ = password_hash.split('$')
+    candidate = hash_password(password, bytes.fromhex(salt), int(n), int(r), int(p))
+    return hmac.compare_digest(candidate, password_hash)
+
+
+class UserStore:
+    """Registered users keyed by normalized email, with scrypt password hashes.
+
+    Hashing runs on a small bounded pool so a burst of logins queues there
+    instead of piling unbounded CPU and memory work onto the script threads.
+    """
+
+    def __init__(self, db, hash_workers=2):
+        self.db = db
+        self.db.executescript(USERS_SCHEMA)
+        self._pool = ThreadPoolExecutor(max_workers=hash_workers, thread_name_prefix="password-hash")
+        # Verified against unknown emails so a miss costs the same as a wrong password
+        self._dummy_hash = hash_password(os.urandom(8).hex())
+
+    def _public(self, row):
+        return {'name': row['name'], 'email': row['email'], 'phone': row['phone']}
+
+    def get(self, email):
+        row = self.db.connection().execute(
+            "SELECT * FROM users WHERE email = ?", (normalize_email(email),)
+        ).fetchone()
+        return self._public(row) if row else None
+
+    def register(self, name, email, phone, password):
+        # Returns the new user, or None if the email is already registered
+        password_hash = self._pool.submit(hash_password, password).result()
+        try:
+            with self.db.transaction() as conn:
+                conn.execute(
+                    "INSERT INTO users (email, name, phone, password_hash, created_at)"
+                    " VALUES (?, ?, ?, ?, ?)",
+                    (normalize_email(email), name, phone, password_hash, time.time()),
+                )
+        except sqlite3.IntegrityError:
+            return None
+        return self.get(email)
+
+    def authenticate(self, email, password):
+        row = self.db.connection().execute(
+            "SELECT * FROM users WHERE email = ?", (normalize_email(email),)
+        ).fetchone()
+        password_hash = row['password_hash'] if row else self._dummy_hash
+        valid = self._pool.submit(verify_password, password, password_hash).result()
+        return self._public(row) if row and valid else None
+
+    def grant(self, email, role="admin"):
+        # Returns the user the role was granted to
+        if role not in ROLES:
+            raise ValueError(f"Unknown role: {role}")
+        user = self.get(email)
+        if user is None:
+            raise ValueError(f"No registered user with email {email}")
+        with self.db.transaction() as conn:
+            conn.execute(
+                "INSERT OR IGNORE INTO user_roles (email, role, granted_at) VALUES (?, ?, ?)",
+                (user['email'], role, time.time()),
+            )
+        return user
+
+    def revoke(self, email, role="admin"):
+        with self.db.transaction() as conn:
+            return conn.execute(
+                "DELETE FROM user_roles WHERE email = ? AND role = ?", (normalize_email(email), role)
+            ).rowcount > 0
+
+    def has_role(self, email, role):
+        if not email:
+            return False
+        return self.db.connection().execute(
+            "SELECT 1 FROM user_roles WHERE email = ? AND role = ?", (normalize_email(email), role)
+        ).fetchone() is not None
+
+    def with_role(self, role):
+        rows = self.db.connection().execute(
+            "SELECT u.* FROM user_roles r JOIN users u ON u.email = r.email WHERE r.role = ? ORDER BY u.email",
+            (role,),
+        ).fetchall()
+        return [self._public(row) for row in rows]
+
+
+def main(argv=None):
+    # python -m simplilaw.users grant official@example.gov.in
+    # python -m simplilaw.users revoke official@example.gov.in
+    # python -m simplilaw.users list
+    import argparse
+
+    from simplilaw.storage import Database
+
+    parser = argparse.ArgumentParser(description="Grant, revoke or list staff roles.")
+    parser.add_argument("command", choices=("grant", "revoke", "list"))
+    parser.add_argument("email", nargs="?")
+    parser.add_argument("--role", choices=ROLES, default="admin")
+    args = parser.parse_args(argv)
+    if args.command != "list" and not args.email:
+        parser.error(f"{args.command} needs an email")
+
+    users = UserStore(Database(), hash_workers=1)
+    if args.command == "grant":
+        try:
+            user = users.grant(args.email, args.role)
+        except ValueError as e:
+            parser.exit(1, f"{e}\n")
+        # Emails are not verified, so the operator checks this is the right person
+        print(f"granted {args.role} to {user['name']} <{user['email']}>, phone {user['phone']}")
+    elif args.command == "revoke":
+        if not users.revoke(args.email, args.role):
+            parser.exit(1, f"{args.email} does not have the {args.role} role\n")
+        print(f"revoked {args.role} from {normalize_email(args.email)}")
+    else:
+        for user in users.with_role(args.role):
+            print(f"{user['email']}\t{user['name']}\t{user['phone']}")
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,208 @@
+import asyncio
+import os
+import subprocess
+import sys
+import zlib
+
+from simplilaw.metrics import worker_path
+from simplilaw.storage import DEFAULT_DB_PATH
+
+APP_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "app.py")
+
+# Runs app.py as N Streamlit worker processes on one node, all opening the same
+# SQLite database and shared state, behind a small TCP balancer on --port:
+#
+#   python -m simplilaw.workers --workers 4 --port 8501
+#
+# Any worker can serve any user (see simplilaw.state), so a worker that dies is
+# restarted and its clients reconnect to the next one, where they log in again
+# and get their conversation back. Connections from one client address still
+# prefer one worker while it is up, because Streamlit's file uploads are posted
+# to the worker holding the websocket.
+#
+# Workers only ever see the balancer's loopback connection, so it adds the
+# client's address to every request as X-Forwarded-For. Streamlit's server
+# (uvicorn) trusts that header from 127.0.0.1 by default, which gives the app
+# the real address in st.context.ip_address for its per-IP rate limits. Behind
+# another proxy on a different host, set FORWARDED_ALLOW_IPS=127.0.0.1,<host>
+# so the address that proxy forwards is used instead of its own.
+
+
+def worker_command(app_path, port):
+    return [
+        sys.executable, "-m", "streamlit", "run", app_path,
+        "--server.port", str(port), "--server.address", "127.0.0.1", "--server.headless", "true",
+    ]
+
+
+async def _pipe(reader, writer):
+    try:
+        while True:
+            chunk = await reader.read(65536)
+            if not chunk:
+                break
+            writer.write(chunk)
+            await writer.drain()
+    except (ConnectionError, OSError):
+        pass
+    finally:
+        writer.close()
+
+
+def forwarded_head(head, client_host):
+    """Returns an HTTP request head with the client appended to X-Forwarded-For,
+    and its headers by lowercased name.
+
+    The new header goes last: uvicorn reads the addresses right to left and
+    stops at the first one it does not trust, so anything the client sent
+    itself is never taken as its address.
+    """
+    lines = head.split(b"\r\n")
+    headers = {}
+    for line in lines[1:]:
+        name, _, value = line.partition(b":")
+        headers[name.strip().lower()] = value.strip()
+    lines = [line for line in lines if line]
+    lines.append(b"X-Forwarded-For: " + client_host.encode("ascii"))
+    return b"\r\n".join(lines) + b"\r\n\r\n", headers
+
+
+async def _forward_requests(reader, writer, client_host):
+    try:
+        while True:
+            try:
+                head = await reader.readuntil(b"\r\n\r\n")
+            except asyncio.IncompleteReadError as e:
+                writer.write(e.partial)  # the client hung up mid-request
+                break
+            head, headers = forwarded_head(head, client_host)
+            writer.write(head)
+            if headers.get(b"upgrade") or b"chunked" in headers.get(b"transfer-encoding", b"").lower():
+                # A websocket, or a body with no length up front: no further
+                # request heads can be found, so the rest is passed through
+                await _pipe(reader, writer)
+                return
+            remaining = int(headers.get(b"content-length") or 0)
+            while remaining:
+                chunk = await reader.read(min(remaining, 65536))
+                if not chunk:
+                    return
+                writer.write(chunk)
+                remaining -= len(chunk)
+                await writer.drain()
+            await writer.drain()
+    except (ConnectionError, OSError, ValueError, asyncio.LimitOverrunError):
+        pass  # gone, or not HTTP we can frame; the connection is dropped
+    finally:
+        writer.close()
+
+
+class Balancer:
+    """Forwards each TCP connection to a worker chosen by client address."""
+
+    def __init__(self, ports, host="127.0.0.1"):
+        self.ports = ports
+        self.host = host
+
+    def candidates(self, client_host):
+        start = zlib.crc32(client_host.encode("utf-8")) % len(self.ports)
+        return self.ports[start:] + self.ports[:start]
+
+    async def handle(self, reader, writer):
+        client_host = (writer.get_extra_info("peername") or ("",))[0]
+        for port in self.candidates(client_host):
+            try:
+                upstream_reader, upstream_writer = await asyncio.open_connection(self.host, port)
+                break
+            except OSError:
+                continue  # starting up or down; the next worker takes it
+        else:
+            writer.close()
+            return
+        try:
+            await asyncio.gather(_forward_requests(reader, upstream_writer, client_host),
+                                 _pipe(upstream_reader, writer))
+        except asyncio.CancelledError:
+            # Shutting down. Returning instead of re-raising keeps asyncio from
+            # logging every open connection as a failed handler
+            writer.close()
+            upstream_writer.close()
+
+
+class WorkerPool:
+    """Starts one Streamlit process per port and restarts any that exit."""
+
+    def __init__(self, ports, app_path=APP_PATH, env=None):
+        self.ports = ports
+        self.app_path = app_path
+        self.env = env
+        self.processes = {}
+
+    def start(self, port):
+        env = dict(self.env if self.env is not None else os.environ)
+        if env.get("SIMPLILAW_METRICS"):
+            env["SIMPLILAW_METRICS"] = worker_path(env["SIMPLILAW_METRICS"], port)
+        self.processes[port] = subprocess.Popen(worker_command(self.app_path, port), env=env)
+
+    def start_all(self):
+        for port in self.ports:
+            self.start(port)
+
+    async def supervise(self, interval=1.0):
+        while True:
+            await asyncio.sleep(interval)
+            for port, process in list(self.processes.items()):
+                if process.poll() is not None:
+                    print(f"worker on port {port} exited with {process.returncode}; restarting", file=sys.stderr)
+                    self.start(port)
+
+    def stop(self):
+        for process in self.processes.values():
+            process.terminate()
+        for process in self.processes.values():
+            try:
+                process.wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                process.kill()
+
+
+async def serve(pool, balancer, host, port):
+    server = await asyncio.start_server(balancer.handle, host, port)
+    async with server:
+        await asyncio.gather(server.serve_forever(), pool.supervise())
+
+
+def main(argv=None):
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Run SimpliLaw as several worker processes behind one port.")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 2)
+    parser.add_argument("--host", default="0.0.0.0")
+    parser.add_argument("--port", type=int, default=8501)
+    parser.add_argument("--first-worker-port", type=int, default=8511)
+    parser.add_argument("--app", default=APP_PATH)
+    args = parser.parse_args(argv)
+
+    # Every worker must open the same files; rate limits are shared through
+    # the main database unless configured otherwise
+    env = dict(os.environ)
+    env["SIMPLILAW_DB"] = os.path.abspath(env.get("SIMPLILAW_DB", DEFAULT_DB_PATH))
+    env.setdefault("SIMPLILAW_RATE_LIMIT_DB", env["SIMPLILAW_DB"])
+    # Each worker has its own OCR pool; together they get the node's cores
+    env.setdefault("SIMPLILAW_OCR_WORKERS", str(max(1, (os.cpu_count() or 1) // args.workers)))
+
+    ports = list(range(args.first_worker_port, args.first_worker_port + args.workers))
+    pool = WorkerPool(ports, args.app, env)
+    pool.start_all()
+    print(f"{args.workers} workers on ports {ports[0]}-{ports[-1]}, serving http://{args.host}:{args.port}",
+          file=sys.stderr)
+    try:
+        asyncio.run(serve(pool, Balancer(ports), args.host, args.port))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        pool.stop()
+
+
+if __name__ == "__main__":
+    sys.exit(main())